@@ -5,10 +5,12 @@ from an LLM in order to summarize scenes and determine story beats.
 """
 
 from typing import Literal
-from openai import OpenAI
+from openai import AsyncOpenAI
 from pydantic import BaseModel
 from ai.prompts.prompt_templates import SYSTEM_MESSAGE, ai_summary_beats_prompt
 from core.config import LLM_MODEL
+from services.cache import get_llm_cache
+from services.llms import parse_structured
 
 
 class SceneAnalysis(BaseModel):
@@ -30,19 +32,21 @@ class SceneAnalysis(BaseModel):
     ]
 
 
-def generate_scene_analysis(
+async def generate_scene_analysis(
     movie_name: str,
     scene_number: int,
     total_scenes: int,
     scene_text: str,
     previous_story_beat: str | None,
-    ai_client: OpenAI,
-) -> str:
-    """Generate a JSON-serializable scene analysis using the AI client.
+    ai_client: AsyncOpenAI,
+) -> SceneAnalysis:
+    """Generate a structured scene analysis using the AI client.
 
-    This function builds a prompt using `ai_summary_beats_prompt`, sends it
-    to the AI client using the `responses.parse` helper with the
-    `SceneAnalysis` pydantic model, and returns the serialized JSON result.
+    This function builds a prompt using `ai_summary_beats_prompt` and sends
+    it through the async `parse_structured` helper with the `SceneAnalysis`
+    pydantic model, which handles timeouts and retries. Identical requests
+    (same model, system message and rendered prompt) are answered from the
+    persistent LLM cache, so re-ingesting a screenplay is nearly free.
 
     Args:
         movie_name (str): Title of the movie for context.
@@ -50,10 +54,10 @@ def generate_scene_analysis(
         total_scenes (int): Total number of scenes in the screenplay.
         scene_text (str): Raw scene text to analyze.
         previous_story_beat (str): Label of the previous scene's story beat.
-        ai_client (OpenAI): Configured OpenAI client instance.
+        ai_client (AsyncOpenAI): Shared async OpenAI client instance.
 
     Returns:
-        str: JSON string representation of the parsed SceneAnalysis model.
+        SceneAnalysis: The parsed analysis.
     """
     
     full_prompt = ai_summary_beats_prompt(
@@ -63,12 +67,13 @@ def generate_scene_analysis(
         scene_text=scene_text,
         previous_story_beat=previous_story_beat,
     )
-    response = ai_client.responses.parse(
+    return await parse_structured(
+        ai_client=ai_client,
         model=LLM_MODEL,
-        input=[
+        messages=[
             {"role": "system", "content": SYSTEM_MESSAGE},
             {"role": "user", "content": full_prompt},
         ],
         text_format=SceneAnalysis,
+        cache=get_llm_cache(),
     )
-    return response.output_parsed.model_dump_json()
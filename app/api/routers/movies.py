@@ -9,7 +9,7 @@ from typing import Any
 from fastapi.routing import APIRouter
 from crud.movies import get_movie
 from fastapi import Depends
-from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 from core.db import get_session
 
 router = APIRouter(
@@ -32,7 +32,7 @@ def get_screenplays_root():
     }
 
 @router.get("/movie/{screenplay_id}")
-async def get_movie_record(screenplay_id: int, session: Session = Depends(get_session)) -> dict[str, Any]:
+async def get_movie_record(screenplay_id: int, session: AsyncSession = Depends(get_session)) -> dict[str, Any]:
     """Retrieve movie details based on the screenplay ID.
     
     Args:
@@ -40,5 +40,5 @@ async def get_movie_record(screenplay_id: int, session: Session = Depends(get_se
     Returns:
         dictionary payload containing the movie details.
     """
-    movie = get_movie(screenplay_id=screenplay_id, session=session)
+    movie = await get_movie(screenplay_id=screenplay_id, session=session)
     return movie
\ No newline at end of file
@@ -9,10 +9,12 @@ import mcp
 from pydantic import BaseModel
 from fastapi.routing import APIRouter
 from fastapi import Request, Depends
-from sqlmodel import Session
-from crud.scenes import get_relevant_contexts, get_scenes
+from sqlmodel.ext.asyncio.session import AsyncSession
+from crud.scenes import get_relevant_contexts, get_scenes, resolve_scene_filter
+from models.schemas.scenes import SceneQueryFilters
+from services.cache import get_llm_cache
 from core.db import get_session
-from core.config import EMBEDDING_MODEL, TOP_K_CONTEXTS, PINECONE_NAMESPACE
+from core.config import EMBEDDING_MODEL, TOP_K_CONTEXTS, PINECONE_NAMESPACE, HYBRID_SEARCH_ENABLED
 
 router = APIRouter(
     prefix="/scenes",
@@ -21,6 +23,7 @@ router = APIRouter(
 
 class QueryRequest(BaseModel):
     user_query: str
+    filters: SceneQueryFilters | None = None
 
 class QueryResult(BaseModel):
     contexts: List[str]
@@ -45,32 +48,56 @@ async def query_scenes(
     request: Request,
     embedding_model: str=EMBEDDING_MODEL,
     top_k: int=TOP_K_CONTEXTS,
-    namespace: str=PINECONE_NAMESPACE
+    namespace: str=PINECONE_NAMESPACE,
+    session: AsyncSession = Depends(get_session)
     ) -> dict[str, Any]:
     """Query scenes based on a user query.
     This is useful for LLM models if the user asks for how they can write specific types of scenes.
+    Optional filters narrow the search to given screenplays, story beats, a
+    range of positions in the screenplay, or movies by release year and rating.
 
     Args:
         user_query (str): The user's search or question.
+        filters (SceneQueryFilters | None): Optional filters, in the body.
 
     Returns:
         dict: A payload containing the user query and placeholder scenes.
     """
     user_query = body.user_query
+    scene_filter = await resolve_scene_filter(body.filters, session)
     result = await get_relevant_contexts(
         user_query=user_query,
         ai_client=request.app.state.openai_client,
-        pinecone_client=request.app.state.pinecone_client,
+        vector_store=request.app.state.vector_store,
         embedding_model=embedding_model,
         top_k=top_k,
-        namespace=namespace
+        namespace=namespace,
+        embedding_cache=request.app.state.query_embedding_cache,
+        result_cache=request.app.state.result_cache,
+        text_index_engine=request.app.state.db_engine if HYBRID_SEARCH_ENABLED else None,
+        scene_filter=scene_filter,
+        mongodb_database=request.app.state.mongodb_database
     )
     return QueryResult(contexts=result).model_dump()
 
+@router.get("/cache-stats")
+async def get_cache_stats(request: Request) -> dict[str, Any]:
+    """Report hit/miss metrics of the retrieval, query embedding and LLM caches.
+
+    Returns:
+        dict: Stats per cache; ``llm_responses`` is ``None`` when disabled.
+    """
+    llm_cache = get_llm_cache()
+    return {
+        "results": request.app.state.result_cache.stats(),
+        "query_embeddings": request.app.state.query_embedding_cache.stats(),
+        "llm_responses": llm_cache.stats() if llm_cache is not None else None
+    }
+
 @router.get("/scenes/{screenplay_id}", operation_id="get_scenes_by_screenplay")
 async def get_scenes_by_screenplay(
     screenplay_id: int,
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_session)
 ) -> dict[str, Any]:
     """Retrieve scenes associated with a given screenplay ID.
 
@@ -84,4 +111,4 @@ async def get_scenes_by_screenplay(
     Raises:
         ValueError: If no scenes are found for the given screenplay ID.
     """
-    return get_scenes(screenplay_id=screenplay_id, session=session)
\ No newline at end of file
+    return await get_scenes(screenplay_id=screenplay_id, session=session)
\ No newline at end of file
@@ -6,15 +6,27 @@ perform text-splitting, database persistence, and scene creation.
 """
 
 import os
+from typing import Any, Awaitable, Callable
 from pathlib import Path
 from dotenv import load_dotenv
 from werkzeug.utils import secure_filename
 from fastapi.routing import APIRouter
 from fastapi.exceptions import HTTPException
-from fastapi import Request, Depends, UploadFile
-from sqlmodel import Session
-from crud.screenplays import create_screenplay as crud_create_screenplay
-from core.db import get_session
+from fastapi import Request, Response, Depends, UploadFile
+from sqlmodel.ext.asyncio.session import AsyncSession
+from crud.screenplays import (
+    create_screenplay as crud_create_screenplay,
+    resume_screenplay as crud_resume_screenplay,
+    copy_screenplay as crud_copy_screenplay,
+    delete_screenplay as crud_delete_screenplay,
+    DuplicateScreenplayError,
+    find_ingested_screenplay_by_content_hash,
+    find_screenplay_by_content_hash,
+    screenplay_is_ingested
+)
+from core.db import get_session, async_session
+from core.jobs import IngestJob
+from services.uploads import store_upload
 from models.db.screenplays import Screenplay
 
 load_dotenv()
@@ -45,31 +57,75 @@ def get_screenplays_root():
     }
 
 
-@router.post("/")
+def resume_work(state: Any, screenplay_id: int) -> Callable[[IngestJob], Awaitable[dict[str, int]]]:
+    """Return the job work resuming a screenplay's ingestion (see `crud.screenplays.resume_screenplay`)."""
+
+    async def resume(job: IngestJob) -> dict[str, int]:
+        try:
+            async with async_session() as job_session:
+                screenplay_record = await crud_resume_screenplay(
+                    screenplay_id=screenplay_id,
+                    session=job_session,
+                    ai_client=state.openai_client,
+                    mongodb_database=state.mongodb_database,
+                    vector_store=state.vector_store,
+                    job=job
+                )
+                return {"screenplay_id": screenplay_record.id}
+        finally:
+            state.result_cache.invalidate()
+
+    return resume
+
+@router.post("/", status_code=202)
 async def create_screenplay(
     file: UploadFile,
     tmdb_id: int,
     request: Request,
-    session: Session = Depends(get_session)
+    response: Response,
+    session: AsyncSession = Depends(get_session)
 ):
     """Create a screenplay from a PDF/text file and associated movie.
 
-    This endpoint is a thin wrapper over the CRUD layer `create_screenplay`.
-    It forwards the request-scoped clients and database session to perform
-    the heavy lifting.
+    The upload is streamed in chunks into the content-addressed store (named
+    by its SHA-256, see `services.uploads.store_upload`) and the CRUD layer
+    `create_screenplay` is handed to the background job runner, so the
+    request returns as soon as the job is queued. Poll
+    ``GET /screenplays/jobs/{job_id}`` for progress. The job opens its own
+    database session because the request-scoped one closes with the
+    response.
+
+    A file that was uploaded before is not ingested again:
+
+    - Already stored for `tmdb_id` and fully ingested: that screenplay's ID
+      is returned (HTTP 200).
+    - Already being stored for `tmdb_id`: the running job is returned.
+    - Stored for `tmdb_id` but the ingestion failed or was interrupted: a
+      job resumes it.
+    - Fully ingested for another movie only: a job copies its scenes,
+      summaries and vectors to a new screenplay for `tmdb_id` without any
+      model calls.
+
+    Jobs are keyed by the file's hash and `tmdb_id`, so concurrent uploads
+    of the same file for the same movie share one job; the unique
+    ``(content_hash, tmdb_id)`` index turns an upload that still races
+    another process into a link to the screenplay stored first.
 
     Args:
         file: UploadFile object - should be a PDF file.
-        file_path (str): Filesystem path to the screenplay file.
         tmdb_id (int): External TMDB movie identifier to attach the screenplay to.
         request (Request): FastAPI Request object (used to access app state clients).
-        session (Session): Database session provided via dependency injection.
+        response (Response): Used to answer a linked duplicate with HTTP 200.
+        session (AsyncSession): Database session provided via dependency injection.
 
     Returns:
-        dict: A payload containing the created screenplay ID.
+        dict: A payload containing the job ID, its status URL and the
+            file's SHA-256 (HTTP 202), or the ID of the screenplay the
+            upload duplicates (HTTP 200).
     
     Raises: 
-        HTTPException: 400 if file type is not PDF or file name is bad.
+        HTTPException: 400 if file type is not PDF or file name is bad, 503
+            if the server is shutting down.
     """
     if file.content_type != "application/pdf":
         raise HTTPException(status_code=400, detail="File must be a PDF")
@@ -77,34 +133,135 @@ async def create_screenplay(
     safe_file_name = secure_filename(file.filename)
     if not safe_file_name:
         raise HTTPException(status_code=400, detail="Invalid filename")
-    safe_file_path = storage_path / safe_file_name
-    contents = await file.read()
-    safe_file_path.write_bytes(contents)
-
-    print("Creating screenplay...")
-    screenplay_record = await crud_create_screenplay(
-        file_path=str(safe_file_path),
-        tmdb_id=tmdb_id,
-        session=session,
-        async_client=request.app.state.async_client,
-        ai_client=request.app.state.openai_client,
-        mongodb_database=request.app.state.mongodb_database,
-        pinecone_client=request.app.state.pinecone_client
-    )
-    return {"screenplay_id": screenplay_record.id}
+    stored_file = await store_upload(file, storage_path)
+    safe_file_path = stored_file.path
+
+    state = request.app.state
+    duplicate = await find_screenplay_by_content_hash(stored_file.sha256, session, tmdb_id=tmdb_id)
+    source = None
+    if duplicate is not None:
+        if await screenplay_is_ingested(duplicate.id, session):
+            response.status_code = 200
+            return {"duplicate_of": duplicate.id, "content_hash": stored_file.sha256}
+    else:
+        source = await find_ingested_screenplay_by_content_hash(stored_file.sha256, session)
+
+    async def ingest(job: IngestJob) -> dict[str, int]:
+        try:
+            async with async_session() as job_session:
+                screenplay_record = await crud_create_screenplay(
+                    file_path=str(safe_file_path),
+                    tmdb_id=tmdb_id,
+                    session=job_session,
+                    async_client=state.async_client,
+                    ai_client=state.openai_client,
+                    mongodb_database=state.mongodb_database,
+                    vector_store=state.vector_store,
+                    job=job,
+                    content_hash=stored_file.sha256
+                )
+                return {"screenplay_id": screenplay_record.id}
+        except DuplicateScreenplayError as e:
+            return {"screenplay_id": e.screenplay_id, "duplicate_of": e.screenplay_id}
+        finally:
+            # even a partial ingest changes what queries can retrieve
+            state.result_cache.invalidate()
+
+    async def copy(job: IngestJob) -> dict[str, int]:
+        try:
+            async with async_session() as job_session:
+                screenplay_record = await crud_copy_screenplay(
+                    source_screenplay_id=source.id,
+                    tmdb_id=tmdb_id,
+                    session=job_session,
+                    async_client=state.async_client,
+                    mongodb_database=state.mongodb_database,
+                    vector_store=state.vector_store,
+                    job=job
+                )
+                return {"screenplay_id": screenplay_record.id, "copied_from": source.id}
+        except DuplicateScreenplayError as e:
+            return {"screenplay_id": e.screenplay_id, "duplicate_of": e.screenplay_id}
+        finally:
+            state.result_cache.invalidate()
+
+    # no await from here on, so a concurrent upload sees this job as running
+    job_key = (stored_file.sha256, tmdb_id)
+    job = state.job_runner.active(job_key)
+    if job is None:
+        if duplicate is not None:
+            work = resume_work(state, duplicate.id)
+        elif source is not None:
+            work = copy
+        else:
+            work = ingest
+        print("Queueing screenplay ingestion...")
+        try:
+            job = state.job_runner.submit(work, key=job_key)
+        except RuntimeError as e:
+            raise HTTPException(status_code=503, detail=str(e))
+    return {"job_id": job.id, "status_url": f"{router.prefix}/jobs/{job.id}", "content_hash": stored_file.sha256}
+
+@router.post("/{screenplay_id}/resume", status_code=202)
+async def resume_screenplay(screenplay_id: int, request: Request):
+    """Resume a screenplay whose ingestion failed or was interrupted.
+
+    Scenes that were fully ingested before are skipped; see
+    `crud.screenplays.resume_screenplay`. Like `POST /screenplays`, the work
+    runs as a background job.
+
+    Args:
+        screenplay_id: ID of the screenplay to resume.
+        request: FastAPI Request object (used to access app state clients).
+
+    Returns:
+        dict: A payload containing the job ID and its status URL (HTTP 202).
+
+    Raises:
+        HTTPException: 503 if the server is shutting down.
+    """
+    try:
+        job = request.app.state.job_runner.submit(resume_work(request.app.state, screenplay_id))
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    return {"job_id": job.id, "status_url": f"{router.prefix}/jobs/{job.id}"}
+
+@router.get("/jobs/{job_id}")
+async def get_ingest_job(job_id: str, request: Request) -> dict[str, Any]:
+    """Report the progress of a screenplay ingestion job.
+
+    Args:
+        job_id: Identifier returned by ``POST /screenplays``.
+        request: FastAPI Request object (used to access the job runner).
+
+    Returns:
+        dict: Status, stage, scenes done/total, throughput and errors.
+
+    Raises:
+        HTTPException: 404 if the job is unknown.
+    """
+    job = request.app.state.job_runner.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"No ingestion job with ID {job_id}")
+    return job.to_dict()
 
 @router.delete("/{screenplay_id}")
 async def delete_screenplay(
     screenplay_id: int,
-    session: Session = Depends(get_session)
+    request: Request,
+    session: AsyncSession = Depends(get_session)
 ) -> dict[str, str]:
     """Delete a screenplay and its associated scenes from the database.
 
     This function deletes the screenplay record with the given ID, along
-    with all associated scenes due to cascading delete behavior.
+    with all associated scenes due to cascading delete behavior and their
+    MongoDB documents, vectors and full-text entries, and drops cached
+    retrieval results.
 
     Args:
         screenplay_id: ID of the screenplay to delete.
+        request: FastAPI Request object (used to access the MongoDB
+            database, the vector store and the result cache).
         session: SQLModel/SQLAlchemy session used for DB operations.
 
     Returns:
@@ -113,9 +270,14 @@ async def delete_screenplay(
     Raises:
         ValueError: If no screenplay is found for the given ID.
     """
-    screenplay = session.get(Screenplay, screenplay_id)
+    screenplay = await session.get(Screenplay, screenplay_id)
     if not screenplay:
         raise ValueError(f"No screenplay found with ID {screenplay_id}")
-    session.delete(screenplay)
-    session.commit()
+    await crud_delete_screenplay(
+        screenplay_id,
+        session,
+        mongodb_database=request.app.state.mongodb_database,
+        vector_store=request.app.state.vector_store
+    )
+    request.app.state.result_cache.invalidate()
     return {"Deleted": f"Successfully deleted screenplay {screenplay_id}."}
\ No newline at end of file
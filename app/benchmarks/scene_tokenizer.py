@@ -0,0 +1,157 @@
+"""Scene splitting throughput: regex cascade versus the slugline tokenizer.
+
+Times `split_script_text`, the original regex cascade kept here as the
+reference implementation, plus the previous four-pass embedding cleanup
+against the production tokenizer (`crud.screenplays.iter_scene_texts`) on
+synthetic scripts of a given page count and checks that both produce the
+same scenes. Two layouts are measured: a regular script with sluglines at
+the start of the line, and an oddly formatted one with indented sluglines,
+which only the fallback split finds.
+
+Usage (from the ``app`` directory):
+    python -m benchmarks.scene_tokenizer --pages 200 --repeat 5
+"""
+
+import re
+import time
+import random
+import argparse
+from crud.screenplays import SCENE_HEADER_PATTERN, PAGE_DELIMITER, iter_scene_texts
+
+LOCATIONS = ["KITCHEN", "POLICE STATION", "DESERT ROAD", "APARTMENT - HALLWAY", "DINER"]
+TIMES = ["DAY", "NIGHT", "CONTINUOUS", "LATER"]
+WORDS = "the a she he runs looks back door gun light stops waits why never again -- ... !!".split()
+
+
+def split_script_text(
+    script_text: str,
+    re_pattern: re.Pattern
+) -> list[str]:
+    """
+    Robustly split screenplay text into scene chunks. Written by Github Copilot.
+
+    Behavior:
+    1. Try treating `re_pattern` as a header matcher and slice between header
+       start positions (using finditer). Compiles pattern with DOTALL to allow
+       body matching across lines.
+    2. If no headers found, fallback to a lookahead split before INT/EXT
+       sluglines (keeps slugline at start of each chunk).
+    3. Final fallback split on blank lines.
+
+    Args:
+        script_text: Full screenplay text to split.
+        re_pattern: Compiled regex pattern used to identify scene headers.
+
+    Returns:
+        List of scene strings (trimmed).
+    """
+    # Normalize input into a compiled pattern and use safe flags
+    if isinstance(re_pattern, str):
+        pattern_str = re_pattern
+    else:
+        pattern_str = re_pattern.pattern
+
+    # Try header-based slicing (use DOTALL so '.*?' matches across lines)
+    try:
+        header_pat = re.compile(pattern_str, re.DOTALL | re.MULTILINE | re.IGNORECASE)
+    except re.error:
+        # fallback if provided pattern is invalid for some reason
+        header_pat = None
+
+    if header_pat:
+        matches = list(header_pat.finditer(script_text))
+        if matches:
+            chunks = []
+            for i, m in enumerate(matches):
+                start = m.start()
+                end = matches[i + 1].start() if i + 1 < len(matches) else len(script_text)
+                chunk = script_text[start:end].strip()
+                if chunk:
+                    chunks.append(chunk)
+            if chunks:
+                return chunks
+
+    # Lookahead split fallback: split before common sluglines (preserve slugline)
+    lookahead = r'(?mi)(?=^(?:\d+\s+)?\s*(?:INT|EXT)(?:\.)?(?:/(?:INT|EXT)(?:\.)?)?\b)'
+    splits = [s.strip() for s in re.split(lookahead, script_text) if s.strip()]
+    if len(splits) > 1:
+        return splits
+
+    # Final fallback: blank-line split so we at least return multiple chunks
+    blanks = [s.strip() for s in re.split(r'\n\s*\n+', script_text) if s.strip()]
+    return blanks if blanks else [script_text.strip()]
+
+
+def legacy_clean(scene_text: str) -> str:
+    text = re.sub(r"[\n\t]+", " ", scene_text)
+    text = re.sub(r" {2,}", " ", text)
+    text = re.sub(r"([.!?]{2,})", r"\1", text)
+    text = re.sub(r"[-]{2,}", "-", text)
+    return text.strip()
+
+
+def synthetic_pages(pages: int, indent: str, rng: random.Random) -> list[str]:
+    page_texts = []
+    scene_number = 0
+    for _ in range(pages):
+        lines = []
+        for _ in range(55):
+            if rng.random() < 0.04:
+                scene_number += 1
+                prefix = f"{scene_number} " if rng.random() < 0.5 else ""
+                setting = rng.choice(["INT.", "EXT.", "INT./EXT."])
+                lines.append(f"{indent}{prefix}{setting} {rng.choice(LOCATIONS)} - {rng.choice(TIMES)}")
+            elif rng.random() < 0.3:
+                lines.append(" " * 20 + rng.choice(["JACK", "MARA", "THE DRIVER"]))
+            else:
+                lines.append(" ".join(rng.choice(WORDS) for _ in range(rng.randint(4, 12))))
+        page_texts.append("\n".join(lines))
+    return page_texts
+
+
+def best_of(repeat: int, function, *args) -> tuple[float, object]:
+    timings, result = [], None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function(*args)
+        timings.append(time.perf_counter() - started)
+    return min(timings), result
+
+
+def legacy(pages: list[str]) -> list[dict[str, str]]:
+    return [
+        {"raw_text": raw_text, "embedding_text": legacy_clean(raw_text)}
+        for raw_text in split_script_text(
+            script_text=PAGE_DELIMITER.join(pages),
+            re_pattern=re.compile(SCENE_HEADER_PATTERN)
+        )
+    ]
+
+
+def tokenizer(pages: list[str]) -> list[dict[str, str]]:
+    return list(iter_scene_texts(pages))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"{'layout':>10} {'scenes':>7} {'cascade ms':>11} {'tokenizer ms':>13} {'speedup':>8}")
+    for layout, indent in (("regular", ""), ("indented", "    ")):
+        pages = synthetic_pages(args.pages, indent, rng)
+        legacy_time, expected = best_of(args.repeat, legacy, pages)
+        tokenizer_time, scenes = best_of(args.repeat, tokenizer, pages)
+        if scenes != expected:
+            raise SystemExit(f"{layout}: tokenizer output differs from split_script_text")
+        print(
+            f"{layout:>10} {len(scenes):>7} {legacy_time * 1000:>11.1f} "
+            f"{tokenizer_time * 1000:>13.1f} {legacy_time / tokenizer_time:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,446 @@
+"""Command-line entry points.
+
+``ingest`` bulk-loads a directory of screenplay PDFs without going through
+``POST /screenplays`` once per file. PDFs are hashed and split in a process
+pool, a bounded number of files ahead of ingestion. The scenes of up to
+`max_active` screenplays are then interleaved into one shared scene pipeline
+(see `crud.scenes.build_scene_pipeline`). Analyses are chained within a
+screenplay, so interleaving is what keeps every analysis worker busy; the
+pipeline's stage worker counts are the global concurrency budget. Records
+are created through one database session while the pipeline's SQL backfill
+writes through another, as an `AsyncSession` cannot be shared by
+concurrent tasks.
+
+Files are matched to TMDB ids through a manifest, either a CSV file with
+``file`` and ``tmdb_id`` columns or a JSON object mapping file names to ids.
+Uploads that duplicate an already stored screenplay are linked to it, not
+ingested again. An error while setting up one file (parsing, TMDB, SQL)
+fails only that file. A throughput summary is printed at the end and the
+status of every file is written to a JSON report, also when the run is
+aborted; screenplays with failed scenes can be finished with
+``POST /screenplays/{id}/resume``.
+
+Usage (from the ``app`` directory):
+    python -m cli ingest path/to/pdfs --manifest manifest.csv --report report.json
+
+Classes:
+    FileStatus: Outcome of one file of a bulk ingest.
+
+Functions:
+    read_manifest(path): Map file names to TMDB ids.
+    list_files(directory, manifest): A pending status per PDF of a directory.
+    interleave(sources, max_active): Round-robin merge of async iterators.
+    ingest_directory(...): Ingest every PDF of a directory.
+    summarize(statuses, elapsed): Counts and throughput of a bulk ingest.
+    run_ingest(args): Set up clients, ingest and write the report.
+    main(argv): Parse arguments and run a command.
+"""
+
+import os
+import csv
+import json
+import time
+import shutil
+import asyncio
+import argparse
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, AsyncIterator, TypeVar
+import httpx
+from fastapi.exceptions import HTTPException
+from openai import AsyncOpenAI
+from pymongo.asynchronous.database import AsyncDatabase
+from sqlmodel.ext.asyncio.session import AsyncSession
+from core.config import (
+    EMBEDDING_MODEL,
+    INGEST_STAGE_CONCURRENCY,
+    MONGODB_DATABASE,
+    VECTOR_STORE_BACKEND,
+    VECTOR_STORE_DIR
+)
+from core.clients import (
+    init_async_client,
+    close_async_client,
+    init_openai_client,
+    close_openai_client,
+    init_pinecone_client,
+    close_pinecone_client,
+    init_pinecone_index,
+    close_pinecone_index,
+    init_mongodb_client,
+    close_mongodb_client
+)
+from core.db import init_db, async_session, engine as db_engine
+from core.indexes import MongoIndexManager
+from core.pipeline import PipelineItem
+from crud.movies import create_movie
+from crud.scenes import build_scene_pipeline, create_scene_records, iter_scene_items
+from crud.screenplays import (
+    DuplicateScreenplayError,
+    create_screenplay_record,
+    find_screenplay_by_content_hash,
+    parse_screenplay_file
+)
+from services.uploads import content_path
+from services.vector_store import LocalVectorStore, PineconeVectorStore, VectorStore
+
+T = TypeVar("T")
+
+
+@dataclass
+class FileStatus:
+    """Outcome of one file of a bulk ingest.
+
+    Attributes:
+        file: File name within the ingested directory.
+        tmdb_id: TMDB id from the manifest, if listed.
+        status: ``pending``, ``ingested``, ``partial`` (some scenes
+            failed), ``duplicate``, ``skipped`` or ``failed``.
+        content_hash: SHA-256 of the file, once parsed.
+        screenplay_id: Screenplay created for (or duplicated by) the file.
+        scenes_total: Scenes found in the file.
+        scenes_done: Scenes that made it through every pipeline stage.
+        scenes_failed: Scenes that failed in some stage.
+        parse_seconds: Time spent hashing and splitting the file.
+        errors: Error messages collected for the file.
+    """
+
+    file: str
+    tmdb_id: int | None = None
+    status: str = "pending"
+    content_hash: str | None = None
+    screenplay_id: int | None = None
+    scenes_total: int = 0
+    scenes_done: int = 0
+    scenes_failed: int = 0
+    parse_seconds: float | None = None
+    errors: list[str] = field(default_factory=list)
+
+    def fail(self, error: str):
+        self.status = "failed"
+        self.errors.append(error)
+
+
+def read_manifest(path: Path) -> dict[str, int]:
+    """Map file names to TMDB ids from a CSV or JSON manifest.
+
+    Raises:
+        ValueError: If a CSV manifest lacks the ``file`` or ``tmdb_id``
+            column.
+    """
+    if path.suffix.lower() == ".json":
+        return {name: int(tmdb_id) for name, tmdb_id in json.loads(path.read_text()).items()}
+    with open(path, newline="", encoding="utf-8") as manifest:
+        reader = csv.DictReader(manifest)
+        if not {"file", "tmdb_id"} <= set(reader.fieldnames or []):
+            raise ValueError(f"{path} needs 'file' and 'tmdb_id' columns.")
+        return {row["file"].strip(): int(row["tmdb_id"]) for row in reader if row["file"].strip()}
+
+
+def list_files(directory: Path, manifest: dict[str, int]) -> list[FileStatus]:
+    """Return a status per PDF in `directory`, in name order.
+
+    Files missing from the manifest are marked ``skipped``.
+    """
+    statuses = [
+        FileStatus(file=path.name, tmdb_id=manifest.get(path.name))
+        for path in sorted(directory.iterdir())
+        if path.is_file() and path.suffix.lower() == ".pdf"
+    ]
+    for status in statuses:
+        if status.tmdb_id is None:
+            status.status = "skipped"
+            status.errors.append("No TMDB id in the manifest.")
+    return statuses
+
+
+async def interleave(sources: AsyncIterator[AsyncIterator[T]], max_active: int) -> AsyncIterator[T]:
+    """Yield from up to `max_active` iterators at a time, one item from each in turn.
+
+    Each iterator's items keep their order. A new iterator is taken from
+    `sources` whenever an active one is exhausted, so `sources` is consumed
+    lazily.
+    """
+    active: deque[AsyncIterator[T]] = deque()
+    sources_left = True
+    while True:
+        while sources_left and len(active) < max_active:
+            try:
+                active.append(await anext(sources))
+            except StopAsyncIteration:
+                sources_left = False
+        if not active:
+            return
+        iterator = active.popleft()
+        try:
+            item = await anext(iterator)
+        except StopAsyncIteration:
+            continue
+        active.append(iterator)
+        yield item
+
+
+async def ingest_directory(
+    directory: Path,
+    statuses: list[FileStatus],
+    session: AsyncSession,
+    backfill_session: AsyncSession,
+    async_client: httpx.AsyncClient,
+    ai_client: AsyncOpenAI,
+    mongodb_database: AsyncDatabase,
+    vector_store: VectorStore,
+    storage_dir: Path | None = None,
+    concurrency: int = INGEST_STAGE_CONCURRENCY["analysis"],
+    max_active: int | None = None,
+    parse_workers: int | None = None
+) -> list[FileStatus]:
+    """Ingest the pending files of `statuses` through one shared scene pipeline.
+
+    The statuses are updated in place as files progress, so a caller still
+    has them if the run is aborted.
+
+    Args:
+        directory: Directory holding the screenplay PDFs.
+        statuses: Files to ingest, from `list_files`; only ``pending``
+            ones are processed.
+        session: SQLModel/SQLAlchemy session used to look up and create
+            the movie, screenplay and scene records.
+        backfill_session: Separate session used by the pipeline's SQL
+            backfill stage, which runs concurrently with record creation.
+        async_client: `httpx.AsyncClient` used to call TMDB.
+        ai_client: OpenAI client used for analysis and embeddings.
+        mongodb_database: Async MongoDB database.
+        vector_store: Shared vector store the embeddings are written to.
+        storage_dir: Content-addressed store the PDFs are copied into; the
+            files are referenced in place when omitted.
+        concurrency: Analysis workers shared by all screenplays, i.e. LLM
+            calls in flight at once.
+        max_active: Screenplays whose scenes are interleaved at a time;
+            defaults to `concurrency`.
+        parse_workers: Worker processes parsing PDFs; defaults to the CPU
+            count.
+
+    Returns:
+        `statuses`, updated.
+    """
+    by_screenplay: dict[int, FileStatus] = {}
+    if storage_dir is not None:
+        storage_dir.mkdir(parents=True, exist_ok=True)
+
+    def scene_done(item: PipelineItem):
+        status = by_screenplay[item.payload.screenplay_id]
+        if item.ok:
+            status.scenes_done += 1
+        else:
+            status.scenes_failed += 1
+            status.errors.append(f"scene {item.payload.scene_number} ({item.failed_stage}): {item.error}")
+
+    async def start(status: FileStatus, parsed: dict[str, Any]) -> AsyncIterator | None:
+        status.content_hash = parsed["content_hash"]
+        status.scenes_total = len(parsed["scene_texts"])
+        try:
+            return await open_screenplay(status, parsed)
+        except Exception as e:
+            # one bad file (network, SQL, disk) must not abort the batch
+            await session.rollback()
+            status.fail(f"{type(e).__name__}: {e}")
+            return None
+
+    async def open_screenplay(status: FileStatus, parsed: dict[str, Any]) -> AsyncIterator | None:
+        duplicate = await find_screenplay_by_content_hash(status.content_hash, session)
+        if duplicate is not None:
+            status.status = "duplicate"
+            status.screenplay_id = duplicate.id
+            return None
+        if not parsed["scene_texts"]:
+            status.fail("No scenes found.")
+            return None
+        source = directory / status.file
+        storage_path = source
+        if storage_dir is not None:
+            storage_path = content_path(storage_dir, status.content_hash, source.suffix.lower())
+            if not storage_path.exists():
+                await asyncio.to_thread(shutil.copyfile, source, storage_path)
+        try:
+            movie_record = await create_movie(tmdb_id=status.tmdb_id, async_client=async_client, session=session)
+        except HTTPException as e:
+            await session.rollback()
+            status.fail(f"movie: {e.detail}")
+            return None
+        try:
+            screenplay_record = await create_screenplay_record(
+                movie_record=movie_record,
+                storage_path=str(storage_path),
+                total_scenes=status.scenes_total,
+                content_hash=status.content_hash,
+                session=session
+            )
+        except DuplicateScreenplayError as e:
+            # stored by a concurrent upload since the lookup above
+            status.status = "duplicate"
+            status.screenplay_id = e.screenplay_id
+            return None
+        status.screenplay_id = screenplay_record.id
+        by_screenplay[screenplay_record.id] = status
+        scene_ids = await create_scene_records(
+            screenplay_id=screenplay_record.id,
+            total_scenes=status.scenes_total,
+            session=session
+        )
+        return iter_scene_items(parsed["scene_texts"], scene_ids, screenplay_record.id, movie_record.title)
+
+    async def screenplays(pool: ProcessPoolExecutor, window: int) -> AsyncIterator[AsyncIterator]:
+        loop = asyncio.get_running_loop()
+        queued = iter([status for status in statuses if status.status == "pending"])
+        parsing: deque[tuple[FileStatus, float, asyncio.Future]] = deque()
+
+        def submit():
+            status = next(queued, None)
+            if status is not None:
+                path = str(directory / status.file)
+                parsing.append((status, time.perf_counter(), loop.run_in_executor(pool, parse_screenplay_file, path)))
+
+        for _ in range(window):
+            submit()
+        while parsing:
+            status, started, future = parsing.popleft()
+            submit()
+            try:
+                parsed = await future
+            except Exception as e:
+                status.fail(f"parse: {e}")
+                continue
+            status.parse_seconds = time.perf_counter() - started
+            items = await start(status, parsed)
+            if items is not None:
+                yield items
+
+    max_active = max_active or concurrency
+    workers = parse_workers or os.cpu_count() or 1
+    pipeline = build_scene_pipeline(
+        ai_client=ai_client,
+        embedding_model=EMBEDDING_MODEL,
+        mongodb_database=mongodb_database,
+        vector_store=vector_store,
+        session=backfill_session,
+        stage_concurrency={"analysis": concurrency},
+        on_item_done=scene_done
+    )
+    # spawn, like core.workers: forking a process with running threads is unsafe
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        # parse a little ahead of the pipeline, not the whole directory
+        await pipeline.run(interleave(screenplays(pool, window=workers + max_active), max_active))
+    for status in by_screenplay.values():
+        if status.status == "pending":
+            status.status = "partial" if status.scenes_failed else "ingested"
+    return statuses
+
+
+def summarize(statuses: list[FileStatus], elapsed: float) -> dict[str, Any]:
+    """Aggregate counts and throughput of a bulk ingest."""
+    counts: dict[str, int] = {}
+    for status in statuses:
+        counts[status.status] = counts.get(status.status, 0) + 1
+    scenes_done = sum(status.scenes_done for status in statuses)
+    return {
+        "files": len(statuses),
+        "by_status": counts,
+        "scenes_done": scenes_done,
+        "scenes_failed": sum(status.scenes_failed for status in statuses),
+        "elapsed_seconds": round(elapsed, 2),
+        "scenes_per_minute": round(scenes_done * 60.0 / elapsed, 1) if elapsed > 0 else None,
+        "parse_seconds": round(sum(status.parse_seconds or 0.0 for status in statuses), 2)
+    }
+
+
+async def run_ingest(args: argparse.Namespace) -> dict[str, Any]:
+    """Set up the clients, ingest `args.directory` and write the report.
+
+    The report is written even if the run is aborted; files that were
+    still pending are then marked ``failed``.
+    """
+    statuses = list_files(args.directory, read_manifest(args.manifest))
+    await init_db()
+    mongodb_client = init_mongodb_client()
+    mongodb_database = mongodb_client[MONGODB_DATABASE]
+    async_client = init_async_client()
+    ai_client = init_openai_client()
+    pinecone_client = pinecone_index = None
+    if VECTOR_STORE_BACKEND == "local":
+        vector_store = LocalVectorStore(VECTOR_STORE_DIR)
+    else:
+        pinecone_client = init_pinecone_client()
+        pinecone_index = init_pinecone_index(pinecone_client)
+        vector_store = PineconeVectorStore(pinecone_index)
+    started = time.perf_counter()
+    try:
+        await MongoIndexManager(mongodb_database).ensure()
+        async with async_session() as session, async_session() as backfill_session:
+            await ingest_directory(
+                directory=args.directory,
+                statuses=statuses,
+                session=session,
+                backfill_session=backfill_session,
+                async_client=async_client,
+                ai_client=ai_client,
+                mongodb_database=mongodb_database,
+                vector_store=vector_store,
+                storage_dir=args.storage_dir,
+                concurrency=args.concurrency,
+                max_active=args.max_active,
+                parse_workers=args.parse_workers
+            )
+    except BaseException as e:
+        for status in statuses:
+            if status.status == "pending":
+                status.fail(f"aborted: {e!r}")
+        raise
+    finally:
+        await close_async_client(async_client)
+        await close_mongodb_client(mongodb_client)
+        await close_openai_client(ai_client)
+        if pinecone_client is not None:
+            await close_pinecone_index(pinecone_index)
+            await close_pinecone_client(pinecone_client)
+        else:
+            vector_store.close()
+        await db_engine.dispose()
+        summary = summarize(statuses, time.perf_counter() - started)
+        args.report.write_text(json.dumps(
+            {"summary": summary, "files": [asdict(status) for status in statuses]},
+            indent=2
+        ))
+    return summary
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    ingest = commands.add_parser("ingest", help="Ingest a directory of screenplay PDFs.")
+    ingest.add_argument("directory", type=Path)
+    ingest.add_argument("--manifest", type=Path, required=True, help="CSV (file,tmdb_id) or JSON manifest.")
+    ingest.add_argument("--report", type=Path, default=Path("ingest_report.json"))
+    ingest.add_argument(
+        "--storage-dir",
+        type=Path,
+        default=Path(os.environ["STORAGE_DIR"]) if os.getenv("STORAGE_DIR") else None
+    )
+    ingest.add_argument("--concurrency", type=int, default=INGEST_STAGE_CONCURRENCY["analysis"])
+    ingest.add_argument("--max-active", type=int, default=None, help="Screenplays interleaved at once.")
+    ingest.add_argument("--parse-workers", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    summary = asyncio.run(run_ingest(args))
+    print(
+        f"{summary['files']} files {summary['by_status']}: {summary['scenes_done']} scenes "
+        f"({summary['scenes_failed']} failed) in {summary['elapsed_seconds']}s, "
+        f"{summary['scenes_per_minute']} scenes/min, {summary['parse_seconds']}s parsing"
+    )
+    print(f"Report written to {args.report}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,12 @@
 import os
-from core.config import MONGODB_CONNECTION
+import httpx
+from core.config import MONGODB_CONNECTION, LLM_TIMEOUT, OPENAI_MAX_CONNECTIONS
 from pymongo import AsyncMongoClient
 from dotenv import load_dotenv
 from httpx import AsyncClient
-from openai import OpenAI
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
 from pinecone import PineconeAsyncio
+from pinecone.db_data.index_asyncio import IndexAsyncio
 
 load_dotenv()
 
@@ -21,13 +23,27 @@ def init_async_client() -> AsyncClient:
 async def close_async_client(async_client: AsyncClient):
     await async_client.aclose()
 
-def init_openai_client(api_key: str = os.getenv("OPENAI_API_KEY")) -> OpenAI:
-    return OpenAI(
-        api_key=api_key
+def init_openai_client(
+    api_key: str = os.getenv("OPENAI_API_KEY"),
+    max_connections: int = OPENAI_MAX_CONNECTIONS,
+    timeout: float = LLM_TIMEOUT
+) -> AsyncOpenAI:
+    # Retries are handled by services.llms so backoff and rate limiting
+    # apply consistently to every caller.
+    return AsyncOpenAI(
+        api_key=api_key,
+        timeout=timeout,
+        max_retries=0,
+        http_client=DefaultAsyncHttpxClient(
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections
+            )
+        )
     )
 
-def close_openai_client(ai_client: OpenAI):
-    ai_client.close()
+async def close_openai_client(ai_client: AsyncOpenAI):
+    await ai_client.close()
 
 def init_pinecone_client(api_key: str = os.getenv("PINECONE_API_KEY")) -> PineconeAsyncio:
     return PineconeAsyncio(
@@ -35,4 +51,13 @@ def init_pinecone_client(api_key: str = os.getenv("PINECONE_API_KEY")) -> Pineco
     )
 
 async def close_pinecone_client(pinecone_client: PineconeAsyncio):
-    await pinecone_client.close()
\ No newline at end of file
+    await pinecone_client.close()
+
+def init_pinecone_index(
+    pinecone_client: PineconeAsyncio,
+    host: str = os.getenv("PINECONE_HOST_URL")
+) -> IndexAsyncio:
+    return pinecone_client.IndexAsyncio(host=host)
+
+async def close_pinecone_index(index: IndexAsyncio):
+    await index.close()
@@ -11,6 +11,43 @@ Constants:
 	EMBEDDING_MODEL (str): Default embedding model identifier.
 	MONGODB_CONNECTION (str): MongoDB connection URI.
 	MONGODB_DATABASE (str): MongoDB database name.
+	INGEST_STAGE_CONCURRENCY (dict): Worker count per scene ingestion stage.
+	INGEST_QUEUE_SIZE (int): Items buffered in front of each ingestion stage.
+	EMBEDDING_BATCH_SIZE (int): Maximum inputs per embeddings request.
+	EMBEDDING_BATCH_MAX_TOKENS (int): Estimated token budget per embeddings request.
+	EMBEDDING_BATCH_MAX_WAIT (float): Seconds to wait before flushing a partial batch.
+	PINECONE_UPSERT_BATCH_SIZE (int): Maximum vectors per Pinecone upsert request.
+	PINECONE_UPSERT_CONCURRENCY (int): Maximum concurrent Pinecone upsert requests.
+	INGEST_BATCH_TIMEOUT (float): Seconds a bulk-write ingestion stage waits to fill a batch.
+	MONGODB_BULK_WRITE_BATCH_SIZE (int): Maximum scene documents per MongoDB bulk write.
+	SQL_BACKFILL_BATCH_SIZE (int): Maximum scenes per batched SQL backfill UPDATE.
+	LLM_TIMEOUT (float): Per-attempt timeout in seconds for OpenAI calls.
+	LLM_MAX_RETRIES (int): Retries for rate-limited or failed OpenAI calls.
+	OPENAI_MAX_CONNECTIONS (int): Size of the shared OpenAI HTTP connection pool.
+	OPENAI_REQUESTS_PER_MINUTE (int): Initial request budget per model until headers report it.
+	OPENAI_TOKENS_PER_MINUTE (int): Initial token budget per model until headers report it.
+	INGEST_MAX_CONCURRENT_JOBS (int): Background ingestion jobs allowed to run at once.
+	INGEST_SHUTDOWN_TIMEOUT (float): Seconds shutdown waits for running jobs to drain.
+	LLM_CACHE_PATH (str | None): SQLite file caching structured LLM responses; unset disables it.
+	LLM_CACHE_MAX_BYTES (int): Size budget of the LLM response cache.
+	QUERY_EMBEDDING_CACHE_SIZE (int): Query embeddings kept in memory.
+	QUERY_EMBEDDING_CACHE_TTL (float): Seconds a cached query embedding stays valid.
+	QUERY_EMBEDDING_CACHE_PATH (str | None): SQLite file for the persistent query embedding tier.
+	RESULT_CACHE_SIZE (int): Retrieval results kept in memory.
+	RESULT_CACHE_TTL (float): Seconds a cached retrieval result stays valid.
+	VECTOR_STORE_BACKEND (str): ``pinecone`` or ``local`` (in-process memory-mapped index).
+	VECTOR_STORE_DIR (str | None): Directory of the local vector index files.
+	VECTOR_STORE_IVF_LISTS (int): IVF partitions for the local index; 0 means exact search.
+	VECTOR_STORE_QUANTIZATION (str): Local index scan precision: ``none``, ``float16`` or ``int8``.
+	VECTOR_STORE_RESCORE_MULTIPLIER (int): Quantized candidates rescored at full precision, as a multiple of top_k.
+	EMBEDDING_DIMENSIONS (dict): Reduced embedding size per vector namespace.
+	UPLOAD_CHUNK_SIZE (int): Bytes per read/write step when storing uploads.
+	PARSE_WORKERS (int): Processes extracting and splitting PDFs; 0 uses threads.
+	PARSE_PAGES_PER_TASK (int): Pages per PDF parsing task sent to a worker.
+	HYBRID_SEARCH_ENABLED (bool): Fuse FTS5 BM25 results with vector results on retrieval.
+	HYBRID_CANDIDATE_MULTIPLIER (int): Candidates fetched per side, as a multiple of top_k.
+	RRF_K (int): Reciprocal-rank fusion damping constant.
+	VECTOR_METADATA_MODE (str): ``compact`` (ids and filter fields) or ``full`` (also scene texts).
 """
 
 import os
@@ -27,3 +64,102 @@ TOP_K_CONTEXTS = 5
 # Local MongoDB defaults; override with environment variables in production
 MONGODB_CONNECTION = "mongodb://localhost:27017/"
 MONGODB_DATABASE = "trubyai_local"
+
+# Scene ingestion pipeline; each stage gets its own bounded worker pool
+INGEST_STAGE_CONCURRENCY = {
+    "analysis": int(os.getenv("INGEST_ANALYSIS_CONCURRENCY", "4")),
+    # embedding workers only wait on the batcher, so keep enough to fill a batch
+    "embedding": int(os.getenv("INGEST_EMBEDDING_CONCURRENCY", "64")),
+    "mongodb": int(os.getenv("INGEST_MONGODB_CONCURRENCY", "4")),
+    "pinecone": int(os.getenv("INGEST_PINECONE_CONCURRENCY", "4")),
+    "sql": 1,
+}
+INGEST_QUEUE_SIZE = int(os.getenv("INGEST_QUEUE_SIZE", "16"))
+
+# Embedding requests are batched; the API accepts up to 2048 inputs per call
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "256"))
+EMBEDDING_BATCH_MAX_TOKENS = int(os.getenv("EMBEDDING_BATCH_MAX_TOKENS", "250000"))
+EMBEDDING_BATCH_MAX_WAIT = float(os.getenv("EMBEDDING_BATCH_MAX_WAIT", "0.05"))
+
+# Pinecone writes are chunked and sent concurrently with a cap
+PINECONE_UPSERT_BATCH_SIZE = int(os.getenv("PINECONE_UPSERT_BATCH_SIZE", "200"))
+PINECONE_UPSERT_CONCURRENCY = int(os.getenv("PINECONE_UPSERT_CONCURRENCY", "4"))
+INGEST_BATCH_TIMEOUT = float(os.getenv("INGEST_BATCH_TIMEOUT", "2.0"))
+
+# MongoDB scene documents are upserted in unordered bulk writes
+MONGODB_BULK_WRITE_BATCH_SIZE = int(os.getenv("MONGODB_BULK_WRITE_BATCH_SIZE", "500"))
+
+# Scene rows are backfilled with one executemany UPDATE per batch
+SQL_BACKFILL_BATCH_SIZE = int(os.getenv("SQL_BACKFILL_BATCH_SIZE", "500"))
+
+# OpenAI calls: one pooled async client, per-call timeouts, jittered retries
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "60"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "5"))
+LLM_RETRY_BASE_DELAY = 0.5
+LLM_RETRY_MAX_DELAY = 30.0
+OPENAI_MAX_CONNECTIONS = int(os.getenv("OPENAI_MAX_CONNECTIONS", "32"))
+
+# Client-side OpenAI rate limiting; budgets are corrected from response headers
+OPENAI_REQUESTS_PER_MINUTE = int(os.getenv("OPENAI_REQUESTS_PER_MINUTE", "500"))
+OPENAI_TOKENS_PER_MINUTE = int(os.getenv("OPENAI_TOKENS_PER_MINUTE", "200000"))
+OPENAI_MAX_CONCURRENCY = int(os.getenv("OPENAI_MAX_CONCURRENCY", "16"))
+OPENAI_MIN_CONCURRENCY = 1
+LLM_EXPECTED_OUTPUT_TOKENS = 700
+
+# Background ingestion jobs
+INGEST_MAX_CONCURRENT_JOBS = int(os.getenv("INGEST_MAX_CONCURRENT_JOBS", "2"))
+INGEST_JOB_HISTORY = 100
+INGEST_SHUTDOWN_TIMEOUT = float(os.getenv("INGEST_SHUTDOWN_TIMEOUT", "30"))
+
+# Structured LLM responses are cached on disk, next to the SQL database by default
+LLM_CACHE_PATH = os.getenv(
+    "LLM_CACHE_PATH",
+    os.path.join(os.path.dirname(SQL_DB_PATH), "llm_cache.sqlite3") if SQL_DB_PATH else ""
+) or None
+LLM_CACHE_MAX_BYTES = int(os.getenv("LLM_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+
+# Query embeddings: in-memory LRU with TTL, backed by a persistent SQLite tier
+QUERY_EMBEDDING_CACHE_SIZE = int(os.getenv("QUERY_EMBEDDING_CACHE_SIZE", "10000"))
+QUERY_EMBEDDING_CACHE_TTL = float(os.getenv("QUERY_EMBEDDING_CACHE_TTL", str(7 * 24 * 3600)))
+QUERY_EMBEDDING_CACHE_PATH = os.getenv("QUERY_EMBEDDING_CACHE_PATH", LLM_CACHE_PATH or "") or None
+QUERY_EMBEDDING_CACHE_MAX_BYTES = int(os.getenv("QUERY_EMBEDDING_CACHE_MAX_BYTES", str(128 * 1024 * 1024)))
+
+# Retrieval results; invalidated whenever screenplays are ingested or deleted
+RESULT_CACHE_SIZE = int(os.getenv("RESULT_CACHE_SIZE", "2048"))
+RESULT_CACHE_TTL = float(os.getenv("RESULT_CACHE_TTL", "300"))
+
+# Vector store backend: the remote Pinecone index or a local memory-mapped index
+VECTOR_STORE_BACKEND = os.getenv("VECTOR_STORE_BACKEND", "pinecone")
+VECTOR_STORE_DIR = os.getenv(
+    "VECTOR_STORE_DIR",
+    os.path.join(os.path.dirname(SQL_DB_PATH), "vectors") if SQL_DB_PATH else ""
+) or None
+VECTOR_STORE_IVF_LISTS = int(os.getenv("VECTOR_STORE_IVF_LISTS", "0"))
+VECTOR_STORE_IVF_NPROBE = int(os.getenv("VECTOR_STORE_IVF_NPROBE", "8"))
+# Quantized rows are scanned first, the best candidates are rescored in float32
+VECTOR_STORE_QUANTIZATION = os.getenv("VECTOR_STORE_QUANTIZATION", "none")
+VECTOR_STORE_RESCORE_MULTIPLIER = int(os.getenv("VECTOR_STORE_RESCORE_MULTIPLIER", "4"))
+
+# Shortened embeddings per namespace, e.g. "scene_embeddings=512"; other namespaces
+# get the model's full size. A Pinecone index has one dimension for all namespaces.
+EMBEDDING_DIMENSIONS = {
+    namespace.strip(): int(dimensions)
+    for namespace, dimensions in (
+        entry.split("=") for entry in os.getenv("EMBEDDING_DIMENSIONS", "").split(",") if entry.strip()
+    )
+}
+
+# Hybrid retrieval: BM25 over the scene FTS5 index fused with vector search
+HYBRID_SEARCH_ENABLED = os.getenv("HYBRID_SEARCH_ENABLED", "1") == "1"
+HYBRID_CANDIDATE_MULTIPLIER = int(os.getenv("HYBRID_CANDIDATE_MULTIPLIER", "4"))
+RRF_K = 60
+
+# Vector metadata: compact keeps ids and filter fields; text is hydrated from MongoDB
+VECTOR_METADATA_MODE = os.getenv("VECTOR_METADATA_MODE", "compact")
+
+# Uploads are streamed to STORAGE_DIR in chunks of this size
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", str(1024 * 1024)))
+
+# PDF extraction and scene splitting run in a process pool, in page ranges
+PARSE_WORKERS = int(os.getenv("PARSE_WORKERS", str(min(4, os.cpu_count() or 1))))
+PARSE_PAGES_PER_TASK = int(os.getenv("PARSE_PAGES_PER_TASK", "40"))
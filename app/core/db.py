@@ -1,44 +1,154 @@
 """Database initialization and session helpers.
 
-This module is responsible for creating the SQLAlchemy/SQLModel engine
-and providing helper functions for initializing the database schema and
-obtaining sessions for use by request handlers and CRUD operations.
+This module is responsible for creating the async SQLAlchemy/SQLModel
+engine and providing helper functions for initializing the database schema
+and obtaining sessions for use by request handlers and CRUD operations.
+
+Queries run through SQLAlchemy's asyncio extension, so they never block the
+event loop. The engine is SQLite through ``aiosqlite`` at ``SQL_DB_PATH``, or
+at the full ``sqlite+aiosqlite://`` URL in ``SQL_DATABASE_URL`` when set. Other
+databases are not supported: scene checkpoints are written with SQLite's
+upsert and hybrid search reads the FTS5 ``scene_fts`` table.
+
+Sessions do not expire their objects on commit: with an `AsyncSession` an
+expired attribute would have to be reloaded implicitly, which is not
+possible without an ``await``.
+
+SQLite only enforces foreign keys when asked to on each connection, so
+`enable_sqlite_foreign_keys` runs on every new connection. Without it the
+``ON DELETE CASCADE`` rules never fire and deleting a screenplay leaves its
+scenes and ingestion checkpoints behind.
+
+``SQLModel.metadata.create_all`` only creates missing tables, it never
+alters existing ones, so `init_db` also runs `upgrade_schema`. That brings
+tables created by earlier versions of the application up to the current
+models; every step checks the live schema first and is a no-op once applied.
 
 Functions:
+    enable_sqlite_foreign_keys(dbapi_connection, connection_record): Connect hook.
+    upgrade_schema(connection): Migrate tables created by earlier versions.
     init_db(): Create database tables defined by SQLModel metadata.
-    get_session(): Generator that yields a SQLModel Session for dependency injection.
+    get_session(): Async generator that yields an `AsyncSession` for dependency injection.
 """
 
 import os
-from typing import Generator
-from sqlmodel import Session, create_engine, SQLModel
+from typing import Any, AsyncGenerator
+from sqlalchemy import Connection, event, inspect, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
 from dotenv import load_dotenv
+from models.db.scenes import SceneEmbedding
+from models.db.screenplays import Screenplay
 
 load_dotenv()
 
-DATABASE_URL = f"sqlite:///{os.getenv('SQL_DB_PATH')}"
-engine = create_engine(DATABASE_URL, echo=True, connect_args={"check_same_thread": False})
+DATABASE_URL = os.getenv("SQL_DATABASE_URL") or f"sqlite+aiosqlite:///{os.getenv('SQL_DB_PATH')}"
+engine = create_async_engine(DATABASE_URL, echo=True)
+async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+
+def enable_sqlite_foreign_keys(dbapi_connection: Any, connection_record: Any):
+    """Turn on foreign key enforcement for a new SQLite connection."""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
+if engine.dialect.name == "sqlite":
+    event.listen(engine.sync_engine, "connect", enable_sqlite_foreign_keys)
+
+
+def column_names(connection: Connection, table_name: str) -> set[str]:
+    """Return the column names of an existing table."""
+    return {column["name"] for column in inspect(connection).get_columns(table_name)}
+
+
+def upgrade_scene_embedding_table(connection: Connection):
+    """Rebuild a ``sceneembedding`` table that predates ingestion checkpoints.
+
+    The original table only held ``scene_id`` and ``mongo_id``. SQLite cannot
+    add the non-null ``screenplay_id``/``scene_number`` columns or the unique
+    ``scene_id`` constraint in place, so the table is recreated from the model
+    and the old rows are copied over, taking the screenplay and scene number
+    from their scene. Rows of deleted scenes and duplicates of a scene are
+    dropped. ``vector_id`` and ``embedding_model`` stay empty, so copied rows
+    are never mistaken for checkpoints of the current embedding model.
+    """
+    if "screenplay_id" in column_names(connection, SceneEmbedding.__tablename__):
+        return
+    connection.execute(text("ALTER TABLE sceneembedding RENAME TO sceneembedding_old"))
+    SceneEmbedding.__table__.create(connection)
+    connection.execute(text(
+        "INSERT INTO sceneembedding (scene_id, screenplay_id, scene_number, mongo_id, created_at, updated_at) "
+        "SELECT old.scene_id, scene.screenplay_id, scene.scene_number, old.mongo_id, old.created_at, old.updated_at "
+        "FROM sceneembedding_old AS old JOIN scene ON scene.id = old.scene_id "
+        "WHERE old.id IN (SELECT MAX(id) FROM sceneembedding_old GROUP BY scene_id)"
+    ))
+    connection.execute(text("DROP TABLE sceneembedding_old"))
+
+
+def add_screenplay_content_hash(connection: Connection):
+    """Add the indexed ``content_hash`` column to an older ``screenplay`` table.
+
+    Existing screenplays keep a NULL hash, so they are never matched as the
+    original of a new upload.
+    """
+    if "content_hash" in column_names(connection, Screenplay.__tablename__):
+        return
+    connection.execute(text("ALTER TABLE screenplay ADD COLUMN content_hash VARCHAR"))
+    for index in Screenplay.__table__.indexes:
+        if index.columns.keys() == ["content_hash"]:
+            index.create(connection, checkfirst=True)
+
+
+def add_screenplay_tmdb_id(connection: Connection):
+    """Add ``tmdb_id`` and the unique ``(content_hash, tmdb_id)`` index to an older ``screenplay`` table.
+
+    The TMDB id is taken from the movie that points at the screenplay. A
+    movie points at a single screenplay, so the existing rows cannot break
+    the index; screenplays no movie points at keep a NULL id.
+    """
+    if "tmdb_id" in column_names(connection, Screenplay.__tablename__):
+        return
+    connection.execute(text("ALTER TABLE screenplay ADD COLUMN tmdb_id INTEGER"))
+    connection.execute(text(
+        "UPDATE screenplay SET tmdb_id = (SELECT movie.tmdb_id FROM movie WHERE movie.screenplay_id = screenplay.id)"
+    ))
+    for index in Screenplay.__table__.indexes:
+        if "tmdb_id" in index.columns.keys():
+            index.create(connection, checkfirst=True)
+
+
+def upgrade_schema(connection: Connection):
+    """Bring tables created by earlier versions up to the current models."""
+    upgrade_scene_embedding_table(connection)
+    add_screenplay_content_hash(connection)
+    add_screenplay_tmdb_id(connection)
 
 
-def init_db():
+async def init_db():
     """Create all tables in the database.
 
     Uses SQLModel.metadata to create tables for all declared models
-    bound to the configured engine.
+    bound to the configured engine, then upgrades tables created by earlier
+    versions (see `upgrade_schema`).
 
     Returns:
         None
     """
 
-    SQLModel.metadata.create_all(engine)
+    async with engine.begin() as connection:
+        await connection.run_sync(SQLModel.metadata.create_all)
+        await connection.run_sync(upgrade_schema)
 
 
-def get_session() -> Generator[Session, None, None]:
+async def get_session() -> AsyncGenerator[AsyncSession, None]:
     """Yield a database session for use with dependency injection.
 
     Yields:
-        Session: A SQLModel Session instance.
+        AsyncSession: A SQLModel AsyncSession instance.
     """
 
-    with Session(engine) as session:
-        yield session
\ No newline at end of file
+    async with async_session() as session:
+        yield session
@@ -0,0 +1,112 @@
+"""MongoDB index management.
+
+The indexes the application's queries rely on are declared here and created
+at startup by `MongoIndexManager` (see `main.lifespan`). Creation is
+idempotent: indexes that already exist are only recorded, missing ones are
+built in a background task so a large collection does not hold up startup.
+The per-index status can be inspected while the build runs.
+
+Classes:
+    MongoIndexManager: Creates the declared indexes and tracks their status.
+"""
+
+import asyncio
+from typing import Any
+from pymongo import ASCENDING, IndexModel
+from pymongo.asynchronous.database import AsyncDatabase
+
+MONGODB_INDEXES: dict[str, list[IndexModel]] = {
+    "scenes": [
+        # upsert key of scene documents and per-screenplay lookups; unique so
+        # concurrent upserts (e.g. a resume racing the original ingest)
+        # cannot insert the same scene twice. Renamed from the earlier
+        # non-unique "screenplay_id_scene_number", which existing
+        # deployments may drop once this one is built.
+        IndexModel(
+            [("screenplay_id", ASCENDING), ("scene_number", ASCENDING)],
+            name="screenplay_id_scene_number_unique",
+            unique=True
+        ),
+        IndexModel([("screenplay_id", ASCENDING), ("story_beat", ASCENDING)], name="screenplay_id_story_beat"),
+        IndexModel([("scene_id", ASCENDING)], name="scene_id"),
+    ]
+}
+
+
+class MongoIndexManager:
+    """Ensure the declared indexes exist and report their build status.
+
+    Each index is ``pending`` until checked, then ``ready`` (already
+    present or built), ``building`` while `create_indexes` runs, or
+    ``failed`` with the server's error, e.g. when an index of the same name
+    exists with different options.
+
+    Args:
+        database: Async MongoDB database.
+        indexes: Index models per collection name.
+    """
+
+    def __init__(self, database: AsyncDatabase, indexes: dict[str, list[IndexModel]] = MONGODB_INDEXES):
+        self.database = database
+        self.indexes = indexes
+        self.status: dict[str, dict[str, Any]] = {
+            f"{collection}.{model.document['name']}": {
+                "collection": collection,
+                "name": model.document["name"],
+                "keys": dict(model.document["key"]),
+                "state": "pending",
+                "error": None
+            }
+            for collection, models in indexes.items()
+            for model in models
+        }
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> asyncio.Task:
+        """Run `ensure` in the background and return its task."""
+        self._task = asyncio.create_task(self.ensure())
+        return self._task
+
+    async def ensure(self) -> dict[str, dict[str, Any]]:
+        """Create every missing index; safe to run repeatedly."""
+        for collection_name, models in self.indexes.items():
+            collection = self.database[collection_name]
+            try:
+                existing = {index["name"] async for index in await collection.list_indexes()}
+            except Exception as e:
+                self._mark(collection_name, models, "failed", str(e))
+                continue
+            missing = []
+            for model in models:
+                if model.document["name"] in existing:
+                    self._mark(collection_name, [model], "ready")
+                else:
+                    missing.append(model)
+            for model in missing:
+                self._mark(collection_name, [model], "building")
+                try:
+                    await collection.create_indexes([model])
+                except Exception as e:
+                    self._mark(collection_name, [model], "failed", str(e))
+                else:
+                    self._mark(collection_name, [model], "ready")
+        return self.status
+
+    def _mark(self, collection: str, models: list[IndexModel], state: str, error: str | None = None):
+        for model in models:
+            entry = self.status[f"{collection}.{model.document['name']}"]
+            entry["state"] = state
+            entry["error"] = error
+
+    def report(self) -> dict[str, Any]:
+        states = [entry["state"] for entry in self.status.values()]
+        return {
+            "ready": all(state == "ready" for state in states),
+            "indexes": list(self.status.values())
+        }
+
+    async def close(self):
+        """Stop a build that is still running (the server finishes it)."""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
@@ -0,0 +1,181 @@
+"""In-process background job runner for screenplay ingestion.
+
+Ingestion (PDF parsing, LLM analysis, embedding and indexing) takes minutes,
+so the API hands it to a `JobRunner` and answers immediately with a job id.
+Each `IngestJob` records its current stage, scene progress, throughput and
+errors so clients can poll it. On shutdown the runner gives running jobs a
+grace period to finish and then cancels the rest, marking them
+``interrupted``.
+
+Classes:
+    IngestJob: Progress record for one ingestion run.
+    JobRunner: Starts, tracks and shuts down ingestion jobs.
+"""
+
+import time
+import uuid
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Hashable
+from core.config import INGEST_MAX_CONCURRENT_JOBS, INGEST_JOB_HISTORY
+from core.pipeline import PipelineItem
+
+
+@dataclass
+class IngestJob:
+    """Progress and outcome of one ingestion job.
+
+    Attributes:
+        id: Job identifier returned to the client.
+        status: ``queued``, ``running``, ``succeeded``, ``failed`` or
+            ``interrupted``.
+        stage: Human-readable step the job is currently in.
+        scenes_total: Number of scenes to ingest, once known.
+        scenes_done: Scenes that made it through every pipeline stage.
+        scenes_failed: Scenes that failed in some stage.
+        errors: Error messages collected while running.
+        result: Payload returned by the job on success.
+    """
+
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    status: str = "queued"
+    stage: str = "queued"
+    scenes_total: int | None = None
+    scenes_done: int = 0
+    scenes_failed: int = 0
+    errors: list[str] = field(default_factory=list)
+    result: dict[str, Any] | None = None
+    created_at: float = field(default_factory=time.time)
+    started_at: float | None = None
+    finished_at: float | None = None
+
+    def set_stage(self, stage: str):
+        self.stage = stage
+
+    def scene_done(self, item: PipelineItem):
+        """Pipeline `on_item_done` callback updating the scene counters."""
+        if item.ok:
+            self.scenes_done += 1
+        else:
+            self.scenes_failed += 1
+            self.errors.append(f"{item.failed_stage}: {item.error}")
+
+    @property
+    def finished(self) -> bool:
+        return self.finished_at is not None
+
+    def throughput(self) -> float | None:
+        """Completed scenes per minute since the job started."""
+        if self.started_at is None:
+            return None
+        elapsed = (self.finished_at or time.time()) - self.started_at
+        return self.scenes_done * 60.0 / elapsed if elapsed > 0 else None
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "stage": self.stage,
+            "scenes_total": self.scenes_total,
+            "scenes_done": self.scenes_done,
+            "scenes_failed": self.scenes_failed,
+            "scenes_per_minute": self.throughput(),
+            "errors": self.errors,
+            "result": self.result,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class JobRunner:
+    """Run ingestion coroutines in the background and track their progress.
+
+    Args:
+        max_concurrent_jobs: Jobs allowed to run at once; the rest queue.
+        history: Number of finished jobs kept for status lookups.
+    """
+
+    def __init__(self, max_concurrent_jobs: int = INGEST_MAX_CONCURRENT_JOBS, history: int = INGEST_JOB_HISTORY):
+        self.jobs: dict[str, IngestJob] = {}
+        self.history = history
+        self._tasks: dict[str, asyncio.Task] = {}
+        self._keyed: dict[Hashable, IngestJob] = {}
+        self._semaphore = asyncio.Semaphore(max_concurrent_jobs)
+        self._accepting = True
+
+    def submit(
+        self,
+        work: Callable[[IngestJob], Awaitable[dict[str, Any] | None]],
+        key: Hashable | None = None
+    ) -> IngestJob:
+        """Schedule `work(job)` and return its job record immediately.
+
+        A job submitted with a `key` is returned by `active` until it
+        finishes. Checking `active` and submitting without an ``await`` in
+        between keeps concurrent requests from starting the same work twice.
+
+        Raises:
+            RuntimeError: If the runner is shutting down.
+        """
+        if not self._accepting:
+            raise RuntimeError("The job runner is shutting down.")
+        job = IngestJob()
+        self.jobs[job.id] = job
+        self._prune()
+        task = asyncio.create_task(self._run(job, work))
+        self._tasks[job.id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(job.id, None))
+        if key is not None:
+            self._keyed[key] = job
+
+            def release(_: asyncio.Task):
+                if self._keyed.get(key) is job:
+                    del self._keyed[key]
+
+            task.add_done_callback(release)
+        return job
+
+    def get(self, job_id: str) -> IngestJob | None:
+        return self.jobs.get(job_id)
+
+    def active(self, key: Hashable) -> IngestJob | None:
+        """Return the unfinished job submitted with `key`, if any."""
+        return self._keyed.get(key)
+
+    async def _run(self, job: IngestJob, work: Callable[[IngestJob], Awaitable[dict[str, Any] | None]]):
+        try:
+            async with self._semaphore:
+                job.status = "running"
+                job.started_at = time.time()
+                job.result = await work(job)
+                job.status = "succeeded"
+                job.stage = "done"
+        except asyncio.CancelledError:
+            job.status = "interrupted"
+            job.errors.append("Interrupted by shutdown before completion.")
+        except Exception as e:
+            job.status = "failed"
+            job.errors.append(str(getattr(e, "detail", None) or e))
+        finally:
+            job.finished_at = time.time()
+
+    def _prune(self):
+        finished = [job for job in self.jobs.values() if job.finished]
+        for job in sorted(finished, key=lambda job: job.finished_at)[:max(0, len(finished) - self.history)]:
+            del self.jobs[job.id]
+
+    async def shutdown(self, timeout: float):
+        """Stop accepting jobs, let running ones drain, then cancel the rest.
+
+        Args:
+            timeout: Seconds to wait for in-flight jobs before cancelling.
+        """
+        self._accepting = False
+        tasks = list(self._tasks.values())
+        if not tasks:
+            return
+        _, pending = await asyncio.wait(tasks, timeout=timeout)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
@@ -0,0 +1,189 @@
+"""Bounded, queue-based async processing pipeline.
+
+This module provides a small staged pipeline built on `asyncio.Queue`.
+Each stage owns a pool of worker tasks and a bounded input queue, so a slow
+stage applies backpressure to the stages in front of it instead of letting
+work pile up in memory. Items flow through the stages in order; an item whose
+handler raises is recorded as failed and skips the remaining stages.
+
+Batch stages hand their handler a list of payloads (up to `batch_size`,
+gathered for at most `batch_timeout` seconds) so bulk writes can replace
+per-item requests.
+
+Classes:
+    Stage: Name, handler and worker count for one pipeline step.
+    PipelineItem: Wrapper carrying a payload and its failure state.
+    Pipeline: Runs payloads through a sequence of stages.
+"""
+
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterable, Awaitable, Callable, Iterable
+
+
+@dataclass
+class Stage:
+    """A single pipeline step.
+
+    Attributes:
+        name: Stage label used when reporting failures.
+        handler: Coroutine function receiving a payload and returning the
+            payload handed to the next stage. For batch stages it receives a
+            list of payloads and returns a list of the same length; an
+            exception instance in that list fails only the matching item.
+        concurrency: Number of worker tasks processing this stage.
+        batch_size: Maximum payloads per handler call. ``None`` makes this a
+            per-item stage.
+        batch_timeout: Seconds a worker waits for a batch to fill after its
+            first item arrives.
+    """
+
+    name: str
+    handler: Callable[[Any], Awaitable[Any]]
+    concurrency: int = 1
+    batch_size: int | None = None
+    batch_timeout: float = 0.0
+
+
+@dataclass
+class PipelineItem:
+    """A payload travelling through the pipeline.
+
+    Attributes:
+        payload: The user object passed between stage handlers.
+        error: Exception raised by the failing stage, if any.
+        failed_stage: Name of the stage that raised, if any.
+    """
+
+    payload: Any
+    error: BaseException | None = field(default=None)
+    failed_stage: str | None = field(default=None)
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class Pipeline:
+    """Run payloads through bounded, concurrent stages.
+
+    Args:
+        stages: Ordered list of stages every payload passes through.
+        queue_size: Maximum number of items buffered in front of each stage.
+        on_item_done: Optional callback invoked once per item when it leaves
+            the pipeline (successfully or not).
+    """
+
+    def __init__(
+        self,
+        stages: list[Stage],
+        queue_size: int = 16,
+        on_item_done: Callable[[PipelineItem], None] | None = None
+    ):
+        if not stages:
+            raise ValueError("A pipeline needs at least one stage.")
+        self.stages = stages
+        self.queue_size = queue_size
+        self.on_item_done = on_item_done
+
+    async def run(self, payloads: Iterable[Any] | AsyncIterable[Any]) -> list[PipelineItem]:
+        """Feed `payloads` through every stage and wait for all of them.
+
+        Args:
+            payloads: Sync or async iterable of payloads. It is consumed
+                lazily, so producers are throttled by the first stage's queue.
+
+        Returns:
+            All pipeline items in completion order. Failed items carry the
+            exception and the name of the stage that raised it.
+        """
+        queues = [asyncio.Queue(maxsize=self.queue_size) for _ in self.stages]
+        finished: list[PipelineItem] = []
+
+        def finish(item: PipelineItem):
+            finished.append(item)
+            if self.on_item_done is not None:
+                self.on_item_done(item)
+
+        def fail(item: PipelineItem, stage: Stage, error: BaseException):
+            item.error = error
+            item.failed_stage = stage.name
+            finish(item)
+
+        async def forward(index: int, item: PipelineItem):
+            if index + 1 < len(self.stages):
+                await queues[index + 1].put(item)
+            else:
+                finish(item)
+
+        async def collect(stage: Stage, queue: asyncio.Queue) -> list[PipelineItem]:
+            batch = [await queue.get()]
+            deadline = asyncio.get_running_loop().time() + stage.batch_timeout
+            while len(batch) < stage.batch_size:
+                if not queue.empty():
+                    batch.append(queue.get_nowait())
+                    continue
+                remaining = deadline - asyncio.get_running_loop().time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), remaining))
+                except TimeoutError:
+                    break
+            return batch
+
+        async def worker(index: int):
+            stage = self.stages[index]
+            queue = queues[index]
+            while True:
+                if stage.batch_size is None:
+                    batch = [await queue.get()]
+                else:
+                    batch = await collect(stage, queue)
+                try:
+                    try:
+                        if stage.batch_size is None:
+                            results = [await stage.handler(batch[0].payload)]
+                        else:
+                            results = await stage.handler([item.payload for item in batch])
+                            if len(results) != len(batch):
+                                raise ValueError(
+                                    f"Stage {stage.name!r} returned {len(results)} results for {len(batch)} items."
+                                )
+                    except Exception as e:
+                        for item in batch:
+                            fail(item, stage, e)
+                        continue
+                    for item, result in zip(batch, results):
+                        if isinstance(result, Exception):
+                            fail(item, stage, result)
+                        else:
+                            item.payload = result
+                            await forward(index, item)
+                finally:
+                    for _ in batch:
+                        queue.task_done()
+
+        workers = [
+            [asyncio.create_task(worker(index)) for _ in range(max(1, stage.concurrency))]
+            for index, stage in enumerate(self.stages)
+        ]
+        try:
+            if isinstance(payloads, AsyncIterable):
+                async for payload in payloads:
+                    await queues[0].put(PipelineItem(payload=payload))
+            else:
+                for payload in payloads:
+                    await queues[0].put(PipelineItem(payload=payload))
+            # Stage workers forward an item before marking it done, so once a
+            # queue is joined every item it held has reached the next queue.
+            for index, queue in enumerate(queues):
+                await queue.join()
+                for task in workers[index]:
+                    task.cancel()
+        finally:
+            all_workers = [task for stage_workers in workers for task in stage_workers]
+            for task in all_workers:
+                task.cancel()
+            await asyncio.gather(*all_workers, return_exceptions=True)
+        return finished
@@ -0,0 +1,53 @@
+"""Process pool for CPU-bound work.
+
+PDF text extraction, scene splitting and text cleaning are CPU-bound and
+hold the GIL, so running them in a thread still slows down every other
+request served by the event loop. They are submitted to a process-wide
+`ProcessPoolExecutor` of `PARSE_WORKERS` processes instead; with
+``PARSE_WORKERS=0`` work falls back to the event loop's default thread pool.
+Workers are started with ``spawn``, so they do not inherit the server's
+threads and open connections.
+
+Functions:
+    get_process_pool(): Process-wide executor, created on first use.
+    run_cpu_bound(fn, *args): Future running `fn(*args)` off the event loop.
+    shutdown_process_pool(): Stop the worker processes.
+"""
+
+import asyncio
+import functools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable
+from core.config import PARSE_WORKERS
+
+_process_pool: ProcessPoolExecutor | None = None
+
+
+def get_process_pool() -> ProcessPoolExecutor | None:
+    """Return the process-wide pool, or ``None`` when `PARSE_WORKERS` is 0."""
+    global _process_pool
+    if _process_pool is None and PARSE_WORKERS > 0:
+        _process_pool = ProcessPoolExecutor(
+            max_workers=PARSE_WORKERS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _process_pool
+
+
+def run_cpu_bound(fn: Callable[..., Any], *args: Any) -> asyncio.Future:
+    """Schedule `fn(*args)` in the process pool and return its future.
+
+    `fn` and its arguments must be picklable, i.e. `fn` is a module-level
+    function. The future is returned without awaiting it, so callers can
+    keep several tasks in flight.
+    """
+    return asyncio.get_running_loop().run_in_executor(get_process_pool(), functools.partial(fn, *args))
+
+
+def shutdown_process_pool():
+    """Stop the workers; queued tasks are cancelled."""
+    global _process_pool
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=False, cancel_futures=True)
+        _process_pool = None
@@ -15,7 +15,8 @@ import os
 import httpx
 from typing import Any
 from dotenv import load_dotenv
-from sqlmodel import Session, select
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from fastapi import HTTPException
 from models.db.movies import Movie
 from models.schemas.movies import MovieCreate, TMDBMovieModel
@@ -64,7 +65,7 @@ def tmdb_json_to_movie(tmdb_response: dict) -> Movie:
     Returns:
         A `Movie` instance populated from the TMDB response. The returned
         object is not persisted to the database; call site must add/commit it
-        to a `Session`.
+        to an `AsyncSession`.
     """
     tmdb_movie_model = TMDBMovieModel(**tmdb_response)
     movie_create_model = MovieCreate(
@@ -82,40 +83,52 @@ def tmdb_json_to_movie(tmdb_response: dict) -> Movie:
 async def create_movie(
     tmdb_id: int,
     async_client: httpx.AsyncClient,
-    session: Session
+    session: AsyncSession
 ) -> Movie:
     """Create and persist a new `Movie` record from TMDB data.
 
     This function checks whether a `Movie` with the given TMDB ID already
-    exists in the provided `Session`. If not, it fetches the data from TMDB,
+    exists in the provided `AsyncSession`. If not, it fetches the data from TMDB,
     converts it into a `Movie` instance and persists it.
 
     Args:
         tmdb_id: The TMDB identifier for the movie to create.
         async_client: An `httpx.AsyncClient` used to fetch TMDB data.
-        session: A SQLModel/SQLAlchemy `Session` used to query and persist the
-            `Movie` record.
+        session: A SQLModel/SQLAlchemy `AsyncSession` used to query and
+            persist the `Movie` record.
+
+    A movie left behind by an earlier attempt that failed before its
+    screenplay was stored is returned as-is, so the upload can be retried.
 
     Returns:
         The newly created and refreshed `Movie` instance.
 
     Raises:
-        HTTPException: If a movie with the same TMDB ID already exists (400),
-            or if the TMDB API returns an error while fetching the movie.
+        HTTPException: If a movie with the same TMDB ID already has a
+            screenplay (400), or if the TMDB API returns an error while
+            fetching the movie.
     """
-    movie_record = session.exec(select(Movie).where(Movie.tmdb_id == tmdb_id)).first()
+    movie_record = (await session.exec(select(Movie).where(Movie.tmdb_id == tmdb_id))).first()
     if movie_record:
-        raise HTTPException(status_code=400, detail="There is already a screenplay for this movie.")
+        if movie_record.screenplay_id is None:
+            return movie_record
+        raise HTTPException(
+            status_code=400,
+            detail=(
+                "There is already a screenplay for this movie. Resume it via "
+                f"/screenplays/{movie_record.screenplay_id}/resume if its ingestion failed."
+            )
+        )
     tmdb_response = await fetch_tmdb_movie(tmdb_id=tmdb_id, async_client=async_client)
     movie_record = tmdb_json_to_movie(tmdb_response=tmdb_response)
     session.add(movie_record)
-    session.commit()
-    session.refresh(movie_record)
+    await session.commit()
+    await session.refresh(movie_record)
     return movie_record
 
-def get_movie(
+async def get_movie(
     screenplay_id: int,
-    session: Session
+    session: AsyncSession
 ) -> dict[str, Any]:
     """Retrieve movie based on the screenplay ID.
     
@@ -130,7 +143,7 @@ def get_movie(
         ValueError: If no movie is found for the given screenplay ID.
     """
     movie_stmt = select(Movie).where(Movie.screenplay_id == screenplay_id)
-    results = session.exec(movie_stmt).first()
+    results = (await session.exec(movie_stmt)).first()
     if results:
         return {"movie": results}
     else:
@@ -5,28 +5,73 @@ generation of AI-driven summaries/analysis, and indexing of embeddings in a
 vector database (Pinecone) with a corresponding MongoDB document for each
 scene.
 
-The functions here are written to be non-blocking from the event loop; when
-blocking or sync-only client methods are used they are executed in a
-background thread where appropriate.
+Scenes are ingested through a staged pipeline (analysis -> embedding ->
+MongoDB -> Pinecone -> SQL backfill) so several scenes are in flight at once;
+see `build_scene_pipeline`. The SQL backfill also checkpoints each finished
+scene in `SceneEmbedding`, and vector ids are derived from the screenplay id
+and scene number, so an interrupted ingestion can be continued with
+`resume_scenes` without redoing finished scenes. Scene texts may be streamed
+into the pipeline (`iter_scene_items`), and finished scenes drop their text
+and embedding, so memory does not grow with the screenplay.
 
-Note: Only docstrings are added in this change; no logic or behavior is
-modified.
+`copy_scenes` gives a new screenplay the scenes of an already ingested one
+(a duplicate upload): the stored analyses, texts and vectors are fed through
+the same pipeline, whose analysis and embedding stages pass them through, so
+no model is called.
+
+Retrieval can be hybrid: BM25 hits from the scene FTS5 index (written by the
+SQL backfill) are fused with the vector matches; see `get_relevant_contexts`.
+In the default compact metadata mode vectors carry only ids and filterable
+fields, and the scene text of the matches is hydrated from MongoDB with one
+query per search (`hydrate_contexts`). Hydration goes by the document's
+``_id``: SQL scene ids are reused after a screenplay is deleted, so they do
+not identify a document. `delete_scene_documents` removes a screenplay's
+documents and vectors when the screenplay itself is deleted.
+
+The functions here are written to be non-blocking from the event loop: LLM
+and embedding calls go through the async helpers in `services.llms`, and SQL
+runs on an `AsyncSession` (see `core.db`).
 """
 
 import os
-import json
 import asyncio
-from typing import Any
+from datetime import date
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Iterable
+from bson import ObjectId
 from dotenv import load_dotenv
-from openai import OpenAI
-from pinecone import PineconeAsyncio
-from pinecone.db_data.index_asyncio import IndexAsyncio
+from openai import AsyncOpenAI
+from pymongo import UpdateOne
 from pymongo.asynchronous.database import AsyncDatabase
-from sqlmodel import Session, select
-from models.schemas.scenes import SceneCreate
-from models.db.scenes import Scene
+from pymongo.errors import BulkWriteError
+from sqlalchemy import insert, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlmodel import select, func
+from sqlmodel.ext.asyncio.session import AsyncSession
+from models.schemas.scenes import SceneCreate, SceneQueryFilters
+from models.db.movies import Movie
+from models.db.scenes import Scene, SceneEmbedding
 from ai.scenes import generate_scene_analysis
-from core.config import PINECONE_NAMESPACE, EMBEDDING_MODEL, TOP_K_CONTEXTS
+from core.config import (
+    PINECONE_NAMESPACE,
+    EMBEDDING_MODEL,
+    TOP_K_CONTEXTS,
+    INGEST_STAGE_CONCURRENCY,
+    INGEST_QUEUE_SIZE,
+    INGEST_BATCH_TIMEOUT,
+    PINECONE_UPSERT_BATCH_SIZE,
+    MONGODB_BULK_WRITE_BATCH_SIZE,
+    SQL_BACKFILL_BATCH_SIZE,
+    HYBRID_CANDIDATE_MULTIPLIER,
+    VECTOR_METADATA_MODE
+)
+from core.pipeline import Pipeline, PipelineItem, Stage
+from services.cache import ResultCache, make_cache_key
+from services.embeddings import BatchEmbedder, QueryEmbeddingCache, dimensions_for, normalize_query
+from services.llms import create_embeddings as llm_create_embeddings
+from services.text_search import index_scene_texts, reciprocal_rank_fusion, search_scene_texts
+from services.vector_store import VectorStore
 
 load_dotenv()
 
@@ -34,135 +79,414 @@ load_dotenv()
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 PINECONE_API_KEY = os.getenv("PINECONE_API_KEY")
 
-async def create_mongodb_pinecone_records(
-    scene_id: int,
-    scene_number: int,
-    previous_scene_id: int | None,
-    next_scene_id: int | None,
-    ai_summary: str | None,
-    story_beat: str | None,
-    screenplay_id: int,
-    scene_text: dict[str, str],
-    ai_client: OpenAI,
+
+@dataclass
+class SceneIngestItem:
+    """State of one scene as it moves through the ingestion pipeline.
+
+    The identifying fields are known before the pipeline starts; the
+    remaining fields are filled in by the stages.
+    """
+
+    screenplay_id: int
+    movie_name: str
+    scene_id: int
+    scene_number: int
+    total_scenes: int
+    scene_text: dict[str, str]
+    previous_scene_id: int | None = None
+    next_scene_id: int | None = None
+    story_beat: str | None = None
+    ai_summary: str | None = None
+    embedding: list[float] | None = field(default=None, repr=False)
+    mongodb_record_id: str | None = None
+
+    @property
+    def vector_id(self) -> str:
+        return scene_vector_id(self.screenplay_id, self.scene_number)
+
+    def release(self):
+        """Drop the scene text and embedding once every stage has used them."""
+        self.scene_text = {}
+        self.embedding = None
+
+
+@dataclass
+class SceneFilter:
+    """Resolved retrieval filter over scene metadata.
+
+    ``screenplay_ids`` of ``[]`` means the filter can match nothing, e.g.
+    when no movie satisfies the requested movie attributes.
+    """
+
+    screenplay_ids: list[int] | None = None
+    story_beats: list[str] | None = None
+    progress_min: float | None = None
+    progress_max: float | None = None
+
+    @property
+    def matches_nothing(self) -> bool:
+        return self.screenplay_ids == []
+
+    def to_metadata_filter(self) -> dict[str, Any] | None:
+        """Return the equivalent Pinecone metadata filter."""
+        conditions: list[dict[str, Any]] = []
+        if self.screenplay_ids is not None:
+            conditions.append({"screenplay_id": {"$in": self.screenplay_ids}})
+        if self.story_beats is not None:
+            conditions.append({"story_beat": {"$in": self.story_beats}})
+        progress = {}
+        if self.progress_min is not None:
+            progress["$gte"] = self.progress_min
+        if self.progress_max is not None:
+            progress["$lte"] = self.progress_max
+        if progress:
+            conditions.append({"progress_num": progress})
+        if not conditions:
+            return None
+        return conditions[0] if len(conditions) == 1 else {"$and": conditions}
+
+
+class SceneIngestionError(Exception):
+    """Raised when one or more scenes fail to ingest.
+
+    Attributes:
+        failures: Failed pipeline items; each carries the scene payload, the
+            exception and the stage that raised it.
+    """
+
+    def __init__(self, failures: list[PipelineItem]):
+        self.failures = failures
+        details = ", ".join(
+            f"scene {failure.payload.scene_number} ({failure.failed_stage}: {failure.error!r})"
+            for failure in failures
+        )
+        super().__init__(f"{len(failures)} scene(s) failed to ingest: {details}")
+
+
+class SceneDocumentWriteError(Exception):
+    """Raised for a single scene whose MongoDB document could not be written."""
+
+    def __init__(self, scene_number: int, message: str):
+        self.scene_number = scene_number
+        super().__init__(f"Scene {scene_number}: {message}")
+
+
+class StoryBeatChain:
+    """Hand each scene's story beat to the analysis of the following scene.
+
+    The analysis prompt for a scene depends on the previous scene's beat, so
+    analyses of one screenplay are chained even when several analysis workers
+    run at once. Scenes of different screenplays do not wait on each other.
+    """
+
+    def __init__(self):
+        self._beats: dict[tuple[int, int], asyncio.Future] = {}
+
+    def _future(self, key: tuple[int, int]) -> asyncio.Future:
+        if key not in self._beats:
+            self._beats[key] = asyncio.get_running_loop().create_future()
+        return self._beats[key]
+
+    async def previous(self, screenplay_id: int, scene_number: int) -> str:
+        """Wait for and return the beat of the scene before `scene_number`."""
+        if scene_number <= 1:
+            return "exposition"
+        key = (screenplay_id, scene_number - 1)
+        beat = await self._future(key)
+        self._beats.pop(key, None)
+        return beat
+
+    def resolve(self, screenplay_id: int, scene_number: int, story_beat: str):
+        """Publish the beat of `scene_number` to the scene after it."""
+        future = self._future((screenplay_id, scene_number))
+        if not future.done():
+            future.set_result(story_beat)
+
+
+def scene_vector_id(screenplay_id: int, scene_number: int) -> str:
+    """Return the deterministic vector id of a scene.
+
+    Re-ingesting a scene therefore overwrites its vector instead of adding a
+    second one.
+    """
+    return f"{screenplay_id}:{scene_number}"
+
+
+def build_scene_document(item: SceneIngestItem, embedding_model: str) -> dict[str, Any]:
+    """Build the MongoDB document stored for a scene."""
+    return {
+        "scene_id": item.scene_id,
+        "scene_number": item.scene_number,
+        "previous_scene_id": item.previous_scene_id,
+        "next_scene_id": item.next_scene_id,
+        "ai_summary": item.ai_summary,
+        "story_beat": item.story_beat,
+        "screenplay_id": item.screenplay_id,
+        "scene_text": item.scene_text,
+        "embedding_model": embedding_model
+    }
+
+
+def build_scene_vector(
+    item: SceneIngestItem,
     embedding_model: str,
-    mongodb_database: AsyncDatabase,
-    pinecone_client: PineconeAsyncio
-) -> dict[str, str] | None:
-    """Persist a scene document to MongoDB and upsert its embedding into Pinecone.
+    metadata_mode: str = VECTOR_METADATA_MODE
+) -> dict[str, Any]:
+    """Build the Pinecone vector record for a scene.
+
+    In ``compact`` mode the metadata holds only ids and the small fields
+    used by query filters; ``full`` mode also copies the summary and scene
+    texts, so queries can be answered without hydration.
+    """
+    metadata = {
+        "scene_id": item.scene_id,
+        "mongodb_record_id": item.mongodb_record_id,
+        "screenplay_id": item.screenplay_id,
+        "scene_number": item.scene_number,
+        "story_beat": item.story_beat,
+        "progress_num": item.scene_number / item.total_scenes if item.total_scenes else 0,
+        "embedding_model": embedding_model
+    }
+    if metadata_mode == "full":
+        metadata.update({
+            "ai_summary": item.ai_summary,
+            "embedding_text": item.scene_text["embedding_text"],
+            "raw_text": item.scene_text["raw_text"]
+        })
+    return {"id": item.vector_id, "values": item.embedding, "metadata": metadata}
+
 
-    This function constructs a MongoDB document containing the scene
-    metadata and uses the provided `ai_client` to create an embedding vector.
-    Because the OpenAI embedding client used here is synchronous, the call is
-    executed inside a thread using `asyncio.to_thread` to avoid blocking the
-    event loop. The resulting embedding vector is stored in Pinecone using the
-    provided `pinecone_client`.
+async def embed_scene(item: SceneIngestItem, embedder: BatchEmbedder) -> SceneIngestItem:
+    """Create the embedding vector for a scene's AI summary.
+
+    The request goes through `embedder`, so summaries of scenes that are in
+    flight together are embedded in a single API call. Scenes resumed with
+    their embedding already known are passed through.
+    """
+    if item.embedding is None:
+        item.embedding = await embedder.embed(item.ai_summary)
+    return item
+
+
+async def store_scene_documents(
+    items: list[SceneIngestItem],
+    embedding_model: str,
+    mongodb_database: AsyncDatabase
+) -> list[SceneIngestItem | Exception]:
+    """Upsert the MongoDB documents of several scenes in one bulk write.
+
+    Documents are keyed on ``(screenplay_id, scene_number)`` and written with
+    an unordered `bulk_write`, so re-running an ingest overwrites rather than
+    duplicates them and one bad document does not stop the rest. The unused
+    ``embedding_vector`` copy older ingests stored is removed on rewrite. The
+    resulting ``_id`` of every document is recorded on its item; ids of
+    documents that already existed are looked up with a projected query.
 
     Args:
-        scene_id: Internal SQL scene id.
-        scene_number: Sequential scene number within the screenplay.
-        previous_scene_id: SQL id of the previous scene or ``None``.
-        next_scene_id: SQL id of the next scene or ``None``.
-        ai_summary: AI-generated summary text for the scene.
-        story_beat: High-level story beat label for the scene.
-        screenplay_id: Parent screenplay id.
-        scene_text: Dictionary with keys ``raw_text`` and ``embedding_text``.
-        ai_client: OpenAI async client used for embedding generation (calls the
-            synchronous embeddings API under the hood).
-        embedding_model: Name of the embedding model to use.
+        items: Scenes to write.
+        embedding_model: Embedding model name stored on each document.
         mongodb_database: Async MongoDB database instance.
-        pinecone_client: Async Pinecone client used to index vectors.
 
     Returns:
-        The MongoDB document that was inserted (as a Python dict) or ``None``
-        when no document was created. The function also performs the Pinecone
-        upsert as a side-effect.
+        A list aligned with `items` holding the item, or a
+        `SceneDocumentWriteError` for scenes whose write failed.
     """
-    mongodb_insert_record = {
-        "scene_id": scene_id,
-        "scene_number": scene_number,
-        "previous_scene_id": previous_scene_id,
-        "next_scene_id": next_scene_id,
-        "ai_summary": ai_summary,
-        "story_beat": story_beat,
-        "screenplay_id": screenplay_id,
-        "scene_text": scene_text,
-        "embedding_model": embedding_model
-    }
-    
-    embedding_response = await asyncio.to_thread(
-        ai_client.embeddings.create,
-        model=embedding_model,
-        input=ai_summary,
-        encoding_format="float"
+    collection = mongodb_database["scenes"]
+    operations = [
+        UpdateOne(
+            {"screenplay_id": item.screenplay_id, "scene_number": item.scene_number},
+            {"$set": build_scene_document(item, embedding_model), "$unset": {"embedding_vector": ""}},
+            upsert=True
+        )
+        for item in items
+    ]
+    errors: dict[int, str] = {}
+    try:
+        bulk_result = await collection.bulk_write(operations, ordered=False)
+        upserted_ids = dict(bulk_result.upserted_ids)
+    except BulkWriteError as e:
+        errors = {error["index"]: error.get("errmsg", "write failed") for error in e.details.get("writeErrors", [])}
+        upserted_ids = {upsert["index"]: upsert["_id"] for upsert in e.details.get("upserted", [])}
+
+    missing: dict[int, list[int]] = {}
+    for position, item in enumerate(items):
+        if position in upserted_ids:
+            item.mongodb_record_id = str(upserted_ids[position])
+        elif position not in errors:
+            missing.setdefault(item.screenplay_id, []).append(item.scene_number)
+    for screenplay_id, scene_numbers in missing.items():
+        cursor = collection.find(
+            {"screenplay_id": screenplay_id, "scene_number": {"$in": scene_numbers}},
+            projection={"_id": 1, "scene_number": 1}
+        )
+        existing_ids = {document["scene_number"]: str(document["_id"]) async for document in cursor}
+        for item in items:
+            if item.screenplay_id == screenplay_id and item.scene_number in existing_ids:
+                item.mongodb_record_id = existing_ids[item.scene_number]
+
+    results: list[SceneIngestItem | Exception] = []
+    for position, item in enumerate(items):
+        if position in errors:
+            results.append(SceneDocumentWriteError(item.scene_number, errors[position]))
+        elif item.mongodb_record_id is None:
+            results.append(SceneDocumentWriteError(item.scene_number, "document id not returned"))
+        else:
+            results.append(item)
+    return results
+
+
+async def index_scene_vectors(
+    items: list[SceneIngestItem],
+    embedding_model: str,
+    vector_store: VectorStore
+) -> list[SceneIngestItem]:
+    """Upsert the embeddings of several scenes under their deterministic ids.
+
+    The vector store splits the write into chunked, concurrent upserts.
+    """
+    await vector_store.upsert(
+        vectors=[build_scene_vector(item, embedding_model) for item in items],
+        namespace=PINECONE_NAMESPACE
     )
-    embedding = embedding_response.data[0].embedding
-    mongodb_insert_record["embedding_vector"] = embedding
-    mongodb_record = await mongodb_database["scenes"].insert_one(mongodb_insert_record)
-    mongodb_insert_record["_id"] = str(mongodb_record.inserted_id)
-    index = pinecone_client.IndexAsyncio(host=os.getenv("PINECONE_HOST_URL"))
-    del mongodb_insert_record["embedding_vector"]
-    await index.upsert(
-        vectors=[
+    return items
+
+
+async def update_scene_records(
+    items: list[SceneIngestItem],
+    session: AsyncSession,
+    embedding_model: str | None = None
+) -> list[SceneIngestItem]:
+    """Write analysis results, MongoDB ids and scene links back in one pass.
+
+    Issues a single executemany UPDATE keyed on the scene primary keys,
+    upserts a `SceneEmbedding` checkpoint for every scene, (re)indexes the
+    scenes' embedding text for full-text search, and commits once for the
+    whole batch. The backfill is the last pipeline stage, so a
+    checkpoint means every earlier stage succeeded for that scene.
+    """
+    await session.exec(
+        update(Scene),
+        params=[
+            {
+                "id": item.scene_id,
+                "beat": item.story_beat,
+                "ai_summary": item.ai_summary,
+                "previous_scene_id": item.previous_scene_id,
+                "next_scene_id": item.next_scene_id,
+                "mongodb_record_id": item.mongodb_record_id
+            }
+            for item in items
+        ]
+    )
+    checkpoint = sqlite_insert(SceneEmbedding)
+    await session.exec(
+        checkpoint.on_conflict_do_update(
+            index_elements=[SceneEmbedding.scene_id],
+            set_={
+                "mongo_id": checkpoint.excluded.mongo_id,
+                "vector_id": checkpoint.excluded.vector_id,
+                "embedding_model": checkpoint.excluded.embedding_model
+            }
+        ),
+        params=[
+            {
+                "scene_id": item.scene_id,
+                "screenplay_id": item.screenplay_id,
+                "scene_number": item.scene_number,
+                "mongo_id": item.mongodb_record_id,
+                "vector_id": item.vector_id,
+                "embedding_model": embedding_model
+            }
+            for item in items
+        ]
+    )
+    await index_scene_texts(
+        [
             {
-                "id": str(mongodb_record.inserted_id),
-                "values": embedding,
-                "metadata": {
-                    "scene_id": scene_id,
-                    "screenplay_id": screenplay_id,
-                    "scene_number": scene_number,
-                    "embedding_model": embedding_model,
-                    "ai_summary": ai_summary,
-                    "embedding_text": scene_text["embedding_text"],
-                    "raw_text": scene_text["raw_text"]
-                }
+                "scene_id": item.scene_id,
+                "screenplay_id": item.screenplay_id,
+                "scene_number": item.scene_number,
+                "vector_id": item.vector_id,
+                "namespace": PINECONE_NAMESPACE,
+                "embedding_text": item.scene_text["embedding_text"]
             }
+            for item in items
         ],
-        namespace="scene_embeddings"
+        session
     )
+    await session.commit()
+    return items
 
 
-async def create_scene_from_text(
+async def delete_scene_documents(
+    screenplay_id: int,
+    mongodb_database: AsyncDatabase,
+    vector_store: VectorStore,
+    session: AsyncSession
+):
+    """Delete the MongoDB documents and vectors of a screenplay's scenes.
+
+    Vector ids are derived from the scene numbers of the screenplay's SQL
+    scene rows, so this must run before those rows are deleted. Both deletes
+    are idempotent.
+    """
+    scene_numbers = (await session.exec(
+        select(Scene.scene_number).where(Scene.screenplay_id == screenplay_id)
+    )).all()
+    await mongodb_database["scenes"].delete_many({"screenplay_id": screenplay_id})
+    if scene_numbers:
+        await vector_store.delete(
+            ids=[scene_vector_id(screenplay_id, scene_number) for scene_number in scene_numbers],
+            namespace=PINECONE_NAMESPACE
+        )
+
+
+async def create_scene_records(
     screenplay_id: int,
-    scene_number: int,
     total_scenes: int,
-    session: Session
-) -> Scene:
-    """Create a SQL scene record placeholder for a scene extracted from text.
+    session: AsyncSession,
+    first_scene_number: int = 1
+) -> list[int]:
+    """Insert placeholder `Scene` rows for a screenplay in one transaction.
 
-    The created `Scene` is a lightweight SQL record used to track progress and
-    association with a screenplay. At this stage the scene's AI-driven fields
-    (summary, beat, mongodb id) are left empty and intended to be populated by
-    subsequent processing.
+    All rows are sent as a single executemany INSERT with RETURNING, so the
+    whole screenplay costs one commit instead of a commit and a refresh per
+    scene. The AI fields and scene links are filled in later by
+    `update_scene_records`.
 
     Args:
         screenplay_id: Parent screenplay id.
-        scene_number: 1-based scene index within the screenplay.
-        total_scenes: Total number of scenes in the screenplay. Used to
-            compute a progress ratio (0-1).
-        session: SQLModel/SQLAlchemy `Session` used to persist the record.
+        total_scenes: Total number of scenes in the screenplay.
+        session: SQLModel/SQLAlchemy `AsyncSession` used to persist the rows.
+        first_scene_number: Scene number of the first row to create.
 
     Returns:
-        The created and refreshed `Scene` SQL model instance.
+        The new scene ids, ordered by scene number.
     """
-    progress_num = scene_number / total_scenes if total_scenes else 0 # lazy way to handle divide by zero
-    scene_create_model = SceneCreate(
-        screenplay_id=screenplay_id,
-        scene_number=scene_number,
-        progress_raw=f"{scene_number}/{total_scenes}",
-        progress_num=progress_num,
-        scene_text=None,
-        beat=None,
-        previous_scene_id=None,
-        ai_summary=None,
-        next_scene_id=None,
-        mongodb_record_id=None
-    )
-    scene_record = Scene(**scene_create_model.model_dump())
-    session.add(scene_record)
-    session.commit()
-    session.refresh(scene_record)
-    # TODO: create update methods to update scenes (in this case, with mongodb_id)
-    return scene_record
+    scene_rows = [
+        SceneCreate(
+            screenplay_id=screenplay_id,
+            scene_number=scene_number,
+            progress_raw=f"{scene_number}/{total_scenes}",
+            progress_num=scene_number / total_scenes if total_scenes else 0,
+            scene_text=None,
+            beat=None,
+            previous_scene_id=None,
+            ai_summary=None,
+            next_scene_id=None,
+            mongodb_record_id=None
+        ).model_dump(exclude={"scene_text"})
+        for scene_number in range(first_scene_number, total_scenes + 1)
+    ]
+    if not scene_rows:
+        return []
+    scene_ids = (await session.exec(
+        insert(Scene).returning(Scene.id, sort_by_parameter_order=True),
+        params=scene_rows
+    )).scalars().all()
+    await session.commit()
+    return list(scene_ids)
 
 async def get_ai_response(
     scene_number: int,
@@ -170,14 +494,12 @@ async def get_ai_response(
     total_scenes: int,
     previous_story_beat: str,
     scene_text: dict[str, str],
-    ai_client: OpenAI
+    ai_client: AsyncOpenAI
 ) -> dict[str, Any]:
     """Return a story beat / AI summary for a scene.
 
-    This function short-circuits first and last scenes to deterministic labels
-    ("exposition" and "resolution"). For other scenes it delegates to the
-    `generate_scene_analysis` helper (executed inside a thread) which returns
-    a JSON string; this is parsed and returned as a Python structure.
+    Delegates to the async `generate_scene_analysis` helper, which returns
+    a `SceneAnalysis` model; it is returned as a plain dict.
 
     Args:
         scene_number: 1-based scene index.
@@ -186,13 +508,12 @@ async def get_ai_response(
         previous_story_beat: The previous scene's story beat.
         scene_text: Dict containing ``raw_text`` and ``embedding_text`` for the
             scene.
-        ai_client: OpenAI async client used by the analysis helper.
+        ai_client: AsyncOpenAI client used by the analysis helper.
 
     Returns:
-        A parsed JSON object (typically a dict) returned by the AI analysis
-        helper or a short-circuit string for first/last scenes.
+        A dict with ``ai_summary`` and ``story_beat`` keys.
     """
-    ai_response = generate_scene_analysis(
+    analysis = await generate_scene_analysis(
         movie_name=movie_name,
         scene_number=scene_number,
         total_scenes=total_scenes,
@@ -200,103 +521,630 @@ async def get_ai_response(
         previous_story_beat=previous_story_beat,
         ai_client=ai_client
     )
-    return json.loads(ai_response)
+    return analysis.model_dump()
+
+def build_scene_pipeline(
+    ai_client: AsyncOpenAI,
+    embedding_model: str,
+    mongodb_database: AsyncDatabase,
+    vector_store: VectorStore,
+    session: AsyncSession,
+    stage_concurrency: dict[str, int] | None = None,
+    queue_size: int = INGEST_QUEUE_SIZE,
+    on_item_done: Callable[[PipelineItem], None] | None = None,
+    embedder: BatchEmbedder | None = None,
+    beat_chain: StoryBeatChain | None = None
+) -> Pipeline:
+    """Build the scene ingestion pipeline.
+
+    Stages run in order: ``analysis`` (LLM summary and story beat),
+    ``embedding``, ``mongodb``, ``pinecone`` and ``sql`` (writes the results
+    back to the `Scene` row). Each stage has its own worker pool and bounded
+    input queue, so later scenes are analysed while earlier ones are being
+    embedded and indexed.
+
+    The ``mongodb``, ``pinecone`` and ``sql`` stages are batch stages: they
+    collect up to their configured batch size (waiting at most
+    `INGEST_BATCH_TIMEOUT` seconds) and write the scenes in bulk.
+
+    Analyses within one screenplay are chained through `StoryBeatChain`
+    because each prompt needs the previous scene's beat; the other stages run
+    fully concurrently. Payloads are `SceneIngestItem` instances and may come
+    from several screenplays as long as each screenplay's scenes are fed in
+    order.
+
+    Args:
+        ai_client: AsyncOpenAI client used for analysis and embeddings.
+        embedding_model: Embedding model name.
+        mongodb_database: Async MongoDB database.
+        vector_store: Shared vector store the embeddings are written to.
+        session: SQLModel/SQLAlchemy session used by the SQL backfill stage.
+            The stage has a single worker; an `AsyncSession` cannot be
+            shared by concurrent tasks, so nothing else may use this session
+            while the pipeline runs.
+        stage_concurrency: Optional per-stage worker counts overriding
+            `INGEST_STAGE_CONCURRENCY`.
+        queue_size: Maximum items buffered in front of each stage.
+        on_item_done: Optional callback invoked as each scene leaves the
+            pipeline.
+        embedder: Optional shared `BatchEmbedder`; one is created for
+            `ai_client` and `embedding_model` when omitted.
+        beat_chain: Optional `StoryBeatChain`, pre-seeded with the beats of
+            scenes that are not fed through the pipeline (see `resume_scenes`).
+
+    Returns:
+        A `Pipeline` ready to `run` scene items.
+    """
+    concurrency = {**INGEST_STAGE_CONCURRENCY, **(stage_concurrency or {})}
+    beat_chain = beat_chain or StoryBeatChain()
+    embedder = embedder or BatchEmbedder(ai_client, embedding_model, dimensions=dimensions_for(PINECONE_NAMESPACE))
+
+    async def analyze(item: SceneIngestItem) -> SceneIngestItem:
+        if item.ai_summary is not None and item.story_beat is not None:
+            # Analysed by an earlier, interrupted run.
+            beat_chain.resolve(item.screenplay_id, item.scene_number, item.story_beat)
+            return item
+        previous_story_beat = await beat_chain.previous(item.screenplay_id, item.scene_number)
+        story_beat = previous_story_beat
+        try:
+            ai_response = await get_ai_response(
+                scene_number=item.scene_number,
+                movie_name=item.movie_name,
+                total_scenes=item.total_scenes,
+                previous_story_beat=previous_story_beat,
+                scene_text=item.scene_text,
+                ai_client=ai_client
+            )
+            story_beat = ai_response["story_beat"].lower()
+        finally:
+            # A failed analysis passes the last known beat on so later scenes
+            # of the screenplay are not blocked.
+            beat_chain.resolve(item.screenplay_id, item.scene_number, story_beat)
+        item.ai_summary = ai_response["ai_summary"]
+        item.story_beat = story_beat
+        return item
+
+    async def embed(item: SceneIngestItem) -> SceneIngestItem:
+        return await embed_scene(item, embedder)
+
+    async def store(items: list[SceneIngestItem]) -> list[SceneIngestItem | Exception]:
+        return await store_scene_documents(items, embedding_model, mongodb_database)
+
+    async def index(items: list[SceneIngestItem]) -> list[SceneIngestItem]:
+        return await index_scene_vectors(items, embedding_model, vector_store)
+
+    async def backfill(items: list[SceneIngestItem]) -> list[SceneIngestItem]:
+        written = await update_scene_records(items, session, embedding_model)
+        # keep only ids and analyses of finished scenes, so memory does not
+        # grow with the size of the screenplay
+        for item in written:
+            item.release()
+        return written
+
+    return Pipeline(
+        stages=[
+            Stage("analysis", analyze, concurrency["analysis"]),
+            Stage("embedding", embed, concurrency["embedding"]),
+            Stage(
+                "mongodb",
+                store,
+                concurrency["mongodb"],
+                batch_size=MONGODB_BULK_WRITE_BATCH_SIZE,
+                batch_timeout=INGEST_BATCH_TIMEOUT
+            ),
+            Stage(
+                "pinecone",
+                index,
+                concurrency["pinecone"],
+                batch_size=PINECONE_UPSERT_BATCH_SIZE,
+                batch_timeout=INGEST_BATCH_TIMEOUT
+            ),
+            Stage(
+                "sql",
+                backfill,
+                concurrency["sql"],
+                batch_size=SQL_BACKFILL_BATCH_SIZE,
+                batch_timeout=INGEST_BATCH_TIMEOUT
+            ),
+        ],
+        queue_size=queue_size,
+        on_item_done=on_item_done
+    )
+
+async def iter_scene_items(
+    scene_texts: Iterable[dict[str, str]] | AsyncIterable[dict[str, str]],
+    scene_ids: list[int],
+    screenplay_id: int,
+    movie_name: str
+) -> AsyncIterator[SceneIngestItem]:
+    """Yield a pipeline item per scene as its text arrives, linking neighbouring scene ids.
+
+    Raises:
+        ValueError: If `scene_texts` does not yield exactly one scene per id.
+    """
+    total_scenes = len(scene_ids)
+    position = 0
+
+    async def texts() -> AsyncIterator[dict[str, str]]:
+        if isinstance(scene_texts, AsyncIterable):
+            async for scene_text in scene_texts:
+                yield scene_text
+        else:
+            for scene_text in scene_texts:
+                yield scene_text
+
+    async for scene_text in texts():
+        if position >= total_scenes:
+            raise ValueError(f"Expected {total_scenes} scenes, the screenplay yielded more.")
+        yield SceneIngestItem(
+            screenplay_id=screenplay_id,
+            movie_name=movie_name,
+            scene_id=scene_ids[position],
+            scene_number=position + 1,
+            total_scenes=total_scenes,
+            scene_text=scene_text,
+            previous_scene_id=scene_ids[position - 1] if position > 0 else None,
+            next_scene_id=scene_ids[position + 1] if position + 1 < total_scenes else None
+        )
+        position += 1
+    if position != total_scenes:
+        raise ValueError(f"Expected {total_scenes} scenes, the screenplay yielded {position}.")
+
+async def run_scene_pipeline(
+    items: Iterable[SceneIngestItem] | AsyncIterable[SceneIngestItem],
+    pipeline: Pipeline
+) -> list[SceneIngestItem]:
+    """Run `items` through `pipeline` and return them ordered by scene number.
+
+    Raises:
+        SceneIngestionError: If any scene failed in any stage.
+    """
+    results = await pipeline.run(items)
+    failures = [result for result in results if not result.ok]
+    if failures:
+        raise SceneIngestionError(failures)
+    return sorted((result.payload for result in results), key=lambda item: item.scene_number)
 
 async def create_scenes(
-    scene_texts: list[dict[str, str]],
+    scene_texts: Iterable[dict[str, str]] | AsyncIterable[dict[str, str]],
     screenplay_id: int,
     movie_name: str,
-    ai_client: OpenAI,
+    ai_client: AsyncOpenAI,
     embedding_model: str,
     mongodb_database: AsyncDatabase,
-    pinecone_client: PineconeAsyncio,
-    session: Session
-):
+    vector_store: VectorStore,
+    session: AsyncSession,
+    stage_concurrency: dict[str, int] | None = None,
+    on_item_done: Callable[[PipelineItem], None] | None = None,
+    total_scenes: int | None = None
+) -> list[SceneIngestItem]:
     """Orchestrate creation of scenes, AI analysis, and indexing.
 
-    Iterates over a sequence of scene text dictionaries and for each scene:
-    1. Creates a SQL placeholder scene record.
-    2. Requests AI analysis for the scene (run in a worker thread where the
-       helper is synchronous).
-    3. Persists the scene's embedding to MongoDB and Pinecone.
+    First bulk-inserts a SQL placeholder record for every scene so
+    previous/next scene ids are known up front, then runs all scenes through the ingestion
+    pipeline built by `build_scene_pipeline`. Scene texts may be streamed:
+    each scene enters the pipeline as soon as it is yielded.
 
     Args:
-        scene_texts: List of dicts with keys ``raw_text`` and ``embedding_text``.
+        scene_texts: Dicts with keys ``raw_text`` and ``embedding_text``;
+            a list or a sync/async iterable.
         screenplay_id: Parent screenplay id.
         movie_name: Title of the movie.
-        ai_client: OpenAI client used for analysis and embeddings.
+        ai_client: AsyncOpenAI client used for analysis and embeddings.
         embedding_model: Embedding model name.
         mongodb_database: Async MongoDB database.
-        pinecone_client: Async Pinecone client.
+        vector_store: Shared vector store the embeddings are written to.
         session: SQLModel/SQLAlchemy session used to create scene records.
+        stage_concurrency: Optional per-stage worker counts.
+        on_item_done: Optional callback invoked as each scene leaves the
+            pipeline, e.g. `IngestJob.scene_done`.
+        total_scenes: Number of scenes; required when `scene_texts` is not
+            a list.
 
     Returns:
-        None. The function performs side-effects (DB writes and Pinecone index
-        operations) for each scene.
+        The ingested scenes ordered by scene number, without their texts
+        and embeddings.
+
+    Raises:
+        SceneIngestionError: If any scene failed in any stage. Scenes that
+            succeeded are still fully persisted and checkpointed, so the
+            rest can be retried with `resume_scenes`.
+        ValueError: If `scene_texts` does not yield `total_scenes` scenes.
     """
-    total_scenes = len(scene_texts)
-    scene_number = 1
-    previous_scene_id = None
-    previous_story_beat = "exposition"
-    for scene_text in scene_texts:
-        sql_scene_record = await create_scene_from_text(
-            screenplay_id=screenplay_id,
-            scene_number=scene_number,
-            total_scenes=total_scenes,
-            session=session
-        )
-        ai_response = await get_ai_response(
-            scene_number=scene_number,
-            movie_name=movie_name,
-            total_scenes=total_scenes,
-            previous_story_beat=previous_story_beat,
-            scene_text=scene_text,
-            ai_client=ai_client
-        )
-        await asyncio.sleep(0.5)
-        await create_mongodb_pinecone_records(
-            scene_id=sql_scene_record.id,
-            scene_number=scene_number,
-            previous_scene_id=previous_scene_id,
-            next_scene_id=None,
-            ai_summary=ai_response["ai_summary"],
-            story_beat=ai_response["story_beat"].lower(),
-            screenplay_id=screenplay_id,
-            scene_text=scene_text,
-            ai_client=ai_client,
-            embedding_model=embedding_model,
-            mongodb_database=mongodb_database,
-            pinecone_client=pinecone_client
+    scene_ids = await create_scene_records(
+        screenplay_id=screenplay_id,
+        total_scenes=len(scene_texts) if total_scenes is None else total_scenes,
+        session=session
+    )
+    items = iter_scene_items(scene_texts, scene_ids, screenplay_id, movie_name)
+    pipeline = build_scene_pipeline(
+        ai_client=ai_client,
+        embedding_model=embedding_model,
+        mongodb_database=mongodb_database,
+        vector_store=vector_store,
+        session=session,
+        stage_concurrency=stage_concurrency,
+        on_item_done=on_item_done
+    )
+    return await run_scene_pipeline(items, pipeline)
+
+async def load_stored_analyses(
+    screenplay_id: int,
+    scene_numbers: list[int],
+    mongodb_database: AsyncDatabase
+) -> dict[int, tuple[str, str]]:
+    """Fetch analyses already stored in MongoDB.
+
+    Scenes whose document was written by an interrupted run keep their AI
+    summary and story beat, so they are not sent to the LLM again; their
+    embeddings are recomputed in batches.
+
+    Returns:
+        ``(ai_summary, story_beat)`` per scene number, for the scenes that
+        have both.
+    """
+    if not scene_numbers:
+        return {}
+    cursor = mongodb_database["scenes"].find(
+        {"screenplay_id": screenplay_id, "scene_number": {"$in": scene_numbers}},
+        projection={"scene_number": 1, "ai_summary": 1, "story_beat": 1}
+    )
+    analyses = {}
+    async for document in cursor:
+        if document.get("ai_summary") and document.get("story_beat"):
+            analyses[document["scene_number"]] = (document["ai_summary"], document["story_beat"])
+    return analyses
+
+async def resume_scenes(
+    scene_texts: Iterable[dict[str, str]] | AsyncIterable[dict[str, str]],
+    screenplay_id: int,
+    movie_name: str,
+    ai_client: AsyncOpenAI,
+    embedding_model: str,
+    mongodb_database: AsyncDatabase,
+    vector_store: VectorStore,
+    session: AsyncSession,
+    stage_concurrency: dict[str, int] | None = None,
+    on_item_done: Callable[[PipelineItem], None] | None = None,
+    total_scenes: int | None = None
+) -> list[SceneIngestItem]:
+    """Continue an interrupted ingestion of a screenplay's scenes.
+
+    Scenes with a `SceneEmbedding` checkpoint are skipped. Missing SQL
+    placeholder rows are created, analyses already stored in MongoDB are
+    reused, and the story beat chain is seeded with the beats of finished
+    scenes. Every remaining stage write is idempotent (MongoDB upserts keyed
+    on the scene, deterministic vector ids, checkpoint upserts).
+
+    Args:
+        scene_texts: The screenplay's scenes, as produced for the original
+            ingestion; a list or a sync/async iterable. Texts of finished
+            scenes are skipped as they stream past.
+        screenplay_id: Parent screenplay id.
+        movie_name: Title of the movie.
+        ai_client: AsyncOpenAI client used for analysis and embeddings.
+        embedding_model: Embedding model name.
+        mongodb_database: Async MongoDB database.
+        vector_store: Shared vector store the embeddings are written to.
+        session: SQLModel/SQLAlchemy session.
+        stage_concurrency: Optional per-stage worker counts.
+        on_item_done: Optional callback invoked as each scene leaves the
+            pipeline.
+        total_scenes: Number of scenes; required when `scene_texts` is not
+            a list.
+
+    Returns:
+        The scenes ingested by this run, ordered by scene number.
+
+    Raises:
+        SceneIngestionError: If any scene failed again.
+    """
+    if total_scenes is None:
+        total_scenes = len(scene_texts)
+    scene_rows = (await session.exec(
+        select(Scene.scene_number, Scene.id, Scene.beat)
+        .where(Scene.screenplay_id == screenplay_id)
+        .order_by(Scene.scene_number)
+    )).all()
+    scene_ids = [scene_id for _, scene_id, _ in scene_rows][:total_scenes]
+    scene_ids += await create_scene_records(
+        screenplay_id=screenplay_id,
+        total_scenes=total_scenes,
+        session=session,
+        first_scene_number=len(scene_ids) + 1
+    )
+    stored_beats = {scene_number: beat for scene_number, _, beat in scene_rows}
+    finished = set((await session.exec(
+        select(SceneEmbedding.scene_number).where(SceneEmbedding.screenplay_id == screenplay_id)
+    )).all())
+
+    unfinished = [number for number in range(1, total_scenes + 1) if number not in finished]
+    stored_analyses = await load_stored_analyses(screenplay_id, unfinished, mongodb_database)
+    beat_chain = StoryBeatChain()
+    for scene_number in unfinished:
+        previous_number = scene_number - 1
+        if previous_number in finished:
+            beat_chain.resolve(screenplay_id, previous_number, stored_beats.get(previous_number) or "exposition")
+
+    async def items() -> AsyncIterator[SceneIngestItem]:
+        async for item in iter_scene_items(scene_texts, scene_ids, screenplay_id, movie_name):
+            if item.scene_number in finished:
+                continue
+            if item.scene_number in stored_analyses:
+                item.ai_summary, item.story_beat = stored_analyses[item.scene_number]
+            yield item
+
+    pipeline = build_scene_pipeline(
+        ai_client=ai_client,
+        embedding_model=embedding_model,
+        mongodb_database=mongodb_database,
+        vector_store=vector_store,
+        session=session,
+        stage_concurrency=stage_concurrency,
+        on_item_done=on_item_done,
+        beat_chain=beat_chain
+    )
+    return await run_scene_pipeline(items(), pipeline)
+
+async def copyable_scene_count(
+    screenplay_id: int,
+    embedding_model: str,
+    session: AsyncSession
+) -> int:
+    """Return the number of scenes of a screenplay that can be copied.
+
+    Raises:
+        ValueError: If some scenes have no checkpoint, i.e. the ingestion has
+            not finished, or they were embedded with another model.
+    """
+    total_scenes = (await session.exec(
+        select(func.count()).select_from(Scene).where(Scene.screenplay_id == screenplay_id)
+    )).one()
+    checkpoint_models = (await session.exec(
+        select(SceneEmbedding.embedding_model).where(SceneEmbedding.screenplay_id == screenplay_id)
+    )).all()
+    if not total_scenes or len(checkpoint_models) != total_scenes:
+        raise ValueError(
+            f"Screenplay {screenplay_id} has {len(checkpoint_models)} of {total_scenes} scenes ingested; "
+            "resume it before copying."
         )
-        previous_scene_id=sql_scene_record.id
-        previous_story_beat=ai_response["story_beat"].lower()
-        scene_number += 1
-        
-def create_embeddings(
+    if set(checkpoint_models) != {embedding_model}:
+        raise ValueError(f"Screenplay {screenplay_id} was not embedded with {embedding_model}.")
+    return total_scenes
+
+async def copy_scenes(
+    source_screenplay_id: int,
+    screenplay_id: int,
+    movie_name: str,
+    embedding_model: str,
+    mongodb_database: AsyncDatabase,
+    vector_store: VectorStore,
+    session: AsyncSession,
+    stage_concurrency: dict[str, int] | None = None,
+    on_item_done: Callable[[PipelineItem], None] | None = None,
+    batch_size: int = SQL_BACKFILL_BATCH_SIZE
+) -> list[SceneIngestItem]:
+    """Copy the ingested scenes of one screenplay to another.
+
+    Placeholder rows are created for the new screenplay, then the source's
+    MongoDB documents (summary, story beat and scene text) and vectors are
+    read in batches of `batch_size` and run through the ingestion pipeline
+    with their analysis and embedding already set. The new scenes get their
+    own documents, vector ids, checkpoints and full-text entries exactly as
+    if they had been ingested, so they can also be resumed.
+
+    Args:
+        source_screenplay_id: Fully ingested screenplay to copy from.
+        screenplay_id: Screenplay receiving the scenes; it has none yet.
+        movie_name: Title of the new screenplay's movie.
+        embedding_model: Embedding model the source must have been embedded
+            with.
+        mongodb_database: Async MongoDB database.
+        vector_store: Shared vector store holding the source vectors.
+        session: SQLModel/SQLAlchemy session.
+        stage_concurrency: Optional per-stage worker counts.
+        on_item_done: Optional callback invoked as each scene leaves the
+            pipeline.
+        batch_size: Source scenes read per MongoDB query and vector fetch.
+
+    Returns:
+        The copied scenes ordered by scene number.
+
+    Raises:
+        ValueError: If the source cannot be copied (see
+            `copyable_scene_count`) or a stored document or vector is
+            missing.
+        SceneIngestionError: If any scene failed to be written.
+    """
+    total_scenes = await copyable_scene_count(source_screenplay_id, embedding_model, session)
+    scene_ids = await create_scene_records(screenplay_id=screenplay_id, total_scenes=total_scenes, session=session)
+
+    async def items() -> AsyncIterator[SceneIngestItem]:
+        for start in range(0, total_scenes, batch_size):
+            scene_numbers = list(range(start + 1, min(start + batch_size, total_scenes) + 1))
+            cursor = mongodb_database["scenes"].find(
+                {"screenplay_id": source_screenplay_id, "scene_number": {"$in": scene_numbers}},
+                projection={"scene_number": 1, "ai_summary": 1, "story_beat": 1, "scene_text": 1}
+            )
+            documents = {document["scene_number"]: document async for document in cursor}
+            embeddings = await vector_store.fetch(
+                [scene_vector_id(source_screenplay_id, scene_number) for scene_number in scene_numbers],
+                namespace=PINECONE_NAMESPACE
+            )
+            for scene_number in scene_numbers:
+                document = documents.get(scene_number) or {}
+                embedding = embeddings.get(scene_vector_id(source_screenplay_id, scene_number))
+                if not (document.get("ai_summary") and document.get("story_beat") and document.get("scene_text")):
+                    raise ValueError(f"Scene {scene_number} of screenplay {source_screenplay_id} has no stored analysis.")
+                if embedding is None:
+                    raise ValueError(f"Scene {scene_number} of screenplay {source_screenplay_id} has no stored vector.")
+                position = scene_number - 1
+                yield SceneIngestItem(
+                    screenplay_id=screenplay_id,
+                    movie_name=movie_name,
+                    scene_id=scene_ids[position],
+                    scene_number=scene_number,
+                    total_scenes=total_scenes,
+                    scene_text=document["scene_text"],
+                    previous_scene_id=scene_ids[position - 1] if position > 0 else None,
+                    next_scene_id=scene_ids[position + 1] if position + 1 < total_scenes else None,
+                    story_beat=document["story_beat"],
+                    ai_summary=document["ai_summary"],
+                    embedding=embedding
+                )
+
+    pipeline = build_scene_pipeline(
+        # every item arrives analysed and embedded, so no client is needed
+        ai_client=None,
+        embedding_model=embedding_model,
+        mongodb_database=mongodb_database,
+        vector_store=vector_store,
+        session=session,
+        stage_concurrency=stage_concurrency,
+        on_item_done=on_item_done
+    )
+    return await run_scene_pipeline(items(), pipeline)
+
+async def create_embeddings(
         user_query: str, 
-        client: OpenAI,
-        model: str = EMBEDDING_MODEL
+        client: AsyncOpenAI,
+        model: str = EMBEDDING_MODEL,
+        cache: QueryEmbeddingCache | None = None,
+        dimensions: int | None = None
     ) -> list[float]:
-    embedding = client.embeddings.create(
-        input=user_query,
-        model=model
+    if cache is not None:
+        cached = await cache.get(user_query, model, dimensions)
+        if cached is not None:
+            return cached
+    embedding = await llm_create_embeddings(
+        ai_client=client,
+        model=model,
+        inputs=user_query,
+        dimensions=dimensions
     )
-    return embedding.data[0].embedding
+    vector = embedding.data[0].embedding
+    if cache is not None:
+        await cache.set(user_query, model, vector, dimensions)
+    return vector
+
+async def resolve_scene_filter(
+    filters: SceneQueryFilters | None,
+    session: AsyncSession
+) -> SceneFilter | None:
+    """Turn API query filters into a `SceneFilter`.
+
+    Movie attributes (release year, rating) are resolved with one SQL query
+    into the ids of matching screenplays and intersected with any explicit
+    screenplay ids, so the vector store only sees scene-level conditions.
+
+    Args:
+        filters: Filters from the request, or ``None``.
+        session: SQLModel/SQLAlchemy session used to resolve movie filters.
+
+    Returns:
+        The resolved filter, or ``None`` when nothing is filtered.
+    """
+    if filters is None:
+        return None
+    screenplay_ids = filters.screenplay_ids
+    movie_conditions = []
+    if filters.release_year_min is not None:
+        movie_conditions.append(Movie.release_date >= date(filters.release_year_min, 1, 1))
+    if filters.release_year_max is not None:
+        movie_conditions.append(Movie.release_date <= date(filters.release_year_max, 12, 31))
+    if filters.min_vote_average is not None:
+        movie_conditions.append(Movie.vote_average >= filters.min_vote_average)
+    if movie_conditions:
+        movie_screenplay_ids = set((await session.exec(
+            select(Movie.screenplay_id).where(Movie.screenplay_id.is_not(None), *movie_conditions)
+        )).all())
+        if screenplay_ids is not None:
+            movie_screenplay_ids &= set(screenplay_ids)
+        screenplay_ids = sorted(movie_screenplay_ids)
+    scene_filter = SceneFilter(
+        screenplay_ids=screenplay_ids,
+        story_beats=[beat.lower() for beat in filters.story_beats] if filters.story_beats is not None else None,
+        progress_min=filters.progress_min,
+        progress_max=filters.progress_max
+    )
+    if scene_filter.to_metadata_filter() is None:
+        return None
+    return scene_filter
 
 async def fetch_contexts(
     vector: list[float], 
     top_k: int,
-    index: IndexAsyncio,
+    vector_store: VectorStore,
     namespace: str=PINECONE_NAMESPACE,
+    scene_filter: SceneFilter | None = None
 ) -> dict[str, Any]:
-    results = await index.query(
+    if scene_filter is not None and scene_filter.matches_nothing:
+        return []
+    results = await vector_store.query(
         vector=vector,
         top_k=top_k,
         namespace=namespace,
+        filter=scene_filter.to_metadata_filter() if scene_filter is not None else None,
         include_metadata=True
     )
     return results["matches"]
 
+def fuse_contexts(
+    vector_matches: list[dict[str, Any]],
+    lexical_matches: list[dict[str, Any]],
+    top_k: int
+) -> list[dict[str, Any]]:
+    """Merge vector and BM25 matches with reciprocal-rank fusion.
+
+    Both sides are keyed on the scene's vector id, so a scene found by both
+    searches is ranked by its combined score and returned once.
+
+    Returns:
+        Up to `top_k` match dicts (``id`` and ``metadata``) in fused order.
+    """
+    metadata = {match["id"]: match["metadata"] for match in vector_matches}
+    for match in lexical_matches:
+        vector_metadata = metadata.get(match["vector_id"])
+        if vector_metadata is None:
+            metadata[match["vector_id"]] = match
+        elif "embedding_text" not in vector_metadata:
+            # compact vector metadata has no text; the lexical row does. A new
+            # dict, so the vector store's own metadata is never modified.
+            metadata[match["vector_id"]] = {**vector_metadata, "embedding_text": match["embedding_text"]}
+    fused = reciprocal_rank_fusion([
+        [match["id"] for match in vector_matches],
+        [match["vector_id"] for match in lexical_matches]
+    ])
+    return [{"id": match_id, "metadata": metadata[match_id]} for match_id in fused[:top_k]]
+
+async def hydrate_contexts(
+    contexts: list[dict[str, Any]],
+    mongodb_database: AsyncDatabase | None
+) -> list[dict[str, Any]]:
+    """Fill in the scene text of matches whose metadata does not carry it.
+
+    All missing texts are fetched with a single ``$in`` query on the
+    documents' ``_id`` (the ``mongodb_record_id`` of the vector metadata),
+    projected to the embedding text only. Matches that cannot be hydrated,
+    e.g. vectors whose document was deleted, are dropped.
+    """
+    missing: dict[ObjectId, dict[str, Any]] = {}
+    for context in contexts:
+        record_id = context["metadata"].get("mongodb_record_id")
+        if "embedding_text" in context["metadata"] or not ObjectId.is_valid(record_id):
+            continue
+        missing[ObjectId(record_id)] = context
+    if missing and mongodb_database is not None:
+        cursor = mongodb_database["scenes"].find(
+            {"_id": {"$in": list(missing)}},
+            projection={"_id": 1, "scene_text.embedding_text": 1}
+        )
+        async for document in cursor:
+            context = missing.get(document["_id"])
+            if context is not None:
+                context["metadata"] = {**context["metadata"], "embedding_text": document["scene_text"]["embedding_text"]}
+    return [context for context in contexts if "embedding_text" in context["metadata"]]
+
 def clean_contexts(
     contexts: list[dict]
 ) -> list[str]:
@@ -310,11 +1158,16 @@ def clean_contexts(
 
 async def get_relevant_contexts(
     user_query: str,
-    ai_client: OpenAI,
-    pinecone_client: PineconeAsyncio,
+    ai_client: AsyncOpenAI,
+    vector_store: VectorStore,
     embedding_model: str = EMBEDDING_MODEL,
     top_k: int = TOP_K_CONTEXTS,
-    namespace: str = PINECONE_NAMESPACE
+    namespace: str = PINECONE_NAMESPACE,
+    embedding_cache: QueryEmbeddingCache | None = None,
+    result_cache: ResultCache | None = None,
+    text_index_engine: AsyncEngine | None = None,
+    scene_filter: SceneFilter | None = None,
+    mongodb_database: AsyncDatabase | None = None
 ) -> list[str]:
     """
     Get relevant contexts based on user query.
@@ -322,31 +1175,74 @@ async def get_relevant_contexts(
     Args:
         user_query: User query string.
         ai_client: AI client, set to OpenAI for now.
-        pinecone_client: Pinecone client object, Async for now.
+        vector_store: Shared vector store holding the scene embeddings.
         embedding_model: Embedding model, set to text-embedding-3-small by default
         top_k: Top k most relevant results
         namespace: Pinecone index namespace
+        embedding_cache: Optional query embedding cache; repeated queries
+            skip the embeddings request.
+        result_cache: Optional result cache; repeated queries skip retrieval
+            and concurrent identical queries share one upstream call.
+        text_index_engine: SQL engine holding the scene FTS5 index. When
+            given, a BM25 search runs concurrently with the vector search
+            and the two rankings are fused.
+        scene_filter: Optional filter applied to both searches (see
+            `resolve_scene_filter`).
+        mongodb_database: MongoDB database used to hydrate the text of
+            matches stored with compact metadata.
     
     Returns:
         List of contexts 
     """
-    embeddings = create_embeddings(
-        user_query=user_query,
-        client=ai_client,
-        model=embedding_model
-    )
-    index = pinecone_client.IndexAsyncio(host=os.getenv("PINECONE_HOST_URL"))
-    raw_contexts = await fetch_contexts(
-        vector=embeddings,
-        top_k=top_k,
-        index=index,
-        namespace=namespace
+
+    async def vector_search(k: int) -> list[dict[str, Any]]:
+        embeddings = await create_embeddings(
+            user_query=user_query,
+            client=ai_client,
+            model=embedding_model,
+            cache=embedding_cache,
+            dimensions=dimensions_for(namespace)
+        )
+        return await fetch_contexts(
+            vector=embeddings,
+            top_k=k,
+            vector_store=vector_store,
+            namespace=namespace,
+            scene_filter=scene_filter
+        )
+
+    async def retrieve() -> list[str]:
+        if text_index_engine is None:
+            return clean_contexts(await hydrate_contexts(await vector_search(top_k), mongodb_database))
+        candidates = top_k * HYBRID_CANDIDATE_MULTIPLIER
+        vector_matches, lexical_matches = await asyncio.gather(
+            vector_search(candidates),
+            search_scene_texts(
+                text_index_engine,
+                user_query,
+                candidates,
+                namespace,
+                **(vars(scene_filter) if scene_filter is not None else {})
+            )
+        )
+        fused = fuse_contexts(vector_matches, lexical_matches, top_k)
+        return clean_contexts(await hydrate_contexts(fused, mongodb_database))
+
+    if result_cache is None:
+        return await retrieve()
+    cache_key = make_cache_key(
+        "contexts",
+        normalize_query(user_query),
+        embedding_model,
+        top_k,
+        namespace,
+        scene_filter.to_metadata_filter() if scene_filter is not None else None
     )
-    return clean_contexts(raw_contexts)
+    return await result_cache.get_or_compute(cache_key, retrieve)
 
-def get_scenes(
+async def get_scenes(
     screenplay_id: int,
-    session: Session
+    session: AsyncSession
 ) -> dict[str, Any]:
     """Retrieve scenes based on the screenplay ID.
     
@@ -361,7 +1257,7 @@ def get_scenes(
         ValueError: If no scenes are found for the given screenplay ID.
     """
     select_stmt = select(Scene).where(Scene.screenplay_id == screenplay_id)
-    results = session.exec(select_stmt)
+    results = await session.exec(select_stmt)
     if results:
         all_scenes = []
         for scene in results:
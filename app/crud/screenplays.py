@@ -1,35 +1,78 @@
 """Screenplay processing helpers.
 
 This module contains helpers to clean and split screenplay text into scene
-chunks, create screenplay database records, and orchestrate the creation of
-associated movie and scene records.
+chunks, create screenplay database records, orchestrate the creation of
+associated movie and scene records, and resume an ingestion that stopped
+part-way.
 
-Only Google-style docstrings are added in this change; no code logic has been
-altered.
+Ingestion streams the PDF (`stream_scene_texts`): worker processes
+extract, split and clean ranges of pages (`split_page_range`, see
+`core.workers`) and send back only the scenes and the partial scenes at
+either end, which `SceneStitcher` joins on the event loop. Scenes enter the
+pipeline range by range, and only a few ranges are parsed ahead. The scene
+placeholders, progress values and analysis prompts need the total up front,
+so a first pass counts the scenes (`count_screenplay_scenes`): workers only
+count slugline starts per range (`count_page_range_headers`) and the loop
+checks the few characters around each range boundary (`HeaderCounter`), no
+scene text is split, cleaned or stitched.
+
+Uploads are stored under their content hash, which is also recorded on the
+screenplay (`Screenplay.content_hash`) with the TMDB id it was uploaded for.
+A repeated upload is found with `find_screenplay_by_content_hash`. Once the
+earlier screenplay is fully ingested (`screenplay_is_ingested`) an upload
+for the same movie is linked to it, and one for another movie is copied to
+a new screenplay with `copy_screenplay`, which reuses the stored analyses
+and vectors instead of calling any model. A file is stored once per movie;
+a second insert raises `DuplicateScreenplayError`.
 """
 
 import re
+import asyncio
+from collections import deque
+from dataclasses import dataclass, replace
 import httpx
-from typing import Any
+import pymupdf
+from typing import Any, AsyncIterator, Callable, Iterable, Iterator
 from openai import AsyncOpenAI
 from pymongo.asynchronous.database import AsyncDatabase
-from pinecone import PineconeAsyncio
-from sqlmodel import Session
-from langchain_community.document_loaders.pdf import PyMuPDFLoader
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import select, func
+from sqlmodel.ext.asyncio.session import AsyncSession
 from crud.movies import create_movie
-from crud.scenes import create_scenes
-from core.config import EMBEDDING_MODEL
+from crud.scenes import copy_scenes, copyable_scene_count, create_scenes, delete_scene_documents, resume_scenes
+from services.text_search import delete_scene_texts
+from core.config import EMBEDDING_MODEL, PARSE_PAGES_PER_TASK, PARSE_WORKERS
+from core.jobs import IngestJob
+from core.workers import run_cpu_bound
+from services.uploads import file_sha256
+from services.vector_store import VectorStore
+from models.db.movies import Movie
+from models.db.scenes import SceneEmbedding
 from models.db.screenplays import Screenplay
 from models.schemas.screenplays import ScreenplayCreate
 
+SCENE_HEADER_PATTERN = r"(?m)^(?:\d+\s+)?(?:INT\.?|EXT\.?)(?:/(?:INT\.?|EXT\.?))?.*?(?=\n(?:\d+\s+)?(?:INT\.?|EXT\.?)(?:/(?:INT\.?|EXT\.?))?|$)"
+# Page texts are joined with this so a scene running across a page break
+# still splits the same way as the whole-document text
+PAGE_DELIMITER = "\n\f"
+
+# Scene starts of SCENE_HEADER_PATTERN: the rest of that pattern only runs to
+# the end of the slugline, so matching the prefix finds the same positions.
+# Anchoring on the newline rather than a MULTILINE ^ lets the engine skip
+# straight to candidate lines; match it against "\n" + text.
+SLUGLINE_PATTERN = re.compile(r"\n(?=[\dIiEe])(?:\d+\s+)?(?:INT|EXT)", re.IGNORECASE)
+LOOSE_SLUGLINE_PATTERN = re.compile(r"(?mi)(?=^(?:\d+\s+)?\s*(?:INT|EXT)(?:\.)?(?:/(?:INT|EXT)(?:\.)?)?\b)")
+BLANK_LINES_PATTERN = re.compile(r"\n\s*\n+")
+SPACE_RUN_PATTERN = re.compile(r" {2,}")
+
 def clean_text_for_embedding_model(
     scene_text: str,
 ) -> str:
     """Normalize screenplay text for embedding input.
 
-    This function removes excessive newlines, tabs and repeated punctuation
-    and collapses multiple spaces so the resulting text is better suited for
-    embedding models.
+    This function replaces newlines and tabs with spaces, collapses runs of
+    spaces and dashes so the resulting text is better suited for embedding
+    models.
 
     Args:
         scene_text: Raw scene text extracted from the screenplay.
@@ -37,124 +80,589 @@ def clean_text_for_embedding_model(
     Returns:
         A cleaned string suitable for embedding model input.
     """
-    text = re.sub(r"[\n\t]+", " ", scene_text) # remove multiple newlines and tabs
-    text = re.sub(r" {2,}", " ", text) # remove extra spaces
-    text = re.sub(r"([.!?]{2,})", r"\1", text)
-    text = re.sub(r"[-]{2,}", "-", text)
+    # plain str.replace is much cheaper than a regex pass per rule
+    text = SPACE_RUN_PATTERN.sub(" ", scene_text.replace("\n", " ").replace("\t", " "))
+    while "--" in text:
+        text = text.replace("--", "-")
     return text.strip()
 
-def split_script_text(
-    script_text: str,
-    re_pattern: re.Pattern
-) -> list[str]:
-    """
-    Robustly split screenplay text into scene chunks. Written by Github Copilot.
+def iter_pdf_pages(file_path: str) -> Iterator[str]:
+    """Yield the text of each page of a PDF, loading one page at a time."""
+    with pymupdf.open(file_path) as document:
+        for page in document:
+            yield page.get_text().strip()
+
 
-    Behavior:
-    1. Try treating `re_pattern` as a header matcher and slice between header
-       start positions (using finditer). Compiles pattern with DOTALL to allow
-       body matching across lines.
-    2. If no headers found, fallback to a lookahead split before INT/EXT
-       sluglines (keeps slugline at start of each chunk).
-    3. Final fallback split on blank lines.
+def iter_scene_texts(
+    pages: Iterable[str],
+    regex_pattern: str = SCENE_HEADER_PATTERN
+) -> Iterator[dict[str, str]]:
+    """Split streamed page texts into cleaned scenes, yielding each once it is complete.
+
+    The synchronous counterpart of `stream_scene_texts`: pages are split
+    with `split_pages` and joined by a `SceneStitcher`, one page at a time,
+    so both produce the same scenes. A scene is complete when the next scene
+    header has been seen, so only the open scene and the newest page are
+    buffered. A custom header pattern may depend on context across page
+    breaks, so its pages are split together once all have been read.
 
     Args:
-        script_text: Full screenplay text to split.
-        re_pattern: Compiled regex pattern used to identify scene headers.
+        pages: Page texts in document order.
+        regex_pattern: Scene header pattern (see `compile_header_pattern`).
 
-    Returns:
-        List of scene strings (trimmed).
+    Yields:
+        Dicts with keys ``raw_text`` and ``embedding_text``.
     """
-    # Normalize input into a compiled pattern and use safe flags
-    if isinstance(re_pattern, str):
-        pattern_str = re_pattern
+    stitcher = SceneStitcher(regex_pattern)
+    if compile_header_pattern(regex_pattern) is SLUGLINE_PATTERN:
+        splits = (split_pages([page], number > 0, regex_pattern) for number, page in enumerate(pages))
     else:
-        pattern_str = re_pattern.pattern
+        pages = list(pages)
+        splits = [split_pages(pages, False, regex_pattern)] if pages else []
+    for split in splits:
+        for raw_text, embedding_text in stitcher.feed(split):
+            yield {"raw_text": raw_text, "embedding_text": embedding_text or clean_text_for_embedding_model(raw_text)}
+    for raw_text, _ in stitcher.finish():
+        yield {"raw_text": raw_text, "embedding_text": clean_text_for_embedding_model(raw_text)}
 
-    # Try header-based slicing (use DOTALL so '.*?' matches across lines)
-    try:
-        header_pat = re.compile(pattern_str, re.DOTALL | re.MULTILINE | re.IGNORECASE)
-    except re.error:
-        # fallback if provided pattern is invalid for some reason
-        header_pat = None
-
-    if header_pat:
-        matches = list(header_pat.finditer(script_text))
-        if matches:
-            chunks = []
-            for i, m in enumerate(matches):
-                start = m.start()
-                end = matches[i + 1].start() if i + 1 < len(matches) else len(script_text)
-                chunk = script_text[start:end].strip()
-                if chunk:
-                    chunks.append(chunk)
-            if chunks:
-                return chunks
-
-    # Lookahead split fallback: split before common sluglines (preserve slugline)
-    lookahead = r'(?mi)(?=^(?:\d+\s+)?\s*(?:INT|EXT)(?:\.)?(?:/(?:INT|EXT)(?:\.)?)?\b)'
-    splits = [s.strip() for s in re.split(lookahead, script_text) if s.strip()]
-    if len(splits) > 1:
-        return splits
-
-    # Final fallback: blank-line split so we at least return multiple chunks
-    blanks = [s.strip() for s in re.split(r'\n\s*\n+', script_text) if s.strip()]
-    return blanks if blanks else [script_text.strip()]
-
-
-async def create_screenplay_chunks(
+
+def pdf_page_count(file_path: str) -> int:
+    with pymupdf.open(file_path) as document:
+        return document.page_count
+
+
+@dataclass(frozen=True)
+class PageRangeSplit:
+    """Scenes a worker found in a run of pages (see `split_page_range`).
+
+    Attributes:
+        head: Text before the range's first scene header; it continues the
+            scene left open by the previous range. The whole range text when
+            it has no header.
+        scenes: ``(raw_text, embedding_text)`` of the scenes that start and
+            end inside the range; empty when only counting.
+        scene_count: Number of those scenes.
+        tail: Text from the range's last header on, which may continue in
+            the next range, or ``None`` when the range has no header.
+    """
+
+    head: str
+    scenes: list[tuple[str, str]]
+    scene_count: int
+    tail: str | None
+
+
+def split_pages(
+    pages: list[str],
+    continued: bool,
+    regex_pattern: str = SCENE_HEADER_PATTERN,
+    keep_scenes: bool = True
+) -> PageRangeSplit:
+    """Split the page texts of one range into scenes and partial ends.
+
+    A range that does not start the document (`continued`) is scanned as if
+    preceded by `PAGE_DELIMITER`, so headers are found exactly where a scan
+    of the whole document finds them.
+    """
+    offset = len(PAGE_DELIMITER) if continued else 0
+    text = PAGE_DELIMITER * continued + PAGE_DELIMITER.join(pages)
+    starts = header_starts(text, compile_header_pattern(regex_pattern))
+    if not starts:
+        return PageRangeSplit(head=text[offset:], scenes=[], scene_count=0, tail=None)
+    scenes = []
+    scene_count = 0
+    for start, end in zip(starts, starts[1:]):
+        raw_text = text[start:end].strip()
+        if raw_text:
+            scene_count += 1
+            if keep_scenes:
+                scenes.append((raw_text, clean_text_for_embedding_model(raw_text)))
+    return PageRangeSplit(head=text[offset:starts[0]], scenes=scenes, scene_count=scene_count, tail=text[starts[-1]:])
+
+
+def split_page_range(
     file_path: str,
-    regex_pattern: str | None = r"(?m)^(?:\d+\s+)?(?:INT\.?|EXT\.?)(?:/(?:INT\.?|EXT\.?))?.*?(?=\n(?:\d+\s+)?(?:INT\.?|EXT\.?)(?:/(?:INT\.?|EXT\.?))?|$)"
-) -> dict[str, str | list[dict[str, str]]]:
-    """Extract scene chunks from a screenplay file using PyMuPDF.
+    start_page: int,
+    stop_page: int,
+    regex_pattern: str = SCENE_HEADER_PATTERN,
+    keep_scenes: bool = True
+) -> PageRangeSplit:
+    """Extract pages ``[start_page, stop_page)`` of a PDF and split them with `split_pages`.
+
+    Runs in a worker process (see `core.workers`); only the scenes and the
+    two partial ends come back.
+    """
+    with pymupdf.open(file_path) as document:
+        pages = [document[number].get_text().strip() for number in range(start_page, stop_page)]
+    return split_pages(pages, start_page > 0, regex_pattern, keep_scenes)
 
-    The loader returns a list of document pages; this function uses the first
-    page's content as the screenplay text, splits it into scenes and prepares
-    a list of dicts containing both the raw text and a cleaned embedding text
-    for each scene.
+
+class SceneStitcher:
+    """Join the `PageRangeSplit`s of consecutive page ranges into scenes.
+
+    The scene open at the end of one range is completed with the head of the
+    next, and that boundary text is scanned again so headers broken across
+    the page break are found. The scenes do not depend on how the pages
+    were grouped into ranges. Scenes completed here have no embedding text
+    yet (``None``); the ranges' inner scenes arrive cleaned.
 
     Args:
-        file_path: Path to the screenplay PDF file.
-        regex_pattern: Regular expression used to split the screenplay into
-            scenes. Defaults to a pattern that looks for INT/EXT sluglines.
+        regex_pattern: Scene header pattern the ranges were split with.
+    """
+
+    def __init__(self, regex_pattern: str = SCENE_HEADER_PATTERN):
+        self.header_pattern = compile_header_pattern(regex_pattern)
+        self.carry: str | None = None
+        self.found_header = False
+        self.scene_count = 0
+
+    def feed(self, split: PageRangeSplit) -> list[tuple[str, str | None]]:
+        """Return the scenes completed by the next range, in order."""
+        if self.carry is None:
+            # the worker already scanned this text in the same context
+            buffer, starts = split.head, []
+        else:
+            buffer = self.carry + PAGE_DELIMITER + split.head
+            starts = self._boundary_starts(buffer)
+            split, buffer, starts = self._extend_first_header(split, buffer, starts)
+        bounds = list(zip(starts, starts[1:]))
+        if split.tail is not None and starts:
+            # the open scene ends where the range's first header starts
+            bounds.append((starts[-1], len(buffer)))
+        scenes: list[tuple[str, str | None]] = [
+            (buffer[start:end].strip(), None) for start, end in bounds if buffer[start:end].strip()
+        ]
+        if split.tail is not None:
+            scenes.extend(split.scenes)
+            self.scene_count += split.scene_count - len(split.scenes)
+            self.carry = split.tail
+        elif starts:
+            self.carry = buffer[starts[-1]:]
+        else:
+            self.carry = buffer
+        self.found_header = self.found_header or bool(starts) or split.tail is not None
+        self.scene_count += len(scenes)
+        return scenes
+
+    def _boundary_starts(self, buffer: str) -> list[int]:
+        # The carry is either headerless or holds one header, at its start.
+        # A slugline match has only digits and whitespace before its INT/EXT,
+        # so one that runs into the new text begins on the carry's last
+        # non-blank line; rescanning from there keeps a long carry (a
+        # headerless document) from being scanned again on every range.
+        if self.header_pattern is not SLUGLINE_PATTERN:
+            return header_starts(buffer, self.header_pattern)
+        line_start = self.carry.rfind("\n", 0, len(self.carry.rstrip()))
+        header_end = SLUGLINE_PATTERN.match("\n" + self.carry).end() - 1 if self.found_header else 0
+        if line_start < max(header_end, 1):
+            return header_starts(buffer, SLUGLINE_PATTERN)
+        known = [0] if self.found_header else []
+        return known + [line_start + start for start in header_starts(buffer[line_start:], SLUGLINE_PATTERN)]
+
+    def _extend_first_header(
+        self,
+        split: PageRangeSplit,
+        buffer: str,
+        starts: list[int]
+    ) -> tuple[PageRangeSplit, str, list[int]]:
+        # A scene number left at the end of the previous range, followed only
+        # by blank lines, belongs to the range's first INT/EXT: the scan of
+        # the whole document starts that header at the number.
+        # Splits without their scenes (`keep_scenes`) only count them, and the
+        # count does not change.
+        last_line = buffer.rstrip().rpartition("\n")[2]
+        if (
+            self.header_pattern is not SLUGLINE_PATTERN
+            or split.tail is None
+            or len(split.scenes) != split.scene_count
+            or not last_line.isdigit()
+        ):
+            return split, buffer, starts
+        first_scene = split.scenes[0][0] if split.scenes else split.tail
+        slugline = SLUGLINE_PATTERN.match("\n" + first_scene)
+        probe = self._boundary_starts(buffer + first_scene[:slugline.end() - 1])
+        if len(buffer) in probe or not probe or probe[-1] in starts:
+            return split, buffer, starts
+        moved = probe[-1]
+        prefix = buffer[moved:]
+        if split.scenes:
+            raw_text = (prefix + split.scenes[0][0]).strip()
+            scenes = [(raw_text, clean_text_for_embedding_model(raw_text)), *split.scenes[1:]]
+            split = replace(split, scenes=scenes)
+        else:
+            split = replace(split, tail=prefix + split.tail)
+        return split, buffer[:moved], [start for start in starts if start < moved]
+
+    def finish(self) -> list[tuple[str, str | None]]:
+        """Return the last scene, or the fallback split of a document without headers."""
+        if self.carry is None:
+            return []
+        if self.found_header:
+            scenes = [(self.carry.strip(), None)] if self.carry.strip() else []
+        else:
+            scenes = [(self.carry[start:end].strip(), None) for start, end in scene_spans(self.carry, header_pattern=None)]
+        self.carry = None
+        self.scene_count += len(scenes)
+        return scenes
+
+
+@dataclass(frozen=True)
+class PageRangeHeaders:
+    """Slugline starts a worker counted in a run of pages (see `count_page_headers`).
+
+    Attributes:
+        count: Headers that start and match inside the range.
+        first_line: The range's text up to the end of its first non-blank
+            line; a header begun in an earlier range may run into it.
+        last_line: The range's text from the newline before its last
+            non-blank line on, where a header running into the next range
+            may begin, or ``None`` when the range has no such newline.
+    """
+
+    count: int
+    first_line: str
+    last_line: str | None
+
+
+def count_page_headers(pages: list[str], continued: bool) -> PageRangeHeaders:
+    """Count the `SLUGLINE_PATTERN` headers of one range of page texts.
+
+    The range is scanned exactly like `split_pages` scans it, but only the
+    match count and the two boundary lines are kept.
+    """
+    offset = len(PAGE_DELIMITER) if continued else 0
+    text = PAGE_DELIMITER * continued + PAGE_DELIMITER.join(pages)
+    body = text[offset:]
+    content = body.rstrip()
+    first_newline = body.find("\n", len(body) - len(body.lstrip()))
+    last_newline = text.rfind("\n", 0, offset + len(content))
+    return PageRangeHeaders(
+        count=len(header_starts(text, SLUGLINE_PATTERN)),
+        first_line=body if first_newline == -1 else body[:first_newline],
+        last_line=text[last_newline:] if last_newline >= offset else None
+    )
+
+
+def count_page_range_headers(file_path: str, start_page: int, stop_page: int) -> PageRangeHeaders:
+    """Extract pages ``[start_page, stop_page)`` of a PDF and count them with `count_page_headers`.
+
+    Runs in a worker process (see `core.workers`).
+    """
+    with pymupdf.open(file_path) as document:
+        pages = [document[number].get_text().strip() for number in range(start_page, stop_page)]
+    return count_page_headers(pages, start_page > 0)
+
+
+class HeaderCounter:
+    """Add up the `PageRangeHeaders` of consecutive page ranges.
+
+    A header whose scene number ends one range and whose ``INT``/``EXT``
+    starts the next is found by neither range, so the lines around each
+    boundary are scanned again. The total equals the number of header
+    matches in the whole document, i.e. the scene count of a document with
+    at least one header.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.carry: str | None = None
+
+    def feed(self, headers: PageRangeHeaders):
+        self.count += headers.count
+        if self.carry is None:
+            joined = headers.first_line
+        else:
+            joined = self.carry + PAGE_DELIMITER + headers.first_line
+            self.count += len(header_starts(joined, SLUGLINE_PATTERN)) - len(header_starts(self.carry, SLUGLINE_PATTERN))
+        self.carry = headers.last_line if headers.last_line is not None else joined
+
+
+async def iter_page_ranges(
+    file_path: str,
+    task: Callable[..., Any],
+    *task_args: Any,
+    pages_per_task: int = PARSE_PAGES_PER_TASK
+) -> AsyncIterator[Any]:
+    """Run ``task(file_path, start_page, stop_page, *task_args)`` over a PDF's page ranges.
+
+    The ranges run on the process pool and their results are yielded in
+    order. A few ranges are parsed ahead (one per worker), so long
+    documents are spread over the cores while the consumer's pace still
+    bounds memory. A `pages_per_task` of 0 runs the whole document as one
+    task.
+    """
+    page_count = await asyncio.to_thread(pdf_page_count, file_path)
+    pages_per_task = pages_per_task or max(page_count, 1)
+    ranges = iter([(start, min(start + pages_per_task, page_count)) for start in range(0, page_count, pages_per_task)])
+    in_flight: deque[asyncio.Future] = deque()
+
+    def submit():
+        page_range = next(ranges, None)
+        if page_range is not None:
+            in_flight.append(run_cpu_bound(task, file_path, *page_range, *task_args))
+
+    try:
+        for _ in range(max(1, PARSE_WORKERS)):
+            submit()
+        while in_flight:
+            result = await in_flight.popleft()
+            submit()
+            yield result
+    finally:
+        for future in in_flight:
+            future.cancel()
+
+
+def iter_page_range_splits(
+    file_path: str,
+    regex_pattern: str = SCENE_HEADER_PATTERN,
+    keep_scenes: bool = True,
+    pages_per_task: int = PARSE_PAGES_PER_TASK
+) -> AsyncIterator[PageRangeSplit]:
+    """Split a PDF in page ranges on the process pool, yielding the results in order.
+
+    Only the default header pattern is split into ranges; a custom pattern
+    may depend on context across page breaks, so it gets a single task.
+    """
+    if compile_header_pattern(regex_pattern) is not SLUGLINE_PATTERN:
+        pages_per_task = 0
+    return iter_page_ranges(file_path, split_page_range, regex_pattern, keep_scenes, pages_per_task=pages_per_task)
+
+
+async def stream_scene_texts(
+    file_path: str,
+    regex_pattern: str = SCENE_HEADER_PATTERN
+) -> AsyncIterator[dict[str, str]]:
+    """Yield the scenes of a screenplay PDF as soon as each is parsed.
+
+    Pages are extracted, split and cleaned in worker processes, in ranges of
+    `PARSE_PAGES_PER_TASK` pages (see `iter_page_range_splits`), so the
+    event loop only stitches the scenes at range boundaries. Parsing stays
+    a few ranges ahead of the pipeline, whose backpressure throttles it.
+
+    Yields:
+        Dicts with keys ``raw_text`` and ``embedding_text``.
+    """
+    stitcher = SceneStitcher(regex_pattern)
+    splits = iter_page_range_splits(file_path, regex_pattern)
+    try:
+        async for split in splits:
+            for raw_text, embedding_text in stitcher.feed(split):
+                yield {"raw_text": raw_text, "embedding_text": embedding_text or clean_text_for_embedding_model(raw_text)}
+        for raw_text, _ in stitcher.finish():
+            yield {"raw_text": raw_text, "embedding_text": clean_text_for_embedding_model(raw_text)}
+    finally:
+        await splits.aclose()
+
+
+async def count_screenplay_scenes(
+    file_path: str,
+    regex_pattern: str = SCENE_HEADER_PATTERN
+) -> int:
+    """Count the scenes of a screenplay PDF without keeping their text.
+
+    With the default header pattern the workers only count slugline starts
+    (see `HeaderCounter`). A custom pattern, or a document without any
+    slugline whose scenes come from the fallback splits, is counted with
+    the same page-range splits as `stream_scene_texts`, the workers
+    returning only the range ends and a count.
+    """
+    if compile_header_pattern(regex_pattern) is SLUGLINE_PATTERN:
+        counter = HeaderCounter()
+        async for headers in iter_page_ranges(file_path, count_page_range_headers):
+            counter.feed(headers)
+        if counter.count:
+            return counter.count
+    stitcher = SceneStitcher(regex_pattern)
+    async for split in iter_page_range_splits(file_path, regex_pattern, keep_scenes=False):
+        stitcher.feed(split)
+    stitcher.finish()
+    return stitcher.scene_count
+
+
+def parse_screenplay_file(
+    file_path: str,
+    regex_pattern: str = SCENE_HEADER_PATTERN
+) -> dict[str, Any]:
+    """Hash a screenplay PDF and split it into cleaned scenes, synchronously.
+
+    Meant for worker processes (see ``cli ingest``): everything is plain
+    data, so the result pickles cheaply back to the caller.
 
     Returns:
-        A dictionary with keys ``full_text`` (the full screenplay text) and
-        ``scene_texts`` (a list of dicts with keys ``raw_text`` and
-        ``embedding_text``).
-    """
-    loader = PyMuPDFLoader(file_path=file_path, mode="single")
-    loaded_screenplay = await loader.aload()
-    re_pattern = re.compile(regex_pattern)
-    raw_scene_texts = split_script_text(script_text=loaded_screenplay[0].page_content, re_pattern=re_pattern)
-    scene_texts = [
-        {
-            "raw_text": raw_scene_text,
-            "embedding_text": clean_text_for_embedding_model(raw_scene_text)
-        } for raw_scene_text in raw_scene_texts
-    ]
+        A dict with the file's ``content_hash`` and its ``scene_texts``
+        (dicts with keys ``raw_text`` and ``embedding_text``).
+    """
     return {
-        "full_text": loaded_screenplay[0].page_content,
-        "scene_texts": scene_texts
+        "content_hash": file_sha256(file_path),
+        "scene_texts": list(iter_scene_texts(iter_pdf_pages(file_path), regex_pattern))
     }
 
+
+def compile_header_pattern(regex_pattern: str) -> re.Pattern | None:
+    """Return the compiled scene header pattern, or ``None`` if it is invalid.
+
+    The default `SCENE_HEADER_PATTERN` maps to the equivalent, cheaper
+    `SLUGLINE_PATTERN`; other patterns are compiled with ``DOTALL``,
+    ``MULTILINE`` and ``IGNORECASE``.
+    """
+    if regex_pattern == SCENE_HEADER_PATTERN:
+        return SLUGLINE_PATTERN
+    try:
+        return re.compile(regex_pattern, re.DOTALL | re.MULTILINE | re.IGNORECASE)
+    except re.error:
+        return None
+
+
+def header_starts(script_text: str, header_pattern: re.Pattern | None) -> list[int]:
+    """Return the offsets at which `header_pattern` finds a scene header."""
+    if header_pattern is None:
+        return []
+    if header_pattern is SLUGLINE_PATTERN:
+        # the match starts at the prepended newline, i.e. at the line's offset
+        return [match.start() for match in SLUGLINE_PATTERN.finditer("\n" + script_text)]
+    return [match.start() for match in header_pattern.finditer(script_text)]
+
+
+def scene_spans(
+    script_text: str,
+    header_pattern: re.Pattern | None = SLUGLINE_PATTERN
+) -> Iterator[tuple[int, int]]:
+    """Yield the ``(start, end)`` offsets of the scenes in `script_text`.
+
+    A single scan over the header matches finds the scenes of a regular
+    script. Scripts without a header fall back to indented or otherwise
+    loose sluglines and then to blank lines; those scans only run when the
+    previous one found nothing. Spans whose text is blank are skipped, so
+    the stripped spans equal the chunks of the original regex cascade
+    (``split_script_text`` in `benchmarks.scene_tokenizer`).
+    """
+    starts = header_starts(script_text, header_pattern)
+    if starts:
+        bounds = zip(starts, starts[1:] + [len(script_text)])
+    else:
+        splits = [match.start() for match in LOOSE_SLUGLINE_PATTERN.finditer(script_text)]
+        bounds = list(zip([0] + splits, splits + [len(script_text)]))
+        if sum(1 for start, end in bounds if script_text[start:end].strip()) <= 1:
+            separators = list(BLANK_LINES_PATTERN.finditer(script_text))
+            bounds = zip(
+                [0] + [separator.end() for separator in separators],
+                [separator.start() for separator in separators] + [len(script_text)]
+            )
+    found = False
+    for start, end in bounds:
+        if script_text[start:end].strip():
+            found = True
+            yield start, end
+    if not found:
+        yield 0, len(script_text)
+
+
+class DuplicateScreenplayError(Exception):
+    """Raised when a file is already stored as a screenplay for the same movie.
+
+    Attributes:
+        screenplay_id: The screenplay stored first.
+    """
+
+    def __init__(self, screenplay_id: int):
+        self.screenplay_id = screenplay_id
+        super().__init__(f"This file is already stored for the movie as screenplay {screenplay_id}.")
+
+
+async def find_screenplay_by_content_hash(
+    content_hash: str,
+    session: AsyncSession,
+    tmdb_id: int | None = None
+) -> Screenplay | None:
+    """Return the first screenplay stored from a file with this SHA-256, if any.
+
+    With `tmdb_id`, only a screenplay uploaded for that movie is returned.
+    """
+    statement = select(Screenplay).where(Screenplay.content_hash == content_hash)
+    if tmdb_id is not None:
+        statement = statement.where(Screenplay.tmdb_id == tmdb_id)
+    return (await session.exec(statement.order_by(Screenplay.id))).first()
+
+async def screenplay_is_ingested(screenplay_id: int, session: AsyncSession) -> bool:
+    """Return whether every scene of a screenplay is ingested with the current embedding model."""
+    try:
+        await copyable_scene_count(screenplay_id, EMBEDDING_MODEL, session)
+    except ValueError:
+        return False
+    return True
+
+async def find_ingested_screenplay_by_content_hash(content_hash: str, session: AsyncSession) -> Screenplay | None:
+    """Return the first fully ingested screenplay stored from a file with this SHA-256, if any."""
+    candidates = (await session.exec(
+        select(Screenplay).where(Screenplay.content_hash == content_hash).order_by(Screenplay.id)
+    )).all()
+    for screenplay in candidates:
+        if await screenplay_is_ingested(screenplay.id, session):
+            return screenplay
+    return None
+
+async def create_screenplay_record(
+    movie_record: Movie,
+    storage_path: str,
+    total_scenes: int | None,
+    content_hash: str | None,
+    session: AsyncSession
+) -> Screenplay:
+    """Persist a `Screenplay` row and link `movie_record` to it.
+
+    Raises:
+        DuplicateScreenplayError: If the file is already stored for the
+            movie, e.g. by a concurrent upload that was inserted first.
+    """
+    screenplay_create_model = ScreenplayCreate(
+        movie_id=movie_record.id,
+        storage_path=storage_path,
+        text=None,
+        total_scenes=total_scenes,
+        tmdb_id=movie_record.tmdb_id,
+        content_hash=content_hash
+    )
+    screenplay_record = Screenplay(**screenplay_create_model.model_dump())
+    session.add(screenplay_record)
+    try:
+        await session.commit()
+    except IntegrityError:
+        await session.rollback()
+        duplicate = None
+        if content_hash is not None:
+            duplicate = await find_screenplay_by_content_hash(content_hash, session, tmdb_id=movie_record.tmdb_id)
+        if duplicate is None:
+            raise
+        raise DuplicateScreenplayError(duplicate.id)
+    await session.refresh(screenplay_record)
+    movie_record.screenplay_id = screenplay_record.id
+    session.add(movie_record)
+    await session.commit()
+    await session.refresh(movie_record)
+    return screenplay_record
+
 async def create_screenplay(
     file_path: str,
     tmdb_id: int,
-    session: Session,
+    session: AsyncSession,
     async_client: httpx.AsyncClient,
     ai_client: AsyncOpenAI,
     mongodb_database: AsyncDatabase,
-    pinecone_client: PineconeAsyncio
+    vector_store: VectorStore,
+    job: IngestJob | None = None,
+    content_hash: str | None = None
 ) -> Screenplay:
     """Create a screenplay record and its associated movie and scenes.
 
     This high-level helper performs the following steps:
     1. Creates a `Movie` record for the provided `tmdb_id` (if it doesn't
        already exist) via `create_movie`.
-    2. Loads and splits the provided screenplay file into scene chunks.
-    3. Persists a `Screenplay` record containing metadata and full text.
-    4. Asynchronously creates and indexes scene records via `create_scenes`.
+    2. Counts the scenes of the provided screenplay file.
+    3. Persists a `Screenplay` record with the file path and scene count;
+       the full text is not stored, the file is the source of truth.
+    4. Streams the scenes page by page into `create_scenes`, which creates
+       and indexes the scene records.
 
     Args:
         file_path: Path to the screenplay PDF file.
@@ -163,45 +671,179 @@ async def create_screenplay(
         async_client: `httpx.AsyncClient` used to call external APIs.
         ai_client: OpenAI client used for analysis and embeddings.
         mongodb_database: Async MongoDB database instance.
-        pinecone_client: Async Pinecone client instance.
+        vector_store: Shared vector store the scene embeddings are written to.
+        job: Optional background job record updated with the current stage
+            and per-scene progress.
+        content_hash: SHA-256 of the file, computed while it was uploaded.
 
     Returns:
         The created and refreshed `Screenplay` SQL model instance.
+
+    Raises:
+        DuplicateScreenplayError: If the file is already stored for the
+            movie; nothing is ingested.
     """
+    if job is not None:
+        job.set_stage("fetching_movie")
     movie_record = await create_movie(tmdb_id=tmdb_id, async_client=async_client, session=session)
-    screenplay_chunks = await create_screenplay_chunks(
-        file_path=file_path
-    )
-    screenplay_create_model = ScreenplayCreate(
-        movie_id=movie_record.id,
+    if job is not None:
+        job.set_stage("parsing")
+    total_scenes = await count_screenplay_scenes(file_path)
+    screenplay_record = await create_screenplay_record(
+        movie_record=movie_record,
         storage_path=file_path,
-        text=screenplay_chunks["full_text"],
-        total_scenes=len(screenplay_chunks["scene_texts"])
+        total_scenes=total_scenes,
+        content_hash=content_hash,
+        session=session
     )
-    screenplay_record = Screenplay(**screenplay_create_model.model_dump())
-    session.add(screenplay_record)
-    session.commit()
-    session.refresh(screenplay_record)
-    movie_record.screenplay_id = screenplay_record.id
-    session.add(movie_record)
-    session.commit()
-    session.refresh(movie_record)
-    # TODO: here is where you now create the scene records as you should have a screenplay id
+    if job is not None:
+        job.scenes_total = total_scenes
+        job.result = {"screenplay_id": screenplay_record.id}
+        job.set_stage("ingesting_scenes")
     await create_scenes(
-        scene_texts=screenplay_chunks["scene_texts"],
+        scene_texts=stream_scene_texts(file_path),
+        total_scenes=total_scenes,
         screenplay_id=screenplay_record.id,
         movie_name=movie_record.title,
         ai_client=ai_client,
         embedding_model=EMBEDDING_MODEL,
         mongodb_database=mongodb_database,
-        pinecone_client=pinecone_client,
+        vector_store=vector_store,
+        session=session,
+        on_item_done=job.scene_done if job is not None else None
+    )
+    return screenplay_record
+
+async def copy_screenplay(
+    source_screenplay_id: int,
+    tmdb_id: int,
+    session: AsyncSession,
+    async_client: httpx.AsyncClient,
+    mongodb_database: AsyncDatabase,
+    vector_store: VectorStore,
+    job: IngestJob | None = None
+) -> Screenplay:
+    """Create a screenplay for `tmdb_id` from an already ingested duplicate.
+
+    The new record points at the same stored file and gets a copy of the
+    source's scenes, summaries, documents and vectors via `copy_scenes`;
+    no LLM or embedding calls are made.
+
+    Args:
+        source_screenplay_id: Fully ingested screenplay with the same file.
+        tmdb_id: TMDB id for the movie of the new screenplay.
+        session: SQLModel/SQLAlchemy session used for DB operations.
+        async_client: `httpx.AsyncClient` used to call external APIs.
+        mongodb_database: Async MongoDB database instance.
+        vector_store: Shared vector store holding the source vectors.
+        job: Optional background job record updated with progress.
+
+    Returns:
+        The new `Screenplay` SQL model instance.
+
+    Raises:
+        ValueError: If the source doesn't exist or hasn't finished
+            ingesting with the current embedding model.
+        DuplicateScreenplayError: If the file is already stored for the
+            movie of `tmdb_id`.
+    """
+    source_record = await session.get(Screenplay, source_screenplay_id)
+    if source_record is None:
+        raise ValueError(f"Screenplay with ID {source_screenplay_id} does not exist.")
+    # fail before any record is created
+    total_scenes = await copyable_scene_count(source_screenplay_id, EMBEDDING_MODEL, session)
+    if job is not None:
+        job.set_stage("fetching_movie")
+    movie_record = await create_movie(tmdb_id=tmdb_id, async_client=async_client, session=session)
+    screenplay_record = await create_screenplay_record(
+        movie_record=movie_record,
+        storage_path=source_record.storage_path,
+        total_scenes=total_scenes,
+        content_hash=source_record.content_hash,
         session=session
     )
+    if job is not None:
+        job.scenes_total = total_scenes
+        job.result = {"screenplay_id": screenplay_record.id, "copied_from": source_screenplay_id}
+        job.set_stage("copying_scenes")
+    await copy_scenes(
+        source_screenplay_id=source_screenplay_id,
+        screenplay_id=screenplay_record.id,
+        movie_name=movie_record.title,
+        embedding_model=EMBEDDING_MODEL,
+        mongodb_database=mongodb_database,
+        vector_store=vector_store,
+        session=session,
+        on_item_done=job.scene_done if job is not None else None
+    )
+    return screenplay_record
+
+async def resume_screenplay(
+    screenplay_id: int,
+    session: AsyncSession,
+    ai_client: AsyncOpenAI,
+    mongodb_database: AsyncDatabase,
+    vector_store: VectorStore,
+    job: IngestJob | None = None
+) -> Screenplay:
+    """Finish ingesting a screenplay whose earlier ingestion failed.
+
+    The stored screenplay file is streamed again (splitting is
+    deterministic) and `resume_scenes` ingests only the scenes without a
+    checkpoint, so scenes that already succeeded cost no further LLM calls.
+
+    Args:
+        screenplay_id: ID of the screenplay to resume.
+        session: SQLModel/SQLAlchemy session used for DB operations.
+        ai_client: OpenAI client used for analysis and embeddings.
+        mongodb_database: Async MongoDB database instance.
+        vector_store: Shared vector store the scene embeddings are written to.
+        job: Optional background job record updated with progress.
+
+    Returns:
+        The resumed `Screenplay` SQL model instance.
+
+    Raises:
+        ValueError: If the screenplay or its movie doesn't exist, or the
+            stored file no longer yields the recorded number of scenes.
+    """
+    screenplay_record = await session.get(Screenplay, screenplay_id)
+    if screenplay_record is None:
+        raise ValueError(f"Screenplay with ID {screenplay_id} does not exist.")
+    movie_record = (await session.exec(select(Movie).where(Movie.screenplay_id == screenplay_id))).first()
+    if movie_record is None:
+        raise ValueError(f"No movie is linked to screenplay ID {screenplay_id}.")
+    if job is not None:
+        job.result = {"screenplay_id": screenplay_id}
+        job.set_stage("parsing")
+    total_scenes = await count_screenplay_scenes(screenplay_record.storage_path)
+    if screenplay_record.total_scenes is not None and total_scenes != screenplay_record.total_scenes:
+        raise ValueError(
+            f"Screenplay file now has {total_scenes} scenes, expected {screenplay_record.total_scenes}."
+        )
+    if job is not None:
+        job.scenes_total = total_scenes
+        job.scenes_done = (await session.exec(
+            select(func.count()).select_from(SceneEmbedding).where(SceneEmbedding.screenplay_id == screenplay_id)
+        )).one()
+        job.set_stage("ingesting_scenes")
+    await resume_scenes(
+        scene_texts=stream_scene_texts(screenplay_record.storage_path),
+        total_scenes=total_scenes,
+        screenplay_id=screenplay_id,
+        movie_name=movie_record.title,
+        ai_client=ai_client,
+        embedding_model=EMBEDDING_MODEL,
+        mongodb_database=mongodb_database,
+        vector_store=vector_store,
+        session=session,
+        on_item_done=job.scene_done if job is not None else None
+    )
     return screenplay_record
 
-def get_screenplay(
+async def get_screenplay(
     screenplay_id: int,
-    session: Session
+    session: AsyncSession
 ) -> dict[str, Any]:
     """Retrieve a screenplay and its associated scenes from the database.
     
@@ -213,30 +855,39 @@ def get_screenplay(
     Raises:
         ValueError: If screenplay with the given ID doesn't exist.
     """
-    screenplay_record = session.get(Screenplay, screenplay_id)
+    screenplay_record = await session.get(Screenplay, screenplay_id)
     if screenplay_record:
         return {"screenplay_record": screenplay_record}
     else:
         raise ValueError(f"Screenplay with ID {screenplay_id} does not exist.")
 
-def delete_screenplay(
+async def delete_screenplay(
     screenplay_id: int,
-    session: Session
+    session: AsyncSession,
+    mongodb_database: AsyncDatabase,
+    vector_store: VectorStore
 ) -> dict[str, Any]:
-    """Delete a screenplay and its associated scenes from the database.
-    
-    This function deletes the screenplay record with the given ID.
-    
+    """Delete a screenplay and its associated scenes from every store.
+
+    This function deletes the screenplay record with the given ID. The
+    scenes' MongoDB documents and vectors are deleted first: their vector ids
+    come from the SQL scene rows, and if the SQL delete then fails it can
+    simply be retried.
+
     Args:
         screenplay_id: ID of the screenplay to delete.
         session: SQLModel/SQLAlchemy session used for DB operations.
+        mongodb_database: Async MongoDB database holding the scene documents.
+        vector_store: Vector store holding the scene vectors.
     Raises:
         ValueError: If screenplay with the given ID doesn't exist.
     """
-    screenplay_record = session.get(Screenplay, screenplay_id)
+    screenplay_record = await session.get(Screenplay, screenplay_id)
     if screenplay_record:
-        session.delete(screenplay_record)
-        session.commit()
+        await delete_scene_documents(screenplay_id, mongodb_database, vector_store, session)
+        await delete_scene_texts(screenplay_id, session)
+        await session.delete(screenplay_record)
+        await session.commit()
         return {"Deleted": True, "screenplay_record": screenplay_record}
     else:
         raise ValueError(f"Screenplay with ID {screenplay_id} does not exist.")
\ No newline at end of file
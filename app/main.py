@@ -15,12 +15,25 @@ Functions:
 """
 from contextlib import asynccontextmanager
 import asyncio
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi_mcp import FastApiMCP
 from api.routers import movies_router, screenplays_router, scenes_router
 from fastapi.routing import APIRoute
-from core.config import MONGODB_DATABASE
+from core.config import (
+    MONGODB_DATABASE,
+    INGEST_SHUTDOWN_TIMEOUT,
+    QUERY_EMBEDDING_CACHE_PATH,
+    QUERY_EMBEDDING_CACHE_MAX_BYTES,
+    VECTOR_STORE_BACKEND,
+    VECTOR_STORE_DIR
+)
 from core.db import init_db, engine as db_engine
+from core.jobs import JobRunner
+from core.indexes import MongoIndexManager
+from core.workers import shutdown_process_pool
+from services.cache import SQLiteCache, ResultCache
+from services.embeddings import QueryEmbeddingCache
+from services.vector_store import PineconeVectorStore, LocalVectorStore
 from core.clients import (
     init_async_client, 
     close_async_client, 
@@ -28,6 +41,8 @@ from core.clients import (
     close_openai_client,
     init_pinecone_client,
     close_pinecone_client,
+    init_pinecone_index,
+    close_pinecone_index,
     init_mongodb_client,
     close_mongodb_client
 )
@@ -75,8 +90,14 @@ async def lifespan(app: FastAPI):
     """Async context manager for application startup and shutdown.
 
     This lifecycle manager performs initialization of resources during
-    application startup (database, HTTP/OpenAI/Pinecone clients) and
-    ensures they are correctly closed on shutdown.
+    application startup (database, MongoDB indexes, HTTP/OpenAI/Pinecone
+    clients, the vector store, the retrieval and query embedding caches and the
+    ingestion job runner) and ensures they are correctly closed on shutdown.
+    The vector store is the shared Pinecone index handle, or a
+    `LocalVectorStore` when `VECTOR_STORE_BACKEND` is ``local`` (no Pinecone
+    client is created then). Running ingestion jobs get
+    `INGEST_SHUTDOWN_TIMEOUT` seconds to finish before they are cancelled;
+    the PDF parsing process pool is stopped after them.
 
     Args:
         app (FastAPI): The FastAPI application instance.
@@ -84,22 +105,50 @@ async def lifespan(app: FastAPI):
     Yields:
         None
     """
-    init_db()
+    await init_db()
     mongodb_client = init_mongodb_client()
     app.state.mongodb_client = mongodb_client
     app.state.mongodb_database = mongodb_client[MONGODB_DATABASE]
+    app.state.mongodb_indexes = MongoIndexManager(app.state.mongodb_database)
+    app.state.mongodb_indexes.start()
     app.state.async_client = init_async_client()
     app.state.db_engine = db_engine
     app.state.openai_client = init_openai_client()
-    app.state.pinecone_client = init_pinecone_client()
+    if VECTOR_STORE_BACKEND == "local":
+        app.state.pinecone_client = None
+        app.state.pinecone_index = None
+        app.state.vector_store = LocalVectorStore(VECTOR_STORE_DIR)
+    else:
+        app.state.pinecone_client = init_pinecone_client()
+        app.state.pinecone_index = init_pinecone_index(app.state.pinecone_client)
+        app.state.vector_store = PineconeVectorStore(app.state.pinecone_index)
+    app.state.query_embedding_cache = QueryEmbeddingCache(
+        persistent=SQLiteCache(
+            QUERY_EMBEDDING_CACHE_PATH,
+            table="query_embeddings",
+            max_bytes=QUERY_EMBEDDING_CACHE_MAX_BYTES
+        ) if QUERY_EMBEDDING_CACHE_PATH else None
+    )
+    app.state.result_cache = ResultCache()
+    app.state.job_runner = JobRunner()
     try:
         yield
     finally:
-        db_engine.dispose()
+        # Let in-flight ingestion jobs drain before their clients are closed
+        await app.state.job_runner.shutdown(timeout=INGEST_SHUTDOWN_TIMEOUT)
+        shutdown_process_pool()
+        await db_engine.dispose()
+        await app.state.mongodb_indexes.close()
         await close_async_client(app.state.async_client)
         await close_mongodb_client(app.state.mongodb_client)
-        close_openai_client(app.state.openai_client)
-        await close_pinecone_client(app.state.pinecone_client)
+        await close_openai_client(app.state.openai_client)
+        if app.state.pinecone_client is not None:
+            await close_pinecone_index(app.state.pinecone_index)
+            await close_pinecone_client(app.state.pinecone_client)
+        else:
+            app.state.vector_store.close()
+        if app.state.query_embedding_cache.persistent is not None:
+            app.state.query_embedding_cache.persistent.close()
         del app.state.mongodb_database
         del app.state.openai_client
 
@@ -138,3 +187,14 @@ def get_root():
         "App": "Root Page",
         "Summary": "Having trouble with your screenplay's beats? Truby AI will help you out.",
     }
+
+@app.get("/status/indexes")
+def get_index_status(request: Request):
+    """Report the build status of the managed MongoDB indexes.
+
+    Returns:
+        dict: ``ready`` plus the state (pending/building/ready/failed) of
+        each index.
+    """
+
+    return request.app.state.mongodb_indexes.report()
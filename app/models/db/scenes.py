@@ -1,14 +1,20 @@
 """Database models for scene and embedding entities.
 
 This module defines the Scene table for per-screenplay scene metadata and
-a SceneEmbedding helper table to track embeddings stored externally.
+a SceneEmbedding table that checkpoints scenes whose embedding has been
+stored externally (MongoDB document and vector index entry).
+
+It also registers the ``scene_fts`` FTS5 virtual table, the full-text index
+over each scene's embedding text used for lexical retrieval. SQLModel cannot
+declare virtual tables, so it is created by a DDL hook whenever the metadata
+is created.
 """
 
 from datetime import datetime
-from sqlalchemy import Column
+from sqlalchemy import Column, DDL, event
 from sqlalchemy.sql import func
 from sqlalchemy.types import DateTime
-from sqlmodel import SQLModel, Field
+from sqlmodel import SQLModel, Field, UniqueConstraint
 
 
 class Scene(SQLModel, table=True):
@@ -39,12 +45,23 @@ class Scene(SQLModel, table=True):
 class SceneEmbedding(SQLModel, table=True):
     """SQLModel used to track embedding metadata for a scene.
 
-    This table stores minimal references to externally stored embeddings.
+    A row is written once a scene has made it through every ingestion stage
+    (analysis, embedding, MongoDB and vector index writes), in the same
+    transaction as the scene's SQL backfill. Resuming an interrupted
+    ingestion skips every scene that has a row here.
     """
 
+    __table_args__ = (
+        UniqueConstraint("scene_id", name="uniqueConstraint_scene_embedding_scene_id"),
+    )
+
     id: int | None = Field(default=None, primary_key=True)
     scene_id: int = Field(..., foreign_key="scene.id", ondelete="CASCADE")
+    screenplay_id: int = Field(..., foreign_key="screenplay.id", ondelete="CASCADE", index=True)
+    scene_number: int = Field(...)
     mongo_id: str | None = Field(default=None)
+    vector_id: str | None = Field(default=None)
+    embedding_model: str | None = Field(default=None)
     created_at: datetime = Field(
         sa_column=Column(DateTime(timezone=True), server_default=func.now())
     )
@@ -52,3 +69,16 @@ class SceneEmbedding(SQLModel, table=True):
         sa_column=Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     )
 
+
+SCENE_FTS_TABLE = "scene_fts"
+
+event.listen(
+    SQLModel.metadata,
+    "after_create",
+    DDL(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {SCENE_FTS_TABLE} USING fts5("
+        "embedding_text, scene_id UNINDEXED, screenplay_id UNINDEXED, "
+        "scene_number UNINDEXED, vector_id UNINDEXED, namespace UNINDEXED, "
+        "tokenize = 'porter unicode61')"
+    ).execute_if(dialect="sqlite")
+)
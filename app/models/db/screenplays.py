@@ -5,7 +5,7 @@ original screenplay text along with timestamps.
 """
 
 from datetime import datetime
-from sqlalchemy import Column
+from sqlalchemy import Column, Index
 from sqlalchemy.sql import func
 from sqlalchemy.types import DateTime
 from sqlmodel import SQLModel, Field, Relationship
@@ -22,13 +22,24 @@ class Screenplay(SQLModel, table=True):
         storage_path (str): Filesystem path to the screenplay file.
         text (str | None): Full screenplay text if stored in DB.
         total_scenes (int | None): Cached count of scenes.
+        tmdb_id (int | None): TMDB id of the movie the file was uploaded for.
+        content_hash (str | None): SHA-256 of the uploaded file.
+
+    A file is stored at most once per movie: ``(content_hash, tmdb_id)`` is
+    unique, so concurrent uploads of the same file cannot both be inserted.
     """
 
+    __table_args__ = (
+        Index("ux_screenplay_content_hash_tmdb_id", "content_hash", "tmdb_id", unique=True),
+    )
+
     id: int | None = Field(default=None, primary_key=True)
     # TODO: create an author table and screenplay-author junction.
     storage_path: str = Field(...)
     text: str | None = Field(default=None)
     total_scenes: int | None = Field(default=None)
+    tmdb_id: int | None = Field(default=None)
+    content_hash: str | None = Field(default=None, index=True)
     created_at: datetime = Field(
         sa_column=Column(DateTime(timezone=True), server_default=func.now())
     )
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 class SceneCreate(BaseModel):
     screenplay_id: int 
@@ -25,4 +25,18 @@ class SceneUpdate(BaseModel):
     ai_summary: str | None
     previous_scene_id: int | None
     next_scene_id: int | None
-    mongodb_record_id: str | None
\ No newline at end of file
+    mongodb_record_id: str | None
+
+class SceneQueryFilters(BaseModel):
+    """Optional filters narrowing a scene retrieval query.
+
+    Scene-level fields are pushed down to the vector store as a metadata
+    filter; movie attributes are first resolved to screenplay ids via SQL.
+    """
+    screenplay_ids: list[int] | None = Field(default=None, description="Only search these screenplays")
+    story_beats: list[str] | None = Field(default=None, description="Only scenes with these story beats, e.g. climax")
+    progress_min: float | None = Field(default=None, ge=0, le=1, description="Earliest position in the screenplay (0-1)")
+    progress_max: float | None = Field(default=None, ge=0, le=1, description="Latest position in the screenplay (0-1)")
+    release_year_min: int | None = Field(default=None, description="Movies released in or after this year")
+    release_year_max: int | None = Field(default=None, description="Movies released in or before this year")
+    min_vote_average: float | None = Field(default=None, description="Movies rated at least this on TMDB")
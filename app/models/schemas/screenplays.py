@@ -5,6 +5,8 @@ class ScreenplayCreate(BaseModel):
     storage_path: str
     text: str | None
     total_scenes: int | None
+    tmdb_id: int | None = None
+    content_hash: str | None = None
 
 class ScreenplayRead(BaseModel):
     id: int | None
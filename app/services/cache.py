@@ -0,0 +1,307 @@
+"""Persistent, content-addressed caches backed by SQLite.
+
+`SQLiteCache` stores text values under a SHA-256 key derived from everything
+that determines the value (see `make_cache_key`), so identical requests are
+answered from disk across restarts. Each cache lives in its own table; the
+total size of the stored values is capped and the least recently used
+entries are evicted first. Hit and miss counters are kept per instance.
+
+Async callers use `SQLiteCache.aget` and `SQLiteCache.aset`, which run the
+SQLite work on a worker thread so a disk sync never stalls the event loop. A
+hit does not write: its access time is buffered and the buffered times are
+written in one transaction with the next `set` (or every `touch_batch_size`
+hits), which is all the LRU order needs.
+
+`ResultCache` is an in-memory counterpart for whole request results: it
+coalesces concurrent identical requests so only one upstream call runs, and
+it can be invalidated wholesale when the underlying data changes.
+
+Classes:
+    SQLiteCache: Size-bounded key/value cache in a SQLite table.
+    ResultCache: Single-flight LRU+TTL cache for async results.
+
+Functions:
+    make_cache_key(*parts): Stable SHA-256 key for JSON-serialisable parts.
+    get_llm_cache(): Process-wide cache for structured LLM responses.
+"""
+
+import os
+import json
+import time
+import asyncio
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Awaitable, Callable, Iterator
+from core.config import LLM_CACHE_PATH, LLM_CACHE_MAX_BYTES, RESULT_CACHE_SIZE, RESULT_CACHE_TTL
+
+
+def make_cache_key(*parts: Any) -> str:
+    """Return a SHA-256 hex digest identifying `parts`.
+
+    Parts are serialised as canonical JSON, so equal inputs give equal keys
+    regardless of dict ordering.
+    """
+    payload = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SQLiteCache:
+    """Key/value cache stored in one table of a SQLite file.
+
+    Args:
+        path: SQLite database file; parent directories are created.
+        table: Table holding this cache's entries.
+        max_bytes: Upper bound on the summed size of the stored values.
+        touch_batch_size: Buffered access times that trigger a write on
+            their own, without waiting for the next `set`.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        table: str = "cache",
+        max_bytes: int = LLM_CACHE_MAX_BYTES,
+        touch_batch_size: int = 256
+    ):
+        if not table.isidentifier():
+            raise ValueError(f"Invalid cache table name: {table!r}")
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.table = table
+        self.max_bytes = max_bytes
+        self.touch_batch_size = touch_batch_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._touched: dict[str, float] = {}
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        # in WAL mode NORMAL only syncs at checkpoints and stays crash-safe
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, "
+            "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._connection.execute(f"CREATE INDEX IF NOT EXISTS {table}_accessed_at ON {table} (accessed_at)")
+        self._size = self._connection.execute(f"SELECT COALESCE(SUM(size), 0) FROM {table}").fetchone()[0]
+
+    def get(self, key: str, max_age: float | None = None) -> str | None:
+        """Return the value stored under `key`, or ``None`` on a miss.
+
+        Blocks on SQLite; use `aget` from a coroutine.
+
+        Args:
+            key: Cache key.
+            max_age: Optional age in seconds after which an entry counts as
+                a miss and is dropped.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                f"SELECT value, size, created_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and max_age is not None and time.time() - row[2] > max_age:
+                self._connection.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                self._touched.pop(key, None)
+                self._size -= row[1]
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._touched[key] = time.time()
+            if len(self._touched) >= self.touch_batch_size:
+                with self._transaction():
+                    self._write_touches()
+            return row[0]
+
+    def set(self, key: str, value: str):
+        """Store `value` under `key`, evicting old entries to stay in budget.
+
+        Blocks on SQLite; use `aset` from a coroutine.
+        """
+        size = len(value.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        now = time.time()
+        with self._lock, self._transaction():
+            self._write_touches()
+            previous = self._connection.execute(
+                f"SELECT size FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+            self._connection.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, size, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, value, size, now, now)
+            )
+            self._size += size - (previous[0] if previous else 0)
+            if self._size > self.max_bytes:
+                self._evict()
+
+    async def aget(self, key: str, max_age: float | None = None) -> str | None:
+        """`get` run on a worker thread."""
+        return await asyncio.to_thread(self.get, key, max_age)
+
+    async def aset(self, key: str, value: str):
+        """`set` run on a worker thread."""
+        await asyncio.to_thread(self.set, key, value)
+
+    @contextmanager
+    def _transaction(self) -> Iterator[None]:
+        # The connection is in autocommit mode; group statements so they
+        # cost a single commit.
+        self._connection.execute("BEGIN")
+        try:
+            yield
+        except BaseException:
+            self._connection.execute("ROLLBACK")
+            raise
+        self._connection.execute("COMMIT")
+
+    def _write_touches(self):
+        if self._touched:
+            self._connection.executemany(
+                f"UPDATE {self.table} SET accessed_at = ? WHERE key = ?",
+                [(accessed_at, key) for key, accessed_at in self._touched.items()]
+            )
+            self._touched.clear()
+
+    def _evict(self):
+        # Drop least recently used entries until the cache is back under 90%
+        # of its budget, so eviction does not run on every insert.
+        target = self.max_bytes * 0.9
+        rows = self._connection.execute(
+            f"SELECT key, size FROM {self.table} ORDER BY accessed_at"
+        ).fetchall()
+        evicted = []
+        for key, size in rows:
+            if self._size <= target:
+                break
+            evicted.append((key,))
+            self._size -= size
+        self._connection.executemany(f"DELETE FROM {self.table} WHERE key = ?", evicted)
+        self.evictions += len(evicted)
+
+    def clear(self):
+        with self._lock:
+            self._connection.execute(f"DELETE FROM {self.table}")
+            self._touched.clear()
+            self._size = 0
+
+    def stats(self) -> dict[str, int | float]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "size_bytes": self._size,
+            "max_bytes": self.max_bytes
+        }
+
+    def close(self):
+        with self._lock:
+            if self._touched:
+                with self._transaction():
+                    self._write_touches()
+            self._connection.close()
+
+
+class ResultCache:
+    """LRU+TTL cache of async results with single-flight request coalescing.
+
+    `get_or_compute` returns a cached result when there is one; otherwise the
+    first caller for a key starts the computation in its own task and
+    concurrent callers with the same key await that same task. Callers await
+    it through `asyncio.shield`, so a cancelled caller (e.g. a disconnected
+    client) leaves the computation running for the others. `invalidate`
+    drops every entry and detaches computations that are still running:
+    later callers start a fresh one, and the detached results are not
+    cached.
+
+    Args:
+        max_entries: Results kept before the least recently used is dropped.
+        ttl: Seconds a result stays valid.
+    """
+
+    def __init__(self, max_entries: int = RESULT_CACHE_SIZE, ttl: float = RESULT_CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.coalesced = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._generation = 0
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._in_flight: dict[str, asyncio.Task] = {}
+
+    async def get_or_compute(self, key: str, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the result for `key`, running `compute()` at most once at a time."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, result = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return result
+            del self._entries[key]
+        task = self._in_flight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            task = asyncio.create_task(self._compute(key, compute, self._generation))
+            # mark a failure as retrieved even if every caller went away
+            task.add_done_callback(lambda done: done.cancelled() or done.exception())
+            self._in_flight[key] = task
+        return await asyncio.shield(task)
+
+    async def _compute(self, key: str, compute: Callable[[], Awaitable[Any]], generation: int) -> Any:
+        try:
+            result = await compute()
+        finally:
+            if self._in_flight.get(key) is asyncio.current_task():
+                del self._in_flight[key]
+        if generation == self._generation:
+            self._entries[key] = (time.monotonic() + self.ttl, result)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return result
+
+    def invalidate(self):
+        """Drop all cached results, e.g. after scenes were added or removed."""
+        self._generation += 1
+        self._entries.clear()
+        self._in_flight.clear()
+        self.invalidations += 1
+
+    def stats(self) -> dict[str, int | float]:
+        lookups = self.hits + self.coalesced + self.misses
+        return {
+            "hits": self.hits,
+            "coalesced": self.coalesced,
+            "misses": self.misses,
+            "hit_rate": (self.hits + self.coalesced) / lookups if lookups else 0.0,
+            "entries": len(self._entries),
+            "invalidations": self.invalidations
+        }
+
+
+_llm_cache: SQLiteCache | None = None
+
+
+def get_llm_cache() -> SQLiteCache | None:
+    """Return the process-wide structured-response cache.
+
+    Returns ``None`` when `LLM_CACHE_PATH` is unset, which disables caching.
+    """
+    global _llm_cache
+    if _llm_cache is None and LLM_CACHE_PATH:
+        _llm_cache = SQLiteCache(LLM_CACHE_PATH, table="llm_responses")
+    return _llm_cache
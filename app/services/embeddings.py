@@ -1,5 +1,221 @@
 """Embeddings service helpers.
 
-Placeholder module for embedding-related helper functions and wrappers.
+Wraps the OpenAI embeddings endpoint with a request batcher: individual
+`embed` calls are collected into one array request, bounded by an input
+count and an estimated token budget, and flushed when either limit is
+reached or a short timer expires. Each caller gets back the vector for its
+own text.
+
+Query embeddings are cached by `QueryEmbeddingCache`, so repeated searches
+skip the embeddings round trip.
+
+Namespaces can be configured to store shortened embeddings
+(`EMBEDDING_DIMENSIONS`); `dimensions_for` resolves the size to request so
+scene and query vectors of a namespace always match.
+
+Classes:
+    BatchEmbedder: Coalesces concurrent embedding requests into batches.
+    QueryEmbeddingCache: LRU+TTL cache of query embeddings with an optional
+        persistent tier.
+
+Functions:
+    dimensions_for(namespace): Embedding size configured for a namespace.
 """
 
+import json
+import time
+import asyncio
+from collections import OrderedDict
+from openai import AsyncOpenAI
+from core.config import (
+    EMBEDDING_BATCH_SIZE,
+    EMBEDDING_BATCH_MAX_TOKENS,
+    EMBEDDING_BATCH_MAX_WAIT,
+    QUERY_EMBEDDING_CACHE_SIZE,
+    QUERY_EMBEDDING_CACHE_TTL,
+    EMBEDDING_DIMENSIONS
+)
+from services.cache import SQLiteCache, make_cache_key
+from services.llms import create_embeddings, estimate_tokens
+
+
+class BatchEmbedder:
+    """Collect embedding requests and send them as array requests.
+
+    Args:
+        ai_client: Shared async OpenAI client.
+        model: Embedding model name.
+        max_batch_size: Maximum number of inputs per request.
+        max_batch_tokens: Maximum estimated tokens per request.
+        max_wait: Seconds to wait for more inputs before flushing a
+            partially filled batch.
+        dimensions: Optional shortened embedding size.
+    """
+
+    def __init__(
+        self,
+        ai_client: AsyncOpenAI,
+        model: str,
+        max_batch_size: int = EMBEDDING_BATCH_SIZE,
+        max_batch_tokens: int = EMBEDDING_BATCH_MAX_TOKENS,
+        max_wait: float = EMBEDDING_BATCH_MAX_WAIT,
+        dimensions: int | None = None
+    ):
+        self.ai_client = ai_client
+        self.model = model
+        self.dimensions = dimensions
+        self.max_batch_size = max_batch_size
+        self.max_batch_tokens = max_batch_tokens
+        self.max_wait = max_wait
+        self.requests_sent = 0
+        self._pending: list[tuple[str, asyncio.Future]] = []
+        self._pending_tokens = 0
+        self._timer: asyncio.TimerHandle | None = None
+        self._in_flight: set[asyncio.Task] = set()
+
+    async def embed(self, text: str) -> list[float]:
+        """Return the embedding for `text`, batched with concurrent callers."""
+        tokens = estimate_tokens(text)
+        if self._pending and self._pending_tokens + tokens > self.max_batch_tokens:
+            self._flush()
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((text, future))
+        self._pending_tokens += tokens
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.max_wait, self._flush)
+        return await future
+
+    async def embed_many(self, texts: list[str]) -> list[list[float]]:
+        """Embed several texts, preserving their order."""
+        return list(await asyncio.gather(*(self.embed(text) for text in texts)))
+
+    async def aclose(self):
+        """Flush anything pending and wait for in-flight requests."""
+        self._flush()
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight, return_exceptions=True)
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        batch, self._pending, self._pending_tokens = self._pending, [], 0
+        task = asyncio.get_running_loop().create_task(self._send(batch))
+        self._in_flight.add(task)
+        task.add_done_callback(self._in_flight.discard)
+
+    async def _send(self, batch: list[tuple[str, asyncio.Future]]):
+        try:
+            self.requests_sent += 1
+            response = await create_embeddings(
+                ai_client=self.ai_client,
+                model=self.model,
+                inputs=[text for text, _ in batch],
+                dimensions=self.dimensions
+            )
+            embeddings = sorted(response.data, key=lambda embedding: embedding.index)
+            if len(embeddings) != len(batch):
+                raise ValueError(f"Expected {len(batch)} embeddings, got {len(embeddings)}.")
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), embedding in zip(batch, embeddings):
+            if not future.done():
+                future.set_result(embedding.embedding)
+
+
+def dimensions_for(namespace: str) -> int | None:
+    """Return the embedding size configured for `namespace`, or ``None`` for the model default."""
+    return EMBEDDING_DIMENSIONS.get(namespace)
+
+
+def normalize_query(text: str) -> str:
+    """Case-fold and collapse whitespace so trivially different queries share a key."""
+    return " ".join(text.split()).casefold()
+
+
+class QueryEmbeddingCache:
+    """In-memory LRU cache of query embeddings with per-entry expiry.
+
+    Entries are keyed on the embedding model, the requested dimensions and
+    the normalized query text.
+    Misses in memory fall through to the optional `persistent` tier, so a
+    restart does not start cold; entries found there are promoted back into
+    memory.
+
+    Args:
+        max_entries: Embeddings kept in memory before the least recently
+            used one is dropped.
+        ttl: Seconds an entry stays valid in either tier.
+        persistent: Optional `SQLiteCache` used as the second tier.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = QUERY_EMBEDDING_CACHE_SIZE,
+        ttl: float = QUERY_EMBEDDING_CACHE_TTL,
+        persistent: SQLiteCache | None = None
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.persistent = persistent
+        self.hits = 0
+        self.persistent_hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, tuple[float, list[float]]] = OrderedDict()
+
+    @staticmethod
+    def key(query: str, model: str, dimensions: int | None = None) -> str:
+        if dimensions is None:
+            return make_cache_key(model, normalize_query(query))
+        return make_cache_key(model, dimensions, normalize_query(query))
+
+    async def get(self, query: str, model: str, dimensions: int | None = None) -> list[float] | None:
+        """Return the cached embedding of `query`, or ``None`` on a miss."""
+        key = self.key(query, model, dimensions)
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, embedding = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return embedding
+            del self._entries[key]
+        if self.persistent is not None:
+            stored = await self.persistent.aget(key, max_age=self.ttl)
+            if stored is not None:
+                embedding = json.loads(stored)
+                self._remember(key, embedding)
+                self.persistent_hits += 1
+                return embedding
+        self.misses += 1
+        return None
+
+    async def set(self, query: str, model: str, embedding: list[float], dimensions: int | None = None):
+        key = self.key(query, model, dimensions)
+        self._remember(key, embedding)
+        if self.persistent is not None:
+            await self.persistent.aset(key, json.dumps(embedding))
+
+    def _remember(self, key: str, embedding: list[float]):
+        self._entries[key] = (time.monotonic() + self.ttl, embedding)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> dict[str, int | float]:
+        lookups = self.hits + self.persistent_hits + self.misses
+        return {
+            "hits": self.hits,
+            "persistent_hits": self.persistent_hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits + self.persistent_hits) / lookups if lookups else 0.0,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries
+        }
@@ -1,5 +1,238 @@
 """LLM service helpers.
 
-Placeholder for LLM-specific helper functions and wrappers.
+Async wrappers around the OpenAI API used by the rest of the application.
+Every call goes through `with_retries`, which applies a per-call timeout and
+retries rate-limit (429), timeout/conflict and server (5xx) errors with
+exponential backoff and full jitter. Each attempt also passes through the
+shared per-model `RateLimiter` (see `services.rate_limits`), which is fed the
+provider's rate-limit headers and backs off on 429s. The `AsyncOpenAI`
+client itself is created with its built-in retries disabled and a pooled
+HTTP client (see `core.clients.init_openai_client`), so no request ever
+blocks the event loop. Structured responses can be served from a persistent
+`SQLiteCache` keyed on the model, messages and output schema.
+
+Functions:
+    estimate_tokens(text): Conservative token estimate for budgeting.
+    with_retries(call): Await an OpenAI call with timeout-aware retries.
+    parse_structured(...): Structured-output request returning a pydantic model.
+    create_embeddings(...): Embeddings request for one or many inputs.
 """
 
+import random
+import asyncio
+from typing import Any, Awaitable, Callable, TypeVar
+import openai
+from openai import AsyncOpenAI
+from pydantic import BaseModel
+from core.config import (
+    LLM_TIMEOUT,
+    LLM_MAX_RETRIES,
+    LLM_RETRY_BASE_DELAY,
+    LLM_RETRY_MAX_DELAY,
+    LLM_EXPECTED_OUTPUT_TOKENS
+)
+from services.cache import SQLiteCache, make_cache_key
+from services.rate_limits import RateLimiter, get_rate_limiter
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+RETRYABLE_STATUS_CODES = {408, 409, 429}
+
+
+class StructuredOutputError(Exception):
+    """Raised when a structured response has no parsed output.
+
+    This happens when the model refuses, or its output is cut short or does
+    not match the requested schema.
+
+    Attributes:
+        refusal: The model's refusal message, if it gave one.
+    """
+
+    def __init__(self, model: str, text_format: str, refusal: str | None = None, reason: str | None = None):
+        self.refusal = refusal
+        if refusal:
+            detail = f"the model refused: {refusal}"
+        elif reason:
+            detail = f"the response is incomplete ({reason})"
+        else:
+            detail = "the output could not be parsed"
+        super().__init__(f"{model} returned no {text_format}: {detail}")
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap, conservative token estimate used for batching and rate limits.
+
+    English text averages about four characters per token; three is used so
+    the estimate errs on the high side.
+    """
+    return len(text) // 3 + 1
+
+
+def refusal_text(response: Any) -> str | None:
+    """Return the refusal message of a Responses API response, if any."""
+    refusals = [
+        content.refusal
+        for item in getattr(response, "output", None) or []
+        for content in getattr(item, "content", None) or []
+        if getattr(content, "type", None) == "refusal"
+    ]
+    return "\n".join(refusals) or None
+
+
+def is_retryable(error: Exception) -> bool:
+    """Return whether an OpenAI error is worth retrying."""
+    if isinstance(error, openai.APIConnectionError):  # includes timeouts
+        return True
+    if isinstance(error, openai.APIStatusError):
+        return error.status_code in RETRYABLE_STATUS_CODES or error.status_code >= 500
+    return False
+
+
+def backoff_delay(attempt: int, error: Exception | None = None) -> float:
+    """Full-jitter exponential backoff, honouring a ``retry-after`` header."""
+    response = getattr(error, "response", None)
+    retry_after = response.headers.get("retry-after") if response is not None else None
+    if retry_after:
+        try:
+            return min(float(retry_after), LLM_RETRY_MAX_DELAY)
+        except ValueError:
+            pass
+    return random.uniform(0, min(LLM_RETRY_MAX_DELAY, LLM_RETRY_BASE_DELAY * 2 ** attempt))
+
+
+async def with_retries(
+    call: Callable[[], Awaitable[Any]],
+    max_retries: int = LLM_MAX_RETRIES,
+    limiter: RateLimiter | None = None,
+    tokens: int = 1
+) -> Any:
+    """Await `call()`, retrying transient OpenAI failures.
+
+    When a `limiter` is given, `call` must return a raw response (from the
+    SDK's ``with_raw_response`` accessors) so its rate-limit headers can be
+    read; the parsed body is returned.
+
+    Args:
+        call: Zero-argument coroutine factory issuing a single request.
+        max_retries: Retries after the first attempt.
+        limiter: Optional shared rate limiter each attempt must pass.
+        tokens: Estimated tokens consumed by one attempt.
+
+    Returns:
+        The result of the first successful call.
+
+    Raises:
+        openai.OpenAIError: The last error once retries are exhausted, or
+            immediately for non-retryable errors.
+    """
+    attempt = 0
+    while True:
+        try:
+            if limiter is None:
+                return await call()
+            async with limiter.acquire(tokens):
+                try:
+                    raw_response = await call()
+                except openai.APIStatusError as e:
+                    limiter.update_from_headers(e.response.headers)
+                    if e.status_code == 429:
+                        limiter.on_rate_limited(e.response.headers)
+                    raise
+            limiter.update_from_headers(raw_response.headers)
+            limiter.on_success()
+            return raw_response.parse()
+        except openai.OpenAIError as e:
+            if attempt >= max_retries or not is_retryable(e):
+                raise
+            await asyncio.sleep(backoff_delay(attempt, e))
+            attempt += 1
+
+
+async def parse_structured(
+    ai_client: AsyncOpenAI,
+    model: str,
+    messages: list[dict[str, str]],
+    text_format: type[ModelT],
+    timeout: float = LLM_TIMEOUT,
+    cache: SQLiteCache | None = None
+) -> ModelT:
+    """Request a structured response and return it as `text_format`.
+
+    Args:
+        ai_client: Shared `AsyncOpenAI` client.
+        model: Chat model name.
+        messages: Input messages (``role``/``content`` dicts).
+        text_format: Pydantic model the response must conform to.
+        timeout: Per-attempt timeout in seconds.
+        cache: Optional response cache. Responses are stored as JSON under
+            a hash of the model, the messages and `text_format`'s name.
+
+    Returns:
+        The parsed pydantic model instance.
+
+    Raises:
+        StructuredOutputError: If the response has no parsed output, e.g.
+            the model refused; the refusal text is included.
+    """
+    cache_key = None
+    if cache is not None:
+        cache_key = make_cache_key(model, messages, text_format.__name__)
+        cached = await cache.aget(cache_key)
+        if cached is not None:
+            return text_format.model_validate_json(cached)
+    prompt_tokens = sum(estimate_tokens(message["content"]) for message in messages)
+    response = await with_retries(
+        lambda: ai_client.responses.with_raw_response.parse(
+            model=model,
+            input=messages,
+            text_format=text_format,
+            timeout=timeout
+        ),
+        limiter=get_rate_limiter(model),
+        tokens=prompt_tokens + LLM_EXPECTED_OUTPUT_TOKENS
+    )
+    parsed = response.output_parsed
+    if parsed is None:
+        incomplete = getattr(response, "incomplete_details", None)
+        raise StructuredOutputError(
+            model,
+            text_format.__name__,
+            refusal=refusal_text(response),
+            reason=getattr(incomplete, "reason", None)
+        )
+    if cache_key is not None:
+        await cache.aset(cache_key, parsed.model_dump_json())
+    return parsed
+
+
+async def create_embeddings(
+    ai_client: AsyncOpenAI,
+    model: str,
+    inputs: str | list[str],
+    timeout: float = LLM_TIMEOUT,
+    dimensions: int | None = None
+) -> Any:
+    """Request embeddings for one or many inputs.
+
+    Args:
+        dimensions: Optional shortened output size; supported by the
+            ``text-embedding-3`` models.
+
+    Returns:
+        The raw embeddings response; ``data`` holds one item per input with
+        its ``index`` and ``embedding``.
+    """
+    texts = [inputs] if isinstance(inputs, str) else inputs
+    options = {"dimensions": dimensions} if dimensions is not None else {}
+    return await with_retries(
+        lambda: ai_client.embeddings.with_raw_response.create(
+            model=model,
+            input=inputs,
+            encoding_format="float",
+            timeout=timeout,
+            **options
+        ),
+        limiter=get_rate_limiter(model),
+        tokens=sum(estimate_tokens(text) for text in texts)
+    )
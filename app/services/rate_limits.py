@@ -0,0 +1,201 @@
+"""Adaptive client-side rate limiting for OpenAI requests.
+
+`RateLimiter` combines two token buckets (requests per minute and tokens per
+minute) with an AIMD concurrency window. Callers wrap each request in
+`acquire`, which waits until both buckets can cover the request and a
+concurrency slot is free. After each response the limiter re-syncs the
+buckets from the provider's ``x-ratelimit-*`` headers; successful requests
+grow the window additively and 429 responses halve it.
+
+One limiter exists per model and is shared by every caller in the process
+(see `get_rate_limiter`), so ingestion and query traffic draw on the same
+quota.
+
+Classes:
+    TokenBucket: Continuously refilling per-minute budget.
+    RateLimiter: RPM/TPM-aware limiter with an adaptive concurrency window.
+"""
+
+import re
+import time
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Mapping
+from core.config import (
+    OPENAI_REQUESTS_PER_MINUTE,
+    OPENAI_TOKENS_PER_MINUTE,
+    OPENAI_MAX_CONCURRENCY,
+    OPENAI_MIN_CONCURRENCY
+)
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def parse_reset_duration(value: str | None) -> float | None:
+    """Parse reset durations such as ``"1s"``, ``"6m0s"`` or ``"20ms"``."""
+    if not value:
+        return None
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in parts)
+
+
+class TokenBucket:
+    """Budget of `capacity` units that refills linearly over one minute.
+
+    Args:
+        capacity: Units available per minute.
+    """
+
+    def __init__(self, capacity: float):
+        self.capacity = float(capacity)
+        self.available = float(capacity)
+        self._updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.available = min(self.capacity, self.available + (now - self._updated) * self.capacity / 60.0)
+        self._updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until `amount` units are available (0 when they are now)."""
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self.available >= amount:
+            return 0.0
+        return (amount - self.available) * 60.0 / self.capacity
+
+    def consume(self, amount: float):
+        self._refill()
+        self.available -= min(amount, self.capacity)
+
+    def sync(self, limit: float | None, remaining: float | None):
+        """Align the bucket with limits reported by the provider."""
+        self._refill()
+        if limit:
+            self.capacity = float(limit)
+        if remaining is not None:
+            self.available = min(self.available, float(remaining), self.capacity)
+
+
+class RateLimiter:
+    """Requests/tokens-per-minute limiter with an AIMD concurrency window.
+
+    Args:
+        requests_per_minute: Initial request budget; replaced by the
+            ``x-ratelimit-limit-requests`` header once seen.
+        tokens_per_minute: Initial token budget; replaced by the
+            ``x-ratelimit-limit-tokens`` header once seen.
+        max_concurrency: Upper bound of the concurrency window.
+        min_concurrency: Lower bound of the concurrency window.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float = OPENAI_REQUESTS_PER_MINUTE,
+        tokens_per_minute: float = OPENAI_TOKENS_PER_MINUTE,
+        max_concurrency: int = OPENAI_MAX_CONCURRENCY,
+        min_concurrency: int = OPENAI_MIN_CONCURRENCY
+    ):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.concurrency_limit = float(max_concurrency)
+        self.in_flight = 0
+        self.rate_limited = 0
+        self._blocked_until = 0.0
+        self._condition: asyncio.Condition | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    @property
+    def condition(self) -> asyncio.Condition:
+        # The limiter outlives event loops (e.g. in tests or CLI runs), so the
+        # condition is rebuilt for whichever loop is using it.
+        loop = asyncio.get_running_loop()
+        if self._condition is None or self._loop is not loop:
+            self._condition = asyncio.Condition()
+            self._loop = loop
+        return self._condition
+
+    @asynccontextmanager
+    async def acquire(self, tokens: int = 1) -> AsyncIterator[None]:
+        """Hold a request slot covering `tokens` estimated tokens."""
+        async with self.condition:
+            while True:
+                if self.in_flight < max(self.min_concurrency, int(self.concurrency_limit)):
+                    delay = max(
+                        self._blocked_until - time.monotonic(),
+                        self.requests.wait_time(1),
+                        self.tokens.wait_time(tokens)
+                    )
+                    if delay <= 0:
+                        break
+                    try:
+                        await asyncio.wait_for(self.condition.wait(), timeout=delay)
+                    except TimeoutError:
+                        pass
+                else:
+                    await self.condition.wait()
+            self.requests.consume(1)
+            self.tokens.consume(tokens)
+            self.in_flight += 1
+        try:
+            yield
+        finally:
+            async with self.condition:
+                self.in_flight -= 1
+                self.condition.notify_all()
+
+    def update_from_headers(self, headers: Mapping[str, str]):
+        """Re-sync both buckets from ``x-ratelimit-*`` response headers."""
+
+        def number(name: str) -> float | None:
+            value = headers.get(name)
+            try:
+                return float(value) if value is not None else None
+            except ValueError:
+                return None
+
+        self.requests.sync(number("x-ratelimit-limit-requests"), number("x-ratelimit-remaining-requests"))
+        self.tokens.sync(number("x-ratelimit-limit-tokens"), number("x-ratelimit-remaining-tokens"))
+
+    def on_success(self):
+        """Additive increase: grow the window by one slot per full window."""
+        self.concurrency_limit = min(
+            float(self.max_concurrency),
+            self.concurrency_limit + 1.0 / max(self.concurrency_limit, 1.0)
+        )
+
+    def on_rate_limited(self, headers: Mapping[str, str] | None = None):
+        """Multiplicative decrease after a 429; pause until the reported reset."""
+        self.rate_limited += 1
+        self.concurrency_limit = max(float(self.min_concurrency), self.concurrency_limit / 2)
+        if headers is not None:
+            reset = max(
+                parse_reset_duration(headers.get("x-ratelimit-reset-requests")) or 0.0,
+                parse_reset_duration(headers.get("x-ratelimit-reset-tokens")) or 0.0
+            )
+            if reset:
+                self._blocked_until = max(self._blocked_until, time.monotonic() + reset)
+
+    def stats(self) -> dict[str, float]:
+        return {
+            "concurrency_limit": self.concurrency_limit,
+            "in_flight": self.in_flight,
+            "rate_limited": self.rate_limited,
+            "requests_available": self.requests.available,
+            "tokens_available": self.tokens.available
+        }
+
+
+_limiters: dict[str, RateLimiter] = {}
+
+
+def get_rate_limiter(model: str) -> RateLimiter:
+    """Return the process-wide limiter for `model`, creating it on first use."""
+    if model not in _limiters:
+        _limiters[model] = RateLimiter()
+    return _limiters[model]
@@ -0,0 +1,149 @@
+"""Lexical scene search over the SQLite FTS5 index and rank fusion.
+
+Every ingested scene's embedding text is written to the ``scene_fts``
+virtual table (see `models.db.scenes`) in the same transaction as its SQL
+backfill. `search_scene_texts` ranks scenes with BM25, which finds quoted
+dialogue and character names that embeddings of the AI summary miss, and
+`reciprocal_rank_fusion` merges that ranking with the vector ranking.
+Queries run on the async engine, so they do not block the event loop.
+
+Functions:
+    index_scene_texts(rows, session): Insert or replace scenes in the index.
+    delete_scene_texts(screenplay_id, session): Drop a screenplay's scenes.
+    build_match_query(user_query): Safe FTS5 MATCH expression for free text.
+    search_scene_texts(engine, user_query, top_k, ...): Filtered BM25 search.
+    reciprocal_rank_fusion(rankings, k): Fuse several ranked id lists.
+"""
+
+import re
+from typing import Any
+from sqlalchemy import bindparam, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlmodel.ext.asyncio.session import AsyncSession
+from core.config import PINECONE_NAMESPACE, RRF_K
+from models.db.scenes import SCENE_FTS_TABLE
+
+_WORD = re.compile(r"\w+")
+_QUOTED = re.compile(r"[\"“”']([^\"“”']{3,})[\"“”']")
+
+
+async def index_scene_texts(rows: list[dict[str, Any]], session: AsyncSession):
+    """Insert or replace scenes in the full-text index; the caller commits.
+
+    Args:
+        rows: Dicts with ``scene_id``, ``screenplay_id``, ``scene_number``,
+            ``vector_id``, ``namespace`` and ``embedding_text``.
+        session: Session of the surrounding transaction.
+    """
+    if not rows:
+        return
+    await session.exec(
+        text(f"DELETE FROM {SCENE_FTS_TABLE} WHERE scene_id IN :scene_ids")
+        .bindparams(bindparam("scene_ids", expanding=True)),
+        params={"scene_ids": [row["scene_id"] for row in rows]}
+    )
+    await session.exec(
+        text(
+            f"INSERT INTO {SCENE_FTS_TABLE} "
+            "(embedding_text, scene_id, screenplay_id, scene_number, vector_id, namespace) "
+            "VALUES (:embedding_text, :scene_id, :screenplay_id, :scene_number, :vector_id, :namespace)"
+        ),
+        params=rows
+    )
+
+
+async def delete_scene_texts(screenplay_id: int, session: AsyncSession):
+    """Remove a screenplay's scenes from the full-text index; the caller commits."""
+    await session.exec(
+        text(f"DELETE FROM {SCENE_FTS_TABLE} WHERE screenplay_id = :screenplay_id"),
+        params={"screenplay_id": screenplay_id}
+    )
+
+
+def build_match_query(user_query: str) -> str | None:
+    """Turn free text into an FTS5 MATCH expression.
+
+    Every word becomes a quoted term joined with OR, so BM25 ranks scenes by
+    how many and how rare the matching words are; quoted passages in the
+    query are added as phrases so exact dialogue ranks first. Quoting keeps
+    FTS5 operators in user input from being interpreted.
+
+    Returns:
+        The expression, or ``None`` if the query has no searchable words.
+    """
+    terms = [f'"{word}"' for word in dict.fromkeys(word.lower() for word in _WORD.findall(user_query))]
+    phrases = [
+        '"' + " ".join(_WORD.findall(phrase)) + '"'
+        for phrase in _QUOTED.findall(user_query)
+        if len(_WORD.findall(phrase)) > 1
+    ]
+    if not terms:
+        return None
+    return " OR ".join(phrases + terms)
+
+
+async def search_scene_texts(
+    engine: AsyncEngine,
+    user_query: str,
+    top_k: int,
+    namespace: str = PINECONE_NAMESPACE,
+    screenplay_ids: list[int] | None = None,
+    story_beats: list[str] | None = None,
+    progress_min: float | None = None,
+    progress_max: float | None = None
+) -> list[dict[str, Any]]:
+    """Return up to `top_k` scenes ranked by BM25, best first.
+
+    Beat and progress filters join the ``scene`` table. Runs on its own
+    connection so it can run concurrently with the request's session.
+    """
+    match_query = build_match_query(user_query)
+    if match_query is None or screenplay_ids == []:
+        return []
+    conditions = [f"{SCENE_FTS_TABLE} MATCH :match", f"{SCENE_FTS_TABLE}.namespace = :namespace"]
+    params: dict[str, Any] = {"match": match_query, "namespace": namespace, "limit": top_k}
+    if screenplay_ids is not None:
+        conditions.append(f"{SCENE_FTS_TABLE}.screenplay_id IN :screenplay_ids")
+        params["screenplay_ids"] = screenplay_ids
+    if story_beats is not None:
+        conditions.append("scene.beat IN :story_beats")
+        params["story_beats"] = story_beats
+    if progress_min is not None:
+        conditions.append("scene.progress_num >= :progress_min")
+        params["progress_min"] = progress_min
+    if progress_max is not None:
+        conditions.append("scene.progress_num <= :progress_max")
+        params["progress_max"] = progress_max
+    join = ""
+    if any(value is not None for value in (story_beats, progress_min, progress_max)):
+        join = f"JOIN scene ON scene.id = {SCENE_FTS_TABLE}.scene_id "
+    query = text(
+        f"SELECT {SCENE_FTS_TABLE}.vector_id, {SCENE_FTS_TABLE}.scene_id, {SCENE_FTS_TABLE}.screenplay_id, "
+        f"{SCENE_FTS_TABLE}.scene_number, {SCENE_FTS_TABLE}.embedding_text "
+        f"FROM {SCENE_FTS_TABLE} {join}"
+        f"WHERE {' AND '.join(conditions)} "
+        f"ORDER BY bm25({SCENE_FTS_TABLE}) LIMIT :limit"
+    )
+    for name in ("screenplay_ids", "story_beats"):
+        if name in params:
+            query = query.bindparams(bindparam(name, expanding=True))
+    async with engine.connect() as connection:
+        rows = (await connection.execute(query, params)).mappings().all()
+    return [dict(row) for row in rows]
+
+
+def reciprocal_rank_fusion(rankings: list[list[str]], k: int = RRF_K) -> list[str]:
+    """Fuse ranked id lists: each id scores ``sum(1 / (k + rank))``.
+
+    Args:
+        rankings: Lists of ids, best first.
+        k: Damping constant; larger values flatten the rank differences.
+
+    Returns:
+        All ids, ordered by fused score (ties keep first-seen order).
+    """
+    scores: dict[str, float] = {}
+    for ranking in rankings:
+        for rank, item_id in enumerate(ranking, start=1):
+            scores[item_id] = scores.get(item_id, 0.0) + 1.0 / (k + rank)
+    return sorted(scores, key=lambda item_id: -scores[item_id])
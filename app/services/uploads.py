@@ -0,0 +1,139 @@
+"""Streaming storage of uploaded files.
+
+`save_upload` copies an upload to disk in fixed-size chunks through async
+file I/O, so neither the whole file nor a blocking write ever sits on the
+event loop. The content is hashed while it streams, and the file is written
+under a temporary name in the target directory and renamed into place, so
+readers never see a partial file. `store_upload` does the same but names
+the file after its hash, which makes the storage directory a
+content-addressed store.
+
+Classes:
+    StoredFile: Path, SHA-256 and size of a stored upload.
+
+Functions:
+    save_upload(upload, destination): Stream an upload to `destination`.
+    store_upload(upload, directory): Stream an upload into the store.
+    content_path(directory, sha256): Store location of a digest.
+    file_sha256(path): SHA-256 of a file on disk, read in chunks.
+"""
+
+import os
+import uuid
+import hashlib
+from dataclasses import dataclass
+from pathlib import Path
+import anyio
+from fastapi import UploadFile
+from core.config import UPLOAD_CHUNK_SIZE
+
+
+@dataclass(frozen=True)
+class StoredFile:
+    """A file written by `save_upload`.
+
+    Attributes:
+        path: Final location of the file.
+        sha256: Hex digest of the content.
+        size: Content length in bytes.
+    """
+
+    path: Path
+    sha256: str
+    size: int
+
+
+async def _write_temporary(upload: UploadFile, directory: Path, chunk_size: int) -> tuple[Path, str, int]:
+    """Copy `upload` to a new temporary file in `directory`; return it with its SHA-256 and size."""
+    temporary = directory / f".upload.{uuid.uuid4().hex}.part"
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        async with await anyio.open_file(temporary, "wb") as stored:
+            while chunk := await upload.read(chunk_size):
+                digest.update(chunk)
+                size += len(chunk)
+                await stored.write(chunk)
+    except BaseException:
+        await _discard(temporary)
+        raise
+    return temporary, digest.hexdigest(), size
+
+
+async def _discard(temporary: Path):
+    with anyio.CancelScope(shield=True):
+        await anyio.Path(temporary).unlink(missing_ok=True)
+
+
+async def _move_into_place(temporary: Path, destination: Path):
+    try:
+        await anyio.to_thread.run_sync(os.replace, temporary, destination)
+    except BaseException:
+        await _discard(temporary)
+        raise
+
+
+def file_sha256(path: str | Path, chunk_size: int = UPLOAD_CHUNK_SIZE) -> str:
+    """Return the hex SHA-256 of a file, as `store_upload` would compute it."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as stored:
+        while chunk := stored.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def content_path(directory: Path, sha256: str, suffix: str = ".pdf") -> Path:
+    """Return where `store_upload` keeps a file with this digest."""
+    return directory / f"{sha256}{suffix}"
+
+
+async def save_upload(
+    upload: UploadFile,
+    destination: Path,
+    chunk_size: int = UPLOAD_CHUNK_SIZE
+) -> StoredFile:
+    """Stream `upload` to `destination`, hashing it on the way.
+
+    The data goes to a uniquely named temporary file next to `destination`
+    and is moved over it with an atomic rename once complete; on any error
+    the temporary file is removed and `destination` is left untouched.
+
+    Args:
+        upload: Incoming upload; read from its current position.
+        destination: Final file path. Its directory must exist.
+        chunk_size: Bytes read and written per step.
+
+    Returns:
+        The stored file's path, SHA-256 and size.
+    """
+    temporary, sha256, size = await _write_temporary(upload, destination.parent, chunk_size)
+    await _move_into_place(temporary, destination)
+    return StoredFile(path=destination, sha256=sha256, size=size)
+
+
+async def store_upload(
+    upload: UploadFile,
+    directory: Path,
+    suffix: str = ".pdf",
+    chunk_size: int = UPLOAD_CHUNK_SIZE
+) -> StoredFile:
+    """Stream `upload` into the content-addressed store in `directory`.
+
+    Like `save_upload`, but the file is named after its SHA-256 (see
+    `content_path`), so identical uploads share one file whatever their
+    original names. Renaming over an existing copy is harmless because the
+    content is the same.
+
+    Args:
+        upload: Incoming upload; read from its current position.
+        directory: Store directory. It must exist.
+        suffix: File extension of the stored file.
+        chunk_size: Bytes read and written per step.
+
+    Returns:
+        The stored file's path, SHA-256 and size.
+    """
+    temporary, sha256, size = await _write_temporary(upload, directory, chunk_size)
+    destination = content_path(directory, sha256, suffix)
+    await _move_into_place(temporary, destination)
+    return StoredFile(path=destination, sha256=sha256, size=size)
@@ -0,0 +1,626 @@
+"""Vector store services: a shared Pinecone index or a local index.
+
+`PineconeVectorStore` wraps a long-lived Pinecone index handle. The handle
+is created once at application startup (see `main.lifespan`) and reused for
+every write and query instead of building a new `IndexAsyncio` per scene or
+per request. Writes are split into chunks and sent concurrently with a cap
+on in-flight requests.
+
+`LocalVectorStore` implements the same interface in-process. Vectors are
+kept as L2-normalised float32 rows in an append-only, memory-mapped matrix
+file per namespace, next to a JSON-lines sidecar with ids and metadata.
+Queries are a brute-force matrix-vector product (cosine similarity), or,
+when IVF partitioning is enabled, a product over the rows of the closest
+partitions only. Metadata filters use Pinecone's filter syntax.
+
+With quantization enabled the scan runs over a float16 or int8 copy of the
+matrix (2x or 4x smaller), and only the best candidates are rescored against
+the float32 rows, which stay on disk and are paged in row by row.
+
+`VECTOR_STORE_BACKEND` selects the backend (see `main.lifespan`).
+
+Classes:
+    VectorStore: Protocol shared by both backends.
+    PineconeVectorStore: Upsert/query/fetch/delete against a shared Pinecone index.
+    LocalVectorStore: Upsert/query/fetch/delete against local memory-mapped files.
+"""
+
+import os
+import json
+import asyncio
+import threading
+from pathlib import Path
+from typing import Any, Protocol
+import numpy as np
+from pinecone.db_data.index_asyncio import IndexAsyncio
+from core.config import (
+    PINECONE_NAMESPACE,
+    PINECONE_UPSERT_BATCH_SIZE,
+    PINECONE_UPSERT_CONCURRENCY,
+    VECTOR_STORE_IVF_LISTS,
+    VECTOR_STORE_IVF_NPROBE,
+    VECTOR_STORE_QUANTIZATION,
+    VECTOR_STORE_RESCORE_MULTIPLIER
+)
+
+QUANTIZED_DTYPES = {"float16": np.float16, "int8": np.int8}
+SCAN_CHUNK_ROWS = 1024
+
+
+class VectorStore(Protocol):
+    """Operations the application needs from a vector store."""
+
+    async def upsert(self, vectors: list[dict[str, Any]], namespace: str = PINECONE_NAMESPACE) -> int: ...
+
+    async def query(
+        self,
+        vector: list[float],
+        top_k: int,
+        namespace: str = PINECONE_NAMESPACE,
+        filter: dict[str, Any] | None = None,
+        include_metadata: bool = True
+    ) -> dict[str, Any]: ...
+
+    async def fetch(self, ids: list[str], namespace: str = PINECONE_NAMESPACE) -> dict[str, list[float]]: ...
+
+    async def delete(
+        self,
+        ids: list[str] | None = None,
+        namespace: str = PINECONE_NAMESPACE,
+        filter: dict[str, Any] | None = None
+    ): ...
+
+
+class PineconeVectorStore:
+    """Batched access to a single Pinecone index.
+
+    Args:
+        index: Open `IndexAsyncio` handle; owned by the caller.
+        batch_size: Maximum vectors per upsert request.
+        max_concurrency: Maximum upsert requests in flight at once.
+    """
+
+    def __init__(
+        self,
+        index: IndexAsyncio,
+        batch_size: int = PINECONE_UPSERT_BATCH_SIZE,
+        max_concurrency: int = PINECONE_UPSERT_CONCURRENCY
+    ):
+        self.index = index
+        self.batch_size = batch_size
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.upsert_requests = 0
+
+    async def _upsert_chunk(self, vectors: list[dict[str, Any]], namespace: str) -> int:
+        async with self._semaphore:
+            self.upsert_requests += 1
+            await self.index.upsert(vectors=vectors, namespace=namespace)
+        return len(vectors)
+
+    async def upsert(self, vectors: list[dict[str, Any]], namespace: str = PINECONE_NAMESPACE) -> int:
+        """Upsert vectors in chunks of at most `batch_size`.
+
+        Args:
+            vectors: Records with ``id``, ``values`` and optional ``metadata``.
+            namespace: Target namespace.
+
+        Returns:
+            The number of vectors written.
+        """
+        chunks = [vectors[i:i + self.batch_size] for i in range(0, len(vectors), self.batch_size)]
+        written = await asyncio.gather(*(self._upsert_chunk(chunk, namespace) for chunk in chunks))
+        return sum(written)
+
+    async def query(
+        self,
+        vector: list[float],
+        top_k: int,
+        namespace: str = PINECONE_NAMESPACE,
+        filter: dict[str, Any] | None = None,
+        include_metadata: bool = True
+    ) -> dict[str, Any]:
+        """Return the `top_k` nearest vectors; the result has a ``matches`` key."""
+        return await self.index.query(
+            vector=vector,
+            top_k=top_k,
+            namespace=namespace,
+            filter=filter,
+            include_metadata=include_metadata
+        )
+
+    async def _fetch_chunk(self, ids: list[str], namespace: str) -> dict[str, list[float]]:
+        async with self._semaphore:
+            response = await self.index.fetch(ids=ids, namespace=namespace)
+        return {vector_id: list(vector.values) for vector_id, vector in response.vectors.items()}
+
+    async def fetch(self, ids: list[str], namespace: str = PINECONE_NAMESPACE) -> dict[str, list[float]]:
+        """Return the stored values of `ids`; unknown ids are left out."""
+        chunks = [ids[i:i + self.batch_size] for i in range(0, len(ids), self.batch_size)]
+        fetched = await asyncio.gather(*(self._fetch_chunk(chunk, namespace) for chunk in chunks))
+        return {vector_id: values for chunk in fetched for vector_id, values in chunk.items()}
+
+    async def delete(
+        self,
+        ids: list[str] | None = None,
+        namespace: str = PINECONE_NAMESPACE,
+        filter: dict[str, Any] | None = None
+    ):
+        """Delete vectors by id or by metadata filter."""
+        await self.index.delete(ids=ids, namespace=namespace, filter=filter)
+
+
+def matches_filter(metadata: dict[str, Any], filter: dict[str, Any]) -> bool:
+    """Evaluate a Pinecone-style metadata filter against `metadata`.
+
+    Supports ``$and``/``$or`` and the ``$eq``, ``$ne``, ``$gt``, ``$gte``,
+    ``$lt``, ``$lte``, ``$in``, ``$nin`` and ``$exists`` operators; a bare
+    value means ``$eq``.
+    """
+    for field_name, condition in filter.items():
+        if field_name == "$and":
+            if not all(matches_filter(metadata, clause) for clause in condition):
+                return False
+        elif field_name == "$or":
+            if not any(matches_filter(metadata, clause) for clause in condition):
+                return False
+        else:
+            value = metadata.get(field_name)
+            operators = condition if isinstance(condition, dict) else {"$eq": condition}
+            for operator, operand in operators.items():
+                if not _compare(value, operator, operand, field_name in metadata):
+                    return False
+    return True
+
+
+def _compare(value: Any, operator: str, operand: Any, present: bool) -> bool:
+    # Pinecone matches list-valued metadata if any element matches
+    values = value if isinstance(value, list) else [value]
+    if operator == "$exists":
+        return present == bool(operand)
+    if not present:
+        return operator in ("$ne", "$nin")
+    if operator == "$eq":
+        return operand in values
+    if operator == "$ne":
+        return operand not in values
+    if operator == "$in":
+        return any(item in operand for item in values)
+    if operator == "$nin":
+        return not any(item in operand for item in values)
+    try:
+        if operator == "$gt":
+            return value > operand
+        if operator == "$gte":
+            return value >= operand
+        if operator == "$lt":
+            return value < operand
+        if operator == "$lte":
+            return value <= operand
+    except TypeError:
+        return False
+    raise ValueError(f"Unsupported filter operator: {operator}")
+
+
+def quantize(rows: np.ndarray, quantization: str) -> tuple[np.ndarray, np.ndarray | None]:
+    """Return the quantized codes of unit-length `rows` and, for int8, per-row scales.
+
+    int8 codes are symmetric per row: ``row ~= codes * scale`` with the
+    largest component mapped to 127.
+    """
+    if quantization == "float16":
+        return rows.astype(np.float16), None
+    scales = np.abs(rows).max(axis=1) / 127
+    scales[scales == 0] = 1.0
+    codes = np.rint(rows / scales[:, None]).astype(np.int8)
+    return codes, scales.astype(np.float32)
+
+
+class _LocalNamespace:
+    """Files and in-memory state of one namespace of a `LocalVectorStore`.
+
+    ``vectors.f32`` holds the rows; ``records.jsonl`` logs upserts (id, row,
+    metadata) and deletions in write order and is replayed on open. Rows that
+    were deleted or overwritten stay in the matrix as dead rows until
+    `compact` rewrites both files. When quantized, ``codes.<quantization>``
+    (and ``scales.f32`` for int8) mirror the rows and are rebuilt from
+    ``vectors.f32`` whenever they are missing, stale or the setting changes.
+    """
+
+    def __init__(self, directory: Path, ivf_lists: int, nprobe: int, quantization: str, rescore_multiplier: int):
+        self.directory = directory
+        self.ivf_lists = ivf_lists
+        self.nprobe = nprobe
+        self.quantization = quantization
+        self.rescore_multiplier = rescore_multiplier
+        self.dimension: int | None = None
+        self.ids: list[str | None] = []
+        self.metadata: list[dict[str, Any] | None] = []
+        self.row_of: dict[str, int] = {}
+        self.alive = np.zeros(0, dtype=bool)
+        self.matrix: np.memmap | None = None
+        self.codes: np.memmap | None = None
+        self.scales: np.ndarray | None = None
+        self.centroids: np.ndarray | None = None
+        self.assignments = np.zeros(0, dtype=np.int32)
+        self._trained_on = 0
+        self._load()
+
+    @property
+    def vectors_path(self) -> Path:
+        return self.directory / "vectors.f32"
+
+    @property
+    def records_path(self) -> Path:
+        return self.directory / "records.jsonl"
+
+    @property
+    def header_path(self) -> Path:
+        return self.directory / "header.json"
+
+    def codes_path(self, quantization: str) -> Path:
+        return self.directory / f"codes.{quantization}"
+
+    @property
+    def scales_path(self) -> Path:
+        return self.directory / "scales.f32"
+
+    @property
+    def rows(self) -> int:
+        return len(self.ids)
+
+    @property
+    def live(self) -> int:
+        return len(self.row_of)
+
+    def _load(self):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        if not self.header_path.exists():
+            return
+        header = json.loads(self.header_path.read_text())
+        self.dimension = header["dimension"]
+        if self.records_path.exists():
+            with open(self.records_path, encoding="utf-8") as records:
+                for line in records:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        break  # torn final line from an interrupted write
+                    if record.get("deleted"):
+                        self._tombstone(record["id"])
+                    else:
+                        self._register(record["id"], record["row"], record.get("metadata") or {})
+        # Drop rows appended without a matching record (interrupted upsert).
+        row_bytes = self.dimension * 4
+        if self.vectors_path.exists() and self.vectors_path.stat().st_size > self.rows * row_bytes:
+            os.truncate(self.vectors_path, self.rows * row_bytes)
+        stored_quantization = header.get("quantization", "none")
+        if stored_quantization != self.quantization or not self._codes_complete():
+            self._rebuild_codes(stored_quantization)
+        self._remap()
+
+    def _write_header(self):
+        self.header_path.write_text(json.dumps({"dimension": self.dimension, "quantization": self.quantization}))
+
+    def _codes_complete(self) -> bool:
+        if self.quantization == "none":
+            return True
+        codes_path = self.codes_path(self.quantization)
+        itemsize = np.dtype(QUANTIZED_DTYPES[self.quantization]).itemsize
+        if not codes_path.exists() or codes_path.stat().st_size != self.rows * self.dimension * itemsize:
+            return False
+        return self.quantization != "int8" or (
+            self.scales_path.exists() and self.scales_path.stat().st_size == self.rows * 4
+        )
+
+    def _rebuild_codes(self, stored_quantization: str):
+        """Re-derive the quantized files from ``vectors.f32``."""
+        self.codes = None
+        self.scales = None
+        if stored_quantization in QUANTIZED_DTYPES:
+            self.codes_path(stored_quantization).unlink(missing_ok=True)
+        self.scales_path.unlink(missing_ok=True)
+        if self.quantization != "none" and self.rows:
+            matrix = np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(self.rows, self.dimension))
+            for start in range(0, self.rows, SCAN_CHUNK_ROWS):
+                self._append_codes(np.asarray(matrix[start:start + SCAN_CHUNK_ROWS]))
+            del matrix
+        self._write_header()
+
+    def _append_codes(self, rows: np.ndarray):
+        if self.quantization == "none":
+            return
+        codes, scales = quantize(rows, self.quantization)
+        with open(self.codes_path(self.quantization), "ab") as codes_file:
+            codes_file.write(codes.tobytes())
+        if scales is not None:
+            with open(self.scales_path, "ab") as scales_file:
+                scales_file.write(scales.tobytes())
+
+    def _register(self, vector_id: str, row: int, metadata: dict[str, Any]):
+        self._tombstone(vector_id)
+        while self.rows <= row:
+            self.ids.append(None)
+            self.metadata.append(None)
+        self.ids[row] = vector_id
+        self.metadata[row] = metadata
+        self.row_of[vector_id] = row
+
+    def _tombstone(self, vector_id: str):
+        row = self.row_of.pop(vector_id, None)
+        if row is not None:
+            self.ids[row] = None
+            self.metadata[row] = None
+
+    def _remap(self):
+        self.alive = np.array([vector_id is not None for vector_id in self.ids], dtype=bool)
+        self.codes = None
+        self.scales = None
+        if self.rows and self.dimension:
+            self.matrix = np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(self.rows, self.dimension))
+            if self.quantization != "none":
+                self.codes = np.memmap(
+                    self.codes_path(self.quantization),
+                    dtype=QUANTIZED_DTYPES[self.quantization],
+                    mode="r",
+                    shape=(self.rows, self.dimension)
+                )
+            if self.quantization == "int8":
+                self.scales = np.fromfile(self.scales_path, dtype=np.float32)
+        else:
+            self.matrix = None
+        if self.centroids is not None and len(self.assignments) < self.rows:
+            new_rows = np.asarray(self.matrix[len(self.assignments):])
+            self.assignments = np.concatenate([self.assignments, self._nearest_centroids(new_rows)])
+
+    def upsert(self, vectors: list[dict[str, Any]]) -> int:
+        if not vectors:
+            return 0
+        values = np.asarray([vector["values"] for vector in vectors], dtype=np.float32)
+        if values.ndim != 2:
+            raise ValueError("All vectors must have the same dimension.")
+        if self.dimension is None:
+            self.dimension = values.shape[1]
+            self._write_header()
+        if values.shape[1] != self.dimension:
+            raise ValueError(f"Expected {self.dimension}-dimensional vectors, got {values.shape[1]}.")
+        norms = np.linalg.norm(values, axis=1, keepdims=True)
+        values /= np.where(norms == 0, 1, norms)
+
+        first_row = self.rows
+        with open(self.vectors_path, "ab") as vectors_file:
+            vectors_file.write(values.tobytes())
+        self._append_codes(values)
+        with open(self.records_path, "a", encoding="utf-8") as records:
+            for offset, vector in enumerate(vectors):
+                metadata = vector.get("metadata") or {}
+                records.write(json.dumps({"id": vector["id"], "row": first_row + offset, "metadata": metadata}) + "\n")
+                self._register(vector["id"], first_row + offset, metadata)
+        self._remap()
+        if self.rows - self.live > max(self.live, 1024):
+            self.compact()
+        return len(vectors)
+
+    def fetch(self, ids: list[str]) -> dict[str, list[float]]:
+        # rows are stored normalised, which is all cosine similarity needs
+        return {
+            vector_id: self.matrix[self.row_of[vector_id]].tolist()
+            for vector_id in ids
+            if vector_id in self.row_of
+        }
+
+    def delete(self, ids: list[str] | None, filter: dict[str, Any] | None) -> int:
+        if ids is None and filter is None:
+            raise ValueError("Pass ids or a filter to delete.")
+        candidates = self.row_of.keys() & set(ids if ids is not None else self.row_of)
+        targets = {
+            vector_id for vector_id in candidates
+            if filter is None or matches_filter(self.metadata[self.row_of[vector_id]], filter)
+        }
+        if not targets:
+            return 0
+        with open(self.records_path, "a", encoding="utf-8") as records:
+            for vector_id in targets:
+                records.write(json.dumps({"id": vector_id, "deleted": True}) + "\n")
+                self._tombstone(vector_id)
+        self._remap()
+        return len(targets)
+
+    def query(
+        self,
+        vector: list[float],
+        top_k: int,
+        filter: dict[str, Any] | None,
+        include_metadata: bool
+    ) -> list[dict[str, Any]]:
+        if self.matrix is None or not self.live or top_k <= 0:
+            return []
+        query = np.asarray(vector, dtype=np.float32)
+        if query.shape != (self.dimension,):
+            raise ValueError(f"Expected a {self.dimension}-dimensional query vector.")
+        query /= np.linalg.norm(query) or 1.0
+
+        mask = self.alive.copy()
+        if filter:
+            mask &= np.array(
+                [metadata is not None and matches_filter(metadata, filter) for metadata in self.metadata],
+                dtype=bool
+            )
+        if self.ivf_lists:
+            self._maybe_train()
+        if self.centroids is not None:
+            probes = np.argsort(self.centroids @ query)[::-1][:self.nprobe]
+            mask &= np.isin(self.assignments, probes)
+        candidates = np.flatnonzero(mask)
+        if not len(candidates):
+            return []
+        if self.codes is None:
+            scores = self._exact_scores(candidates, query)
+        else:
+            # shortlist on the quantized rows, then rescore in float32
+            approximate = self._quantized_scores(candidates, query)
+            shortlist = min(top_k * self.rescore_multiplier, len(candidates))
+            shortlisted = np.sort(np.argpartition(-approximate, shortlist - 1)[:shortlist])
+            candidates = candidates[shortlisted]
+            scores = self._exact_scores(candidates, query)
+        k = min(top_k, len(candidates))
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best])]
+        matches = []
+        for position in best:
+            row = int(candidates[position])
+            match = {"id": self.ids[row], "score": float(scores[position])}
+            if include_metadata:
+                # a copy, so callers cannot change the stored record
+                match["metadata"] = dict(self.metadata[row])
+            matches.append(match)
+        return matches
+
+    def _exact_scores(self, candidates: np.ndarray, query: np.ndarray) -> np.ndarray:
+        if len(candidates) == self.rows:
+            return self.matrix @ query
+        return np.asarray(self.matrix[candidates]) @ query
+
+    def _quantized_scores(self, candidates: np.ndarray, query: np.ndarray) -> np.ndarray:
+        # Chunked so only one block is ever widened to float32.
+        scores = np.empty(len(candidates), dtype=np.float32)
+        everything = len(candidates) == self.rows
+        for start in range(0, len(candidates), SCAN_CHUNK_ROWS):
+            rows = slice(start, start + SCAN_CHUNK_ROWS) if everything else candidates[start:start + SCAN_CHUNK_ROWS]
+            block = np.asarray(self.codes[rows], dtype=np.float32) @ query
+            if self.scales is not None:
+                block *= self.scales[rows]
+            scores[start:start + len(block)] = block
+        return scores
+
+    def _maybe_train(self):
+        # Train once enough rows exist and retrain after the index doubles.
+        if self.live < self.ivf_lists * 16 or (self.centroids is not None and self.live < 2 * self._trained_on):
+            return
+        live_rows = np.flatnonzero(self.alive)
+        rng = np.random.default_rng(0)
+        sample = np.asarray(self.matrix[np.sort(rng.choice(live_rows, size=min(len(live_rows), self.ivf_lists * 256), replace=False))])
+        centroids = sample[rng.choice(len(sample), size=self.ivf_lists, replace=False)]
+        for _ in range(10):  # spherical k-means
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            for partition in range(self.ivf_lists):
+                members = sample[labels == partition]
+                if len(members):
+                    centroid = members.sum(axis=0)
+                    centroids[partition] = centroid / (np.linalg.norm(centroid) or 1.0)
+        self.centroids = centroids
+        self.assignments = self._nearest_centroids(np.asarray(self.matrix))
+        self._trained_on = self.live
+
+    def _nearest_centroids(self, rows: np.ndarray, chunk: int = 8192) -> np.ndarray:
+        return np.concatenate([
+            np.argmax(rows[start:start + chunk] @ self.centroids.T, axis=1).astype(np.int32)
+            for start in range(0, len(rows), chunk)
+        ]) if len(rows) else np.zeros(0, dtype=np.int32)
+
+    def compact(self):
+        """Rewrite the files with live rows only."""
+        live_rows = [row for row in range(self.rows) if self.ids[row] is not None]
+        vectors_tmp = self.vectors_path.with_suffix(".tmp")
+        records_tmp = self.records_path.with_suffix(".tmp")
+        with open(vectors_tmp, "wb") as vectors_file:
+            for start in range(0, len(live_rows), 8192):
+                vectors_file.write(np.asarray(self.matrix[live_rows[start:start + 8192]]).tobytes())
+        with open(records_tmp, "w", encoding="utf-8") as records:
+            for new_row, row in enumerate(live_rows):
+                records.write(json.dumps({"id": self.ids[row], "row": new_row, "metadata": self.metadata[row]}) + "\n")
+        self.matrix = None
+        self.codes = None
+        os.replace(vectors_tmp, self.vectors_path)
+        os.replace(records_tmp, self.records_path)
+        self.ids = [self.ids[row] for row in live_rows]
+        self.metadata = [self.metadata[row] for row in live_rows]
+        self.row_of = {vector_id: row for row, vector_id in enumerate(self.ids)}
+        if self.centroids is not None:
+            self.assignments = self.assignments[live_rows]
+        self._rebuild_codes(self.quantization)
+        self._remap()
+
+
+class LocalVectorStore:
+    """In-process vector store with the `PineconeVectorStore` interface.
+
+    Each namespace lives in its own sub-directory of `directory`. Work runs
+    in a worker thread so large matrix products do not block the event
+    loop; a lock serialises access to the files.
+
+    Args:
+        directory: Root directory of the index files.
+        ivf_lists: Number of IVF partitions; 0 keeps exact brute-force
+            search.
+        nprobe: Partitions searched per query when IVF is enabled.
+        quantization: ``none``, ``float16`` or ``int8``; precision of the
+            rows scanned by queries.
+        rescore_multiplier: Quantized candidates rescored at full precision,
+            as a multiple of ``top_k``.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        ivf_lists: int = VECTOR_STORE_IVF_LISTS,
+        nprobe: int = VECTOR_STORE_IVF_NPROBE,
+        quantization: str = VECTOR_STORE_QUANTIZATION,
+        rescore_multiplier: int = VECTOR_STORE_RESCORE_MULTIPLIER
+    ):
+        if quantization != "none" and quantization not in QUANTIZED_DTYPES:
+            raise ValueError(f"Unsupported quantization: {quantization!r}")
+        self.directory = Path(directory)
+        self.ivf_lists = ivf_lists
+        self.nprobe = nprobe
+        self.quantization = quantization
+        self.rescore_multiplier = max(1, rescore_multiplier)
+        self._namespaces: dict[str, _LocalNamespace] = {}
+        self._lock = threading.Lock()
+
+    def _namespace(self, namespace: str) -> _LocalNamespace:
+        if namespace not in self._namespaces:
+            self._namespaces[namespace] = _LocalNamespace(
+                self.directory / namespace, self.ivf_lists, self.nprobe, self.quantization, self.rescore_multiplier
+            )
+        return self._namespaces[namespace]
+
+    def _locked(self, namespace: str, method: str, *args: Any) -> Any:
+        with self._lock:
+            return getattr(self._namespace(namespace), method)(*args)
+
+    async def upsert(self, vectors: list[dict[str, Any]], namespace: str = PINECONE_NAMESPACE) -> int:
+        """Insert or overwrite vectors; returns the number written."""
+        return await asyncio.to_thread(self._locked, namespace, "upsert", vectors)
+
+    async def query(
+        self,
+        vector: list[float],
+        top_k: int,
+        namespace: str = PINECONE_NAMESPACE,
+        filter: dict[str, Any] | None = None,
+        include_metadata: bool = True
+    ) -> dict[str, Any]:
+        """Return the `top_k` most similar vectors; the result has a ``matches`` key."""
+        matches = await asyncio.to_thread(self._locked, namespace, "query", vector, top_k, filter, include_metadata)
+        return {"matches": matches, "namespace": namespace}
+
+    async def fetch(self, ids: list[str], namespace: str = PINECONE_NAMESPACE) -> dict[str, list[float]]:
+        """Return the stored (normalised) values of `ids`; unknown ids are left out."""
+        return await asyncio.to_thread(self._locked, namespace, "fetch", ids)
+
+    async def delete(
+        self,
+        ids: list[str] | None = None,
+        namespace: str = PINECONE_NAMESPACE,
+        filter: dict[str, Any] | None = None
+    ):
+        """Delete vectors by id or by metadata filter."""
+        await asyncio.to_thread(self._locked, namespace, "delete", ids, filter)
+
+    async def compact(self, namespace: str = PINECONE_NAMESPACE):
+        """Reclaim the space of deleted and overwritten vectors."""
+        await asyncio.to_thread(self._locked, namespace, "compact")
+
+    def close(self):
+        with self._lock:
+            self._namespaces.clear()
@@ -0,0 +1,62 @@
+import json
+
+import pytest
+
+from cli import interleave, list_files, read_manifest
+
+
+async def collect(iterator):
+    return [item async for item in iterator]
+
+
+async def scenes_of(name, count):
+    for number in range(1, count + 1):
+        yield (name, number)
+
+
+@pytest.mark.asyncio
+async def test_interleave_round_robins_a_bounded_number_of_sources():
+    opened = []
+
+    async def sources():
+        for name, count in [("a", 3), ("b", 1), ("c", 2)]:
+            opened.append(name)
+            yield scenes_of(name, count)
+
+    merged = interleave(sources(), max_active=2)
+    first = [await anext(merged) for _ in range(2)]
+    assert first == [("a", 1), ("b", 1)]
+    assert opened == ["a", "b"]
+
+    rest = await collect(merged)
+    assert rest == [("a", 2), ("a", 3), ("c", 1), ("c", 2)]
+    for name in "ac":
+        numbers = [number for source, number in first + rest if source == name]
+        assert numbers == sorted(numbers)
+
+
+def test_read_manifest_csv_and_json(tmp_path):
+    csv_manifest = tmp_path / "manifest.csv"
+    csv_manifest.write_text("file,tmdb_id\nheat.pdf,949\n , \nalien.pdf,348\n")
+    assert read_manifest(csv_manifest) == {"heat.pdf": 949, "alien.pdf": 348}
+
+    json_manifest = tmp_path / "manifest.json"
+    json_manifest.write_text(json.dumps({"heat.pdf": "949"}))
+    assert read_manifest(json_manifest) == {"heat.pdf": 949}
+
+    bad_manifest = tmp_path / "bad.csv"
+    bad_manifest.write_text("name,id\nheat.pdf,949\n")
+    with pytest.raises(ValueError):
+        read_manifest(bad_manifest)
+
+
+def test_list_files_marks_unlisted_pdfs_skipped(tmp_path):
+    for name in ["b.pdf", "a.PDF", "notes.txt"]:
+        (tmp_path / name).write_bytes(b"")
+
+    statuses = list_files(tmp_path, {"b.pdf": 7})
+
+    assert [(status.file, status.status, status.tmdb_id) for status in statuses] == [
+        ("a.PDF", "skipped", None),
+        ("b.pdf", "pending", 7),
+    ]
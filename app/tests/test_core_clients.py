@@ -11,10 +11,12 @@ async def test_init_and_close_async_client():
     await clients.close_async_client(async_client)
 
 
-def test_init_openai_and_close():
+@pytest.mark.asyncio
+async def test_init_openai_and_close():
     ai = clients.init_openai_client(api_key="fake")
     assert hasattr(ai, "close")
-    clients.close_openai_client(ai)
+    assert ai.max_retries == 0
+    await clients.close_openai_client(ai)
 
 
 @pytest.mark.asyncio
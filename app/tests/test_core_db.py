@@ -1,12 +1,11 @@
-from sqlmodel import SQLModel
-from sqlmodel import Session
-import tempfile
-import os
+import pytest
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 import app.core.db as core_db
 
 
-def test_init_db_and_get_session(tmp_path, monkeypatch):
+@pytest.mark.asyncio
+async def test_init_db_and_get_session(tmp_path, monkeypatch):
     # point DB path to a temp file
     db_file = tmp_path / "test.db"
     monkeypatch.setenv("SQL_DB_PATH", str(db_file))
@@ -16,10 +15,121 @@ def test_init_db_and_get_session(tmp_path, monkeypatch):
     importlib.reload(core_db)
 
     # initialize DB
-    core_db.init_db()
+    await core_db.init_db()
+    assert db_file.exists()
 
-    # get a session and ensure it yields a Session instance
+    # get a session and ensure it yields an AsyncSession instance
     gen = core_db.get_session()
-    sess = next(gen)
-    assert isinstance(sess, Session)
-    sess.close()
+    sess = await anext(gen)
+    assert isinstance(sess, AsyncSession)
+    await gen.aclose()
+    await core_db.engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_deleting_a_screenplay_cascades_to_scenes_and_checkpoints(tmp_path, monkeypatch):
+    from sqlmodel import delete, func, select
+    from models.db.scenes import Scene, SceneEmbedding
+    from models.db.screenplays import Screenplay
+
+    monkeypatch.setenv("SQL_DB_PATH", str(tmp_path / "test.db"))
+    import importlib
+    importlib.reload(core_db)
+    await core_db.init_db()
+
+    try:
+        async with core_db.async_session() as session:
+            session.add(Screenplay(id=1, storage_path="/tmp/1.pdf"))
+            session.add(Scene(id=10, screenplay_id=1, scene_number=1, progress_raw="1/1", progress_num=1.0))
+            await session.commit()
+            session.add(SceneEmbedding(scene_id=10, screenplay_id=1, scene_number=1))
+            await session.commit()
+
+            await session.exec(delete(Screenplay).where(Screenplay.id == 1))
+            await session.commit()
+
+            assert (await session.exec(select(func.count()).select_from(Scene))).one() == 0
+            assert (await session.exec(select(func.count()).select_from(SceneEmbedding))).one() == 0
+    finally:
+        await core_db.engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_init_db_upgrades_a_scene_embedding_table_without_checkpoint_columns(tmp_path, monkeypatch):
+    from sqlalchemy import inspect, text
+
+    monkeypatch.setenv("SQL_DB_PATH", str(tmp_path / "test.db"))
+    import importlib
+    importlib.reload(core_db)
+    await core_db.init_db()
+
+    try:
+        async with core_db.engine.begin() as connection:
+            # the table as created before ingestion checkpoints existed
+            await connection.execute(text("DROP TABLE sceneembedding"))
+            await connection.execute(text(
+                "CREATE TABLE sceneembedding (id INTEGER PRIMARY KEY, "
+                "scene_id INTEGER NOT NULL REFERENCES scene (id) ON DELETE CASCADE, mongo_id VARCHAR, "
+                "created_at DATETIME DEFAULT CURRENT_TIMESTAMP, updated_at DATETIME DEFAULT CURRENT_TIMESTAMP)"
+            ))
+            await connection.execute(text("INSERT INTO screenplay (id, storage_path) VALUES (1, '/tmp/1.pdf')"))
+            await connection.execute(text(
+                "INSERT INTO scene (id, screenplay_id, scene_number, progress_raw, progress_num) "
+                "VALUES (10, 1, 1, '1/2', 0.5), (11, 1, 2, '2/2', 1.0)"
+            ))
+            await connection.execute(text(
+                "INSERT INTO sceneembedding (scene_id, mongo_id) VALUES (10, 'a'), (10, 'b'), (11, 'c')"
+            ))
+
+        await core_db.init_db()
+        await core_db.init_db()
+
+        async with core_db.engine.connect() as connection:
+            columns = await connection.run_sync(
+                lambda sync: {column["name"] for column in inspect(sync).get_columns("sceneembedding")}
+            )
+            rows = (await connection.execute(text(
+                "SELECT scene_id, screenplay_id, scene_number, mongo_id, vector_id FROM sceneembedding ORDER BY scene_id"
+            ))).all()
+        assert {"screenplay_id", "scene_number", "vector_id", "embedding_model"} <= columns
+        assert rows == [(10, 1, 1, "b", None), (11, 1, 2, "c", None)]
+    finally:
+        await core_db.engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_init_db_adds_the_content_hash_and_tmdb_id_columns_to_old_screenplay_tables(tmp_path, monkeypatch):
+    from sqlalchemy import inspect, text
+    from crud.screenplays import find_screenplay_by_content_hash
+
+    monkeypatch.setenv("SQL_DB_PATH", str(tmp_path / "test.db"))
+    import importlib
+    importlib.reload(core_db)
+    await core_db.init_db()
+
+    try:
+        async with core_db.engine.begin() as connection:
+            await connection.execute(text("DROP INDEX ux_screenplay_content_hash_tmdb_id"))
+            await connection.execute(text("DROP INDEX ix_screenplay_content_hash"))
+            await connection.execute(text("ALTER TABLE screenplay DROP COLUMN tmdb_id"))
+            await connection.execute(text("ALTER TABLE screenplay DROP COLUMN content_hash"))
+            await connection.execute(text(
+                "INSERT INTO screenplay (id, storage_path) VALUES (1, '/tmp/1.pdf'), (2, '/tmp/2.pdf')"
+            ))
+            await connection.execute(text(
+                "INSERT INTO movie (tmdb_id, screenplay_id, title, overview) VALUES (155, 1, 'The Dark Knight', '')"
+            ))
+
+        await core_db.init_db()
+        await core_db.init_db()
+
+        async with core_db.engine.connect() as connection:
+            indexes = await connection.run_sync(lambda sync: inspect(sync).get_indexes("screenplay"))
+            tmdb_ids = (await connection.execute(text("SELECT id, tmdb_id FROM screenplay ORDER BY id"))).all()
+        assert any(index["column_names"] == ["content_hash"] for index in indexes)
+        assert any(index["column_names"] == ["content_hash", "tmdb_id"] and index["unique"] for index in indexes)
+        assert tmdb_ids == [(1, 155), (2, None)]
+        async with core_db.async_session() as session:
+            assert await find_screenplay_by_content_hash("abc", session) is None
+    finally:
+        await core_db.engine.dispose()
@@ -0,0 +1,59 @@
+import pytest
+from pymongo.errors import OperationFailure
+
+from core.indexes import MONGODB_INDEXES, MongoIndexManager
+
+
+class FakeCursor:
+    def __init__(self, names):
+        self.names = list(names)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if not self.names:
+            raise StopAsyncIteration
+        return {"name": self.names.pop(0)}
+
+
+class FakeCollection:
+    def __init__(self, existing, fail=()):
+        self.existing = set(existing)
+        self.fail = set(fail)
+        self.created = []
+
+    async def list_indexes(self):
+        return FakeCursor(self.existing)
+
+    async def create_indexes(self, models):
+        for model in models:
+            name = model.document["name"]
+            if name in self.fail:
+                raise OperationFailure("Index already exists with different options")
+            self.created.append(name)
+            self.existing.add(name)
+
+
+@pytest.mark.asyncio
+async def test_index_manager_creates_missing_indexes_idempotently():
+    scenes = FakeCollection(existing=["_id_", "scene_id"], fail=["screenplay_id_story_beat"])
+    manager = MongoIndexManager({"scenes": scenes})
+
+    assert manager.report()["ready"] is False
+    await manager.start()
+    report = manager.report()
+
+    states = {entry["name"]: entry["state"] for entry in report["indexes"]}
+    assert states == {"screenplay_id_scene_number_unique": "ready", "screenplay_id_story_beat": "failed", "scene_id": "ready"}
+    assert scenes.created == ["screenplay_id_scene_number_unique"]
+    assert not report["ready"]
+
+    scenes.fail.clear()
+    await manager.ensure()
+    await manager.ensure()
+    assert scenes.created == ["screenplay_id_scene_number_unique", "screenplay_id_story_beat"]
+    assert manager.report()["ready"]
+    assert len(report["indexes"]) == len(MONGODB_INDEXES["scenes"])
+    upsert_key = next(model for model in MONGODB_INDEXES["scenes"] if model.document["name"] == "screenplay_id_scene_number_unique")
+    assert upsert_key.document["unique"] is True
@@ -0,0 +1,72 @@
+import asyncio
+
+import pytest
+
+from core.jobs import JobRunner
+from core.pipeline import PipelineItem
+
+
+@pytest.mark.asyncio
+async def test_job_runner_tracks_progress_and_result():
+    runner = JobRunner(max_concurrent_jobs=1)
+    release = asyncio.Event()
+
+    async def work(job):
+        job.set_stage("ingesting_scenes")
+        job.scenes_total = 2
+        job.scene_done(PipelineItem(payload=1))
+        job.scene_done(PipelineItem(payload=2, error=ValueError("boom"), failed_stage="analysis"))
+        await release.wait()
+        return {"screenplay_id": 7}
+
+    job = runner.submit(work)
+    await asyncio.sleep(0)
+    assert runner.get(job.id).to_dict()["stage"] == "ingesting_scenes"
+    assert job.status == "running"
+
+    release.set()
+    await runner.shutdown(timeout=1)
+
+    status = job.to_dict()
+    assert status["status"] == "succeeded"
+    assert status["result"] == {"screenplay_id": 7}
+    assert (status["scenes_done"], status["scenes_failed"]) == (1, 1)
+    assert status["errors"] == ["analysis: boom"]
+
+
+@pytest.mark.asyncio
+async def test_job_runner_marks_failed_and_interrupted_jobs():
+    runner = JobRunner()
+
+    async def fail(job):
+        raise RuntimeError("no such movie")
+
+    async def hang(job):
+        await asyncio.sleep(10)
+
+    failed = runner.submit(fail)
+    hung = runner.submit(hang)
+    await runner.shutdown(timeout=0.05)
+
+    assert failed.status == "failed" and failed.errors == ["no such movie"]
+    assert hung.status == "interrupted" and hung.finished
+    with pytest.raises(RuntimeError):
+        runner.submit(fail)
+
+
+@pytest.mark.asyncio
+async def test_job_runner_reports_the_active_job_for_a_key():
+    runner = JobRunner()
+    release = asyncio.Event()
+
+    async def work(job):
+        await release.wait()
+
+    job = runner.submit(work, key=("abc", 155))
+    assert runner.active(("abc", 155)) is job
+    assert runner.active(("abc", 13)) is None
+
+    release.set()
+    await runner.shutdown(timeout=1)
+    assert job.status == "succeeded"
+    assert runner.active(("abc", 155)) is None
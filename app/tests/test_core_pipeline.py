@@ -0,0 +1,87 @@
+import asyncio
+
+import pytest
+
+from core.pipeline import Pipeline, Stage
+
+
+@pytest.mark.asyncio
+async def test_pipeline_runs_all_stages_concurrently():
+    in_flight = 0
+    peak = 0
+
+    async def slow_double(value):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return value * 2
+
+    async def add_one(value):
+        return value + 1
+
+    pipeline = Pipeline(
+        stages=[Stage("double", slow_double, concurrency=4), Stage("add", add_one)],
+        queue_size=2
+    )
+    results = await pipeline.run(range(10))
+
+    assert sorted(item.payload for item in results) == [value * 2 + 1 for value in range(10)]
+    assert all(item.ok for item in results)
+    assert peak == 4
+
+
+@pytest.mark.asyncio
+async def test_pipeline_records_failures_and_skips_later_stages():
+    seen = []
+
+    async def fail_on_three(value):
+        if value == 3:
+            raise RuntimeError("boom")
+        return value
+
+    async def record(value):
+        seen.append(value)
+        return value
+
+    async def payloads():
+        for value in range(5):
+            yield value
+
+    done = []
+    pipeline = Pipeline(
+        stages=[Stage("check", fail_on_three, concurrency=2), Stage("record", record)],
+        on_item_done=done.append
+    )
+    results = await pipeline.run(payloads())
+
+    failures = [item for item in results if not item.ok]
+    assert len(failures) == 1
+    assert failures[0].failed_stage == "check"
+    assert isinstance(failures[0].error, RuntimeError)
+    assert sorted(seen) == [0, 1, 2, 4]
+    assert len(done) == 5
+
+
+def test_pipeline_requires_stages():
+    with pytest.raises(ValueError):
+        Pipeline(stages=[])
+
+
+@pytest.mark.asyncio
+async def test_batch_stage_groups_items_and_fails_them_individually():
+    batches = []
+
+    async def bulk(values):
+        batches.append(list(values))
+        return [ValueError("odd") if value == 5 else value for value in values]
+
+    pipeline = Pipeline(stages=[Stage("bulk", bulk, batch_size=4, batch_timeout=0.05)])
+    results = await pipeline.run(range(10))
+
+    assert sorted(len(batch) for batch in batches) == [2, 4, 4]
+    failures = [item for item in results if not item.ok]
+    assert [item.payload for item in failures] == [5]
+    assert failures[0].failed_stage == "bulk"
+    assert sorted(item.payload for item in results if item.ok) == [0, 1, 2, 3, 4, 6, 7, 8, 9]
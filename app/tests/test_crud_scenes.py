@@ -5,88 +5,485 @@ from unittest.mock import AsyncMock, MagicMock
 import crud.scenes as scenes
 
 
-@pytest.mark.asyncio
-async def test_create_scene_from_text(tmp_path):
-    # mock session with basic add/commit/refresh behavior
-    class FakeSession:
-        def __init__(self):
-            self.added = None
+async def make_session():
+    from sqlmodel import SQLModel
+    from sqlmodel.ext.asyncio.session import AsyncSession
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from sqlalchemy.pool import StaticPool
 
-        def add(self, obj):
-            self.added = obj
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as connection:
+        await connection.run_sync(SQLModel.metadata.create_all)
+    return AsyncSession(engine, expire_on_commit=False)
 
-        def commit(self):
-            pass
 
-        def refresh(self, obj):
-            obj.id = 123
+@pytest.mark.asyncio
+async def test_get_ai_response_edges(monkeypatch):
+    from ai.scenes import SceneAnalysis
 
-    session = FakeSession()
-    scene = await scenes.create_scene_from_text(screenplay_id=1, scene_number=1, total_scenes=3, session=session)
-    assert scene.scene_number == 1
-    assert scene.id == 123
+    monkeypatch.setattr("ai.scenes.get_llm_cache", lambda: None)
 
+    def fake_client(story_beat):
+        analysis = SceneAnalysis(ai_summary="summary", story_beat=story_beat)
+        ai_client = MagicMock()
+        ai_client.responses.with_raw_response.parse = AsyncMock(
+            return_value=MagicMock(headers={}, parse=MagicMock(return_value=MagicMock(output_parsed=analysis)))
+        )
+        return ai_client
+
+    def prompt_of(ai_client):
+        return ai_client.responses.with_raw_response.parse.await_args.kwargs["input"][1]["content"]
 
-@pytest.mark.asyncio
-async def test_get_ai_response_edges():
     # scene 1 -> exposition
-    res = await scenes.get_ai_response(1, "Movie", 5, "exposition", {"raw_text": "x"}, AsyncMock())
-    assert res == "exposition"
+    ai_client = fake_client("exposition")
+    res = await scenes.get_ai_response(1, "Movie", 5, "climax", {"raw_text": "x"}, ai_client)
+    assert res == {"ai_summary": "summary", "story_beat": "exposition"}
+    assert 'hardcode to "exposition"' in prompt_of(ai_client)
 
     # last scene -> resolution
-    res = await scenes.get_ai_response(5, "Movie", 5, "something", {"raw_text": "x"}, AsyncMock())
-    assert res == "resolution"
+    ai_client = fake_client("resolution")
+    res = await scenes.get_ai_response(5, "Movie", 5, "climax", {"raw_text": "x"}, ai_client)
+    assert res == {"ai_summary": "summary", "story_beat": "resolution"}
+    assert 'hardcode to "resolution"' in prompt_of(ai_client)
 
 
 @pytest.mark.asyncio
-async def test_create_mongodb_pinecone_records(monkeypatch):
-    # fake ai_client embedding response
-    fake_embedding = MagicMock()
-    fake_embedding.data = [MagicMock(embedding=[0.1, 0.2])]
+async def test_create_scenes_links_scenes_in_order(monkeypatch):
+    from models.db.scenes import Scene
+    from models.db.screenplays import Screenplay  # noqa: F401 - registers the FK target table
 
-    class FakeAI:
-        embeddings = MagicMock()
+    beats = ["exposition", "inciting_incident", "rising_action", "climax", "resolution"]
+    seen_previous_beats = []
+    real_sleep = asyncio.sleep
 
-    fake_ai = FakeAI()
-    fake_ai.embeddings.create = MagicMock(return_value=fake_embedding)
+    async def fake_ai_response(scene_number, movie_name, total_scenes, previous_story_beat, scene_text, ai_client):
+        seen_previous_beats.append((scene_number, previous_story_beat))
+        # finish later scenes first to exercise out-of-order completion
+        await real_sleep(0.001 * (total_scenes - scene_number))
+        return {"ai_summary": f"summary {scene_number}", "story_beat": beats[scene_number - 1]}
 
-    # fake mongodb
-    class FakeCollection:
-        async def insert_one(self, doc):
-            class R:
-                inserted_id = "abc123"
-            return R()
+    async def fake_embed(item, embedder):
+        item.embedding = [0.1]
+        return item
+
+    async def fake_store(items, embedding_model, mongodb_database):
+        for item in items:
+            item.mongodb_record_id = f"mongo-{item.scene_number}"
+        return items
+
+    upserted = []
+
+    class FakeVectorStore:
+        async def upsert(self, vectors, namespace=None):
+            upserted.append(vectors)
+            return len(vectors)
+
+    monkeypatch.setattr(scenes, "get_ai_response", fake_ai_response)
+    monkeypatch.setattr(scenes, "embed_scene", fake_embed)
+    monkeypatch.setattr(scenes, "store_scene_documents", fake_store)
+    monkeypatch.setattr(scenes, "INGEST_BATCH_TIMEOUT", 0.05)
+    monkeypatch.setattr(scenes.asyncio, "sleep", AsyncMock())
+
+    session = await make_session()
+    results = await scenes.create_scenes(
+        scene_texts=[{"raw_text": f"t{n}", "embedding_text": f"t{n}"} for n in range(1, 6)],
+        screenplay_id=1,
+        movie_name="Movie",
+        ai_client=MagicMock(),
+        embedding_model="model",
+        mongodb_database=MagicMock(),
+        vector_store=FakeVectorStore(),
+        session=session,
+        stage_concurrency={"analysis": 3, "embedding": 3}
+    )
+
+    assert [item.scene_number for item in results] == [1, 2, 3, 4, 5]
+    assert sorted(seen_previous_beats) == [(1, "exposition")] + [(n, beats[n - 2]) for n in range(2, 6)]
+    scene_ids = [item.scene_id for item in results]
+    session.expire_all()
+    records = [await session.get(Scene, scene_id) for scene_id in scene_ids]
+    assert [record.previous_scene_id for record in records] == [None] + scene_ids[:-1]
+    assert [record.next_scene_id for record in records] == scene_ids[1:] + [None]
+    assert [record.progress_raw for record in records] == [f"{n}/5" for n in range(1, 6)]
+    assert records[2].beat == "rising_action"
+    assert records[2].mongodb_record_id == "mongo-3"
+    assert records[2].ai_summary == "summary 3"
+    assert sum(len(batch) for batch in upserted) == 5
+    assert len(upserted) < 5
+    await session.close()
+
+
+@pytest.mark.asyncio
+async def test_resume_scenes_only_reruns_unfinished_scenes(monkeypatch):
+    from sqlmodel import select
+    from models.db.scenes import SceneEmbedding
+    from models.db.screenplays import Screenplay  # noqa: F401 - registers the FK target table
+
+    beats = ["exposition", "inciting_incident", "rising_action", "climax", "resolution"]
+    analysed = []
+    broken = {4}
 
-    class FakeDB(dict):
-        def __getitem__(self, name):
-            return FakeCollection()
+    async def fake_ai_response(scene_number, movie_name, total_scenes, previous_story_beat, scene_text, ai_client):
+        analysed.append((scene_number, previous_story_beat))
+        return {"ai_summary": f"summary {scene_number}", "story_beat": beats[scene_number - 1]}
 
-    fake_mongodb = FakeDB()
+    async def fake_embed(item, embedder):
+        item.embedding = [0.1]
+        return item
 
-    # fake pinecone index
-    class FakeIndex:
+    async def fake_store(items, embedding_model, mongodb_database):
+        results = []
+        for item in items:
+            item.mongodb_record_id = f"mongo-{item.scene_number}"
+            results.append(RuntimeError("write failed") if item.scene_number in broken else item)
+        return results
+
+    upserted = []
+
+    class FakeVectorStore:
         async def upsert(self, vectors, namespace=None):
-            return None
+            upserted.extend(vector["id"] for vector in vectors)
+            return len(vectors)
+
+    class FakeCursor:
+        def __aiter__(self):
+            return self
 
-    class FakePinecone:
-        def IndexAsyncio(self, host=None):
-            return FakeIndex()
+        async def __anext__(self):
+            raise StopAsyncIteration
 
-    fake_pine = FakePinecone()
+    class FakeCollection:
+        def find(self, query, projection=None):
+            return FakeCursor()
 
-    scene_text = {"raw_text": "text", "embedding_text": "text"}
+    monkeypatch.setattr(scenes, "get_ai_response", fake_ai_response)
+    monkeypatch.setattr(scenes, "embed_scene", fake_embed)
+    monkeypatch.setattr(scenes, "store_scene_documents", fake_store)
+    monkeypatch.setattr(scenes, "INGEST_BATCH_TIMEOUT", 0.01)
 
-    await scenes.create_mongodb_pinecone_records(
-        scene_id=1,
-        scene_number=1,
-        previous_scene_id=None,
-        next_scene_id=None,
-        ai_summary="summary",
-        story_beat="exposition",
+    session = await make_session()
+    kwargs = dict(
+        scene_texts=[{"raw_text": f"t{n}", "embedding_text": f"t{n}"} for n in range(1, 6)],
         screenplay_id=1,
-        scene_text=scene_text,
-        ai_client=fake_ai,
+        movie_name="Movie",
+        ai_client=MagicMock(),
         embedding_model="model",
-        mongodb_database=fake_mongodb,
-        pinecone_client=fake_pine
+        mongodb_database={"scenes": FakeCollection()},
+        vector_store=FakeVectorStore(),
+        session=session
+    )
+    with pytest.raises(scenes.SceneIngestionError):
+        await scenes.create_scenes(**kwargs)
+    assert sorted(upserted) == ["1:1", "1:2", "1:3", "1:5"]
+
+    analysed.clear()
+    broken.clear()
+    resumed = await scenes.resume_scenes(**kwargs)
+
+    assert [item.scene_number for item in resumed] == [4]
+    assert analysed == [(4, "rising_action")]
+    checkpoints = (await session.exec(select(SceneEmbedding.scene_number, SceneEmbedding.vector_id))).all()
+    assert sorted(checkpoints) == [(n, f"1:{n}") for n in range(1, 6)]
+    assert len((await session.exec(select(scenes.Scene))).all()) == 5
+    await session.close()
+
+
+@pytest.mark.asyncio
+async def test_copy_scenes_reuses_stored_analyses_and_vectors(monkeypatch):
+    from sqlmodel import select
+    from models.db.scenes import SceneEmbedding
+    from models.db.screenplays import Screenplay  # noqa: F401 - registers the FK target table
+
+    session = await make_session()
+    source_ids = await scenes.create_scene_records(screenplay_id=1, total_scenes=3, session=session)
+    session.add_all([
+        SceneEmbedding(scene_id=scene_id, screenplay_id=1, scene_number=number, embedding_model="model")
+        for number, scene_id in enumerate(source_ids, start=1)
+    ])
+    await session.commit()
+
+    class FakeCursor:
+        def __init__(self, documents):
+            self.documents = documents
+
+        def __aiter__(self):
+            return self._iterate()
+
+        async def _iterate(self):
+            for document in self.documents:
+                yield document
+
+    class FakeCollection:
+        def find(self, query, projection=None):
+            assert query["screenplay_id"] == 1
+            return FakeCursor([
+                {
+                    "scene_number": number,
+                    "ai_summary": f"summary {number}",
+                    "story_beat": "climax",
+                    "scene_text": {"raw_text": f"t{number}", "embedding_text": f"t{number}"}
+                }
+                for number in query["scene_number"]["$in"]
+            ])
+
+    class FakeVectorStore:
+        def __init__(self):
+            self.upserted = {}
+            self.fetches = 0
+
+        async def fetch(self, ids, namespace=None):
+            self.fetches += 1
+            return {vector_id: [float(vector_id.split(":")[1])] for vector_id in ids}
+
+        async def upsert(self, vectors, namespace=None):
+            self.upserted.update((vector["id"], vector["values"]) for vector in vectors)
+            return len(vectors)
+
+    async def fake_store(items, embedding_model, mongodb_database):
+        for item in items:
+            item.mongodb_record_id = f"mongo-{item.screenplay_id}-{item.scene_number}"
+        return items
+
+    monkeypatch.setattr(scenes, "get_ai_response", AsyncMock(side_effect=AssertionError("model called")))
+    monkeypatch.setattr(scenes, "llm_create_embeddings", AsyncMock(side_effect=AssertionError("model called")))
+    monkeypatch.setattr(scenes, "store_scene_documents", fake_store)
+    monkeypatch.setattr(scenes, "INGEST_BATCH_TIMEOUT", 0.01)
+    vector_store = FakeVectorStore()
+
+    copied = await scenes.copy_scenes(
+        source_screenplay_id=1,
+        screenplay_id=2,
+        movie_name="Movie",
+        embedding_model="model",
+        mongodb_database={"scenes": FakeCollection()},
+        vector_store=vector_store,
+        session=session,
+        batch_size=2
+    )
+
+    assert [item.scene_number for item in copied] == [1, 2, 3]
+    assert vector_store.fetches == 2
+    assert vector_store.upserted == {"2:1": [1.0], "2:2": [2.0], "2:3": [3.0]}
+    records = (await session.exec(
+        select(scenes.Scene).where(scenes.Scene.screenplay_id == 2).order_by(scenes.Scene.scene_number)
+    )).all()
+    assert [record.ai_summary for record in records] == ["summary 1", "summary 2", "summary 3"]
+    assert records[1].previous_scene_id == records[0].id
+    checkpoints = (await session.exec(select(SceneEmbedding.vector_id).where(SceneEmbedding.screenplay_id == 2))).all()
+    assert sorted(checkpoints) == ["2:1", "2:2", "2:3"]
+
+    with pytest.raises(ValueError):
+        await scenes.copyable_scene_count(1, "other-model", session)
+    await session.close()
+
+
+@pytest.mark.asyncio
+async def test_store_scene_documents_reports_partial_failures():
+    from pymongo.errors import BulkWriteError
+
+    class FakeCursor:
+        def __init__(self, documents):
+            self.documents = documents
+
+        def __aiter__(self):
+            return self._iterate()
+
+        async def _iterate(self):
+            for document in self.documents:
+                yield document
+
+    class FakeCollection:
+        def __init__(self):
+            self.operations = None
+            self.find_args = None
+
+        async def bulk_write(self, operations, ordered=True):
+            self.operations = operations
+            assert ordered is False
+            raise BulkWriteError({
+                "writeErrors": [{"index": 1, "errmsg": "document too large"}],
+                "upserted": [{"index": 0, "_id": "new-id"}],
+            })
+
+        def find(self, query, projection=None):
+            self.find_args = (query, projection)
+            return FakeCursor([{"_id": "existing-id", "scene_number": 3}])
+
+    collection = FakeCollection()
+    items = [
+        scenes.SceneIngestItem(
+            screenplay_id=7,
+            movie_name="Movie",
+            scene_id=number,
+            scene_number=number,
+            total_scenes=3,
+            scene_text={"raw_text": "t", "embedding_text": "t"},
+            ai_summary="s",
+            embedding=[0.1]
+        )
+        for number in (1, 2, 3)
+    ]
+
+    results = await scenes.store_scene_documents(items, "model", {"scenes": collection})
+
+    assert len(collection.operations) == 3
+    assert results[0].mongodb_record_id == "new-id"
+    assert isinstance(results[1], scenes.SceneDocumentWriteError)
+    assert results[1].scene_number == 2
+    assert results[2].mongodb_record_id == "existing-id"
+    query, projection = collection.find_args
+    assert query == {"screenplay_id": 7, "scene_number": {"$in": [3]}}
+    assert projection == {"_id": 1, "scene_number": 1}
+
+
+@pytest.mark.asyncio
+async def test_get_relevant_contexts_fuses_vector_and_lexical_matches(monkeypatch):
+    vector_matches = [
+        {"id": "1:2", "metadata": {"embedding_text": "summary match"}},
+        {"id": "1:1", "metadata": {"embedding_text": "both match"}},
+    ]
+    lexical_matches = [
+        {"vector_id": "1:1", "embedding_text": "both match"},
+        {"vector_id": "2:7", "embedding_text": "dialogue match"},
+    ]
+    monkeypatch.setattr(scenes, "create_embeddings", AsyncMock(return_value=[0.1]))
+    fetch = AsyncMock(return_value=vector_matches)
+    monkeypatch.setattr(scenes, "fetch_contexts", fetch)
+    monkeypatch.setattr(scenes, "search_scene_texts", AsyncMock(return_value=lexical_matches))
+
+    contexts = await scenes.get_relevant_contexts(
+        user_query="q",
+        ai_client=MagicMock(),
+        vector_store=MagicMock(),
+        top_k=2,
+        text_index_engine=MagicMock()
     )
+
+    assert contexts == ["<START SCENE>both match<END SCENE>", "<START SCENE>summary match<END SCENE>"]
+    assert fetch.await_args.kwargs["top_k"] == 2 * scenes.HYBRID_CANDIDATE_MULTIPLIER
+
+
+def test_fuse_contexts_does_not_modify_vector_metadata():
+    stored = {"scene_id": 11}
+    fused = scenes.fuse_contexts(
+        [{"id": "1:1", "metadata": stored}],
+        [{"vector_id": "1:1", "embedding_text": "lexical text"}],
+        top_k=1
+    )
+
+    assert fused == [{"id": "1:1", "metadata": {"scene_id": 11, "embedding_text": "lexical text"}}]
+    assert stored == {"scene_id": 11}
+
+
+@pytest.mark.asyncio
+async def test_hydrate_contexts_fetches_missing_texts_by_document_id():
+    from bson import ObjectId
+
+    class FakeCursor:
+        def __init__(self, documents):
+            self.documents = documents
+
+        def __aiter__(self):
+            return self._iterate()
+
+        async def _iterate(self):
+            for document in self.documents:
+                yield document
+
+    live, deleted = ObjectId(), ObjectId()
+
+    class FakeCollection:
+        def __init__(self):
+            self.calls = []
+
+        def find(self, query, projection=None):
+            self.calls.append((query, projection))
+            return FakeCursor([{"_id": live, "scene_text": {"embedding_text": "hydrated"}}])
+
+    collection = FakeCollection()
+    contexts = [
+        # scene ids repeat after a delete; only the document id identifies the text
+        {"id": "2:1", "metadata": {"scene_id": 11, "mongodb_record_id": str(live)}},
+        {"id": "1:2", "metadata": {"scene_id": 12, "embedding_text": "inline"}},
+        {"id": "1:1", "metadata": {"scene_id": 11, "mongodb_record_id": str(deleted)}},
+        {"id": "1:3", "metadata": {"scene_id": 13}},
+    ]
+
+    hydrated = await scenes.hydrate_contexts(contexts, {"scenes": collection})
+
+    assert scenes.clean_contexts(hydrated) == ["<START SCENE>hydrated<END SCENE>", "<START SCENE>inline<END SCENE>"]
+    assert [context["id"] for context in hydrated] == ["2:1", "1:2"]
+    assert len(collection.calls) == 1
+    assert collection.calls[0][0] == {"_id": {"$in": [live, deleted]}}
+
+
+@pytest.mark.asyncio
+async def test_delete_scene_documents_removes_documents_and_vectors():
+    from models.db.scenes import Scene
+    from models.db.screenplays import Screenplay
+
+    mongodb_database = {"scenes": MagicMock(delete_many=AsyncMock())}
+    vector_store = MagicMock(delete=AsyncMock())
+    session = await make_session()
+    try:
+        session.add(Screenplay(id=4, storage_path="/tmp/4.pdf"))
+        await session.commit()
+        await scenes.create_scene_records(screenplay_id=4, total_scenes=3, session=session)
+
+        await scenes.delete_scene_documents(4, mongodb_database, vector_store, session)
+    finally:
+        await session.close()
+        await session.bind.dispose()
+
+    mongodb_database["scenes"].delete_many.assert_awaited_once_with({"screenplay_id": 4})
+    assert vector_store.delete.await_args.kwargs["ids"] == ["4:1", "4:2", "4:3"]
+
+
+def test_build_scene_vector_compact_metadata_omits_texts():
+    item = scenes.SceneIngestItem(
+        screenplay_id=3, movie_name="m", scene_id=1, scene_number=2, total_scenes=4,
+        scene_text={"raw_text": "raw", "embedding_text": "text"},
+        ai_summary="summary", story_beat="exposition", embedding=[0.1]
+    )
+
+    compact = scenes.build_scene_vector(item, "model", metadata_mode="compact")["metadata"]
+    full = scenes.build_scene_vector(item, "model", metadata_mode="full")["metadata"]
+
+    assert "embedding_text" not in compact and "raw_text" not in compact
+    assert compact["scene_id"] == 1 and compact["progress_num"] == 0.5
+    assert full["embedding_text"] == "text" and full["raw_text"] == "raw"
+
+
+@pytest.mark.asyncio
+async def test_resolve_scene_filter_pushes_movie_attributes_down_to_screenplay_ids():
+    from datetime import date
+    from models.db.movies import Movie
+    from models.db.screenplays import Screenplay
+    from models.schemas.scenes import SceneQueryFilters
+
+    async with await make_session() as session:
+        for screenplay_id, year, rating in [(1, 1954, 8.1), (2, 1999, 8.8), (3, 2010, 6.0)]:
+            session.add(Screenplay(id=screenplay_id, storage_path=f"/tmp/{screenplay_id}.pdf"))
+            session.add(Movie(
+                tmdb_id=screenplay_id,
+                title=f"Movie {screenplay_id}",
+                overview="",
+                screenplay_id=screenplay_id,
+                release_date=date(year, 6, 1),
+                vote_average=rating
+            ))
+        await session.commit()
+
+        scene_filter = await scenes.resolve_scene_filter(
+            SceneQueryFilters(release_year_max=2005, min_vote_average=8.5, story_beats=["Climax"], progress_min=0.5),
+            session
+        )
+        assert scene_filter.to_metadata_filter() == {"$and": [
+            {"screenplay_id": {"$in": [2]}},
+            {"story_beat": {"$in": ["climax"]}},
+            {"progress_num": {"$gte": 0.5}},
+        ]}
+
+        narrowed = await scenes.resolve_scene_filter(SceneQueryFilters(screenplay_ids=[1, 3], min_vote_average=8.5), session)
+        assert narrowed.matches_nothing
+        assert await scenes.resolve_scene_filter(SceneQueryFilters(), session) is None
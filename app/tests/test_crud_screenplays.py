@@ -1,7 +1,16 @@
 import pytest
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock
 
 import crud.screenplays as screenplays
+from benchmarks.scene_tokenizer import split_script_text
+
+
+def reference_scenes(pages):
+    import re
+    return split_script_text(
+        script_text=screenplays.PAGE_DELIMITER.join(pages),
+        re_pattern=re.compile(screenplays.SCENE_HEADER_PATTERN)
+    )
 
 
 def test_clean_text_for_embedding_model():
@@ -10,32 +19,11 @@ def test_clean_text_for_embedding_model():
     assert "\n" not in cleaned
 
 
-def test_split_script_text():
+def test_iter_scene_texts_with_a_custom_pattern():
     text = "INT. ROOM\nScene one\nINT. OTHER\nScene two"
-    import re
-    pattern = re.compile(r"(?m)^(?:\d+\s+)?(?:INT\.?|EXT\.?)")
-    splits = screenplays.split_script_text(script_text=text, re_pattern=pattern)
-    assert isinstance(splits, list)
-
-
-@pytest.mark.asyncio
-async def test_create_screenplay_chunks(monkeypatch):
-    # mock PyMuPDFLoader.aload
-    class DummyDoc:
-        page_content = "INT. ROOM\nScene text"
-
-    class Loader:
-        def __init__(self, file_path=None, mode=None):
-            pass
-
-        async def aload(self):
-            return [DummyDoc()]
-
-    monkeypatch.setattr("crud.screenplays.PyMuPDFLoader", Loader)
-
-    result = await screenplays.create_screenplay_chunks(file_path="fake.pdf")
-    assert "full_text" in result
-    assert "scene_texts" in result
+    pattern = r"(?m)^(?:\d+\s+)?(?:INT\.?|EXT\.?)"
+    scenes = list(screenplays.iter_scene_texts(iter([text]), regex_pattern=pattern))
+    assert [scene["raw_text"] for scene in scenes] == ["INT. ROOM\nScene one", "INT. OTHER\nScene two"]
 
 
 @pytest.mark.asyncio
@@ -43,34 +31,38 @@ async def test_create_screenplay_end_to_end(monkeypatch):
     # mock create_movie
     fake_movie = MagicMock()
     fake_movie.id = 99
+    fake_movie.tmdb_id = 1
     fake_movie.title = "Movie"
     monkeypatch.setattr("crud.screenplays.create_movie", AsyncMock(return_value=fake_movie))
 
-    # mock create_screenplay_chunks
-    monkeypatch.setattr("crud.screenplays.create_screenplay_chunks", AsyncMock(return_value={
-        "full_text": "full",
-        "scene_texts": [{"raw_text": "t", "embedding_text": "t"}]
-    }))
+    # mock the PDF passes
+    monkeypatch.setattr("crud.screenplays.count_screenplay_scenes", AsyncMock(return_value=1))
+
+    async def fake_stream(file_path):
+        yield {"raw_text": "t", "embedding_text": "t"}
+
+    monkeypatch.setattr("crud.screenplays.stream_scene_texts", fake_stream)
 
     # mock create_scenes
-    monkeypatch.setattr("crud.screenplays.create_scenes", AsyncMock())
+    create_scenes = AsyncMock()
+    monkeypatch.setattr("crud.screenplays.create_scenes", create_scenes)
 
     # fake session
     class FakeSession:
         def add(self, obj):
             pass
 
-        def commit(self):
+        async def commit(self):
             pass
 
-        def refresh(self, obj):
+        async def refresh(self, obj):
             obj.id = 123
 
     session = FakeSession()
 
     # run create_screenplay
     fake_mongo = MagicMock()
-    fake_pinecone = MagicMock()
+    fake_vector_store = MagicMock()
 
     result = await screenplays.create_screenplay(
         file_path="/tmp/fake.pdf",
@@ -79,6 +71,135 @@ async def test_create_screenplay_end_to_end(monkeypatch):
         async_client=AsyncMock(),
         ai_client=AsyncMock(),
         mongodb_database=fake_mongo,
-        pinecone_client=fake_pinecone
+        vector_store=fake_vector_store
     )
     assert result.id == 123
+    assert result.text is None and result.total_scenes == 1
+    assert create_scenes.await_args.kwargs["total_scenes"] == 1
+
+
+@pytest.mark.asyncio
+async def test_create_screenplay_record_collapses_a_duplicate_insert(tmp_path, monkeypatch):
+    import importlib
+    import app.core.db as core_db
+    from models.db.movies import Movie
+
+    monkeypatch.setenv("SQL_DB_PATH", str(tmp_path / "test.db"))
+    importlib.reload(core_db)
+    await core_db.init_db()
+
+    try:
+        async with core_db.async_session() as session, core_db.async_session() as racing_session:
+            movie = Movie(tmdb_id=155, title="The Dark Knight", overview="")
+            other_movie = Movie(tmdb_id=13, title="Forrest Gump", overview="")
+            session.add_all([movie, other_movie])
+            await session.commit()
+
+            # both uploads missed the lookup; the second insert loses
+            first = await screenplays.create_screenplay_record(movie, "/tmp/a.pdf", 1, "abc", session)
+            with pytest.raises(screenplays.DuplicateScreenplayError) as error:
+                await screenplays.create_screenplay_record(movie, "/tmp/a.pdf", 1, "abc", racing_session)
+            assert error.value.screenplay_id == first.id
+
+            copy = await screenplays.create_screenplay_record(other_movie, "/tmp/a.pdf", 1, "abc", session)
+            assert (first.tmdb_id, copy.tmdb_id) == (155, 13)
+            assert (await screenplays.find_screenplay_by_content_hash("abc", session, tmdb_id=13)).id == copy.id
+            assert not await screenplays.screenplay_is_ingested(first.id, session)
+            assert await screenplays.find_ingested_screenplay_by_content_hash("abc", session) is None
+    finally:
+        await core_db.engine.dispose()
+
+
+def test_iter_scene_texts_streams_scenes_across_page_breaks():
+    pages = [
+        "TITLE PAGE",
+        "INT. ROOM - DAY\nBob talks.\nEXT. STREET\nCars.\n12",
+        "INT. CAR - NIGHT\nDriving",
+        "still driving\nEXT. BOAT\nEnd",
+    ]
+    consumed = []
+
+    def page_stream():
+        for page in pages:
+            consumed.append(page)
+            yield page
+
+    scenes = screenplays.iter_scene_texts(page_stream())
+    first = next(scenes)["raw_text"]
+    # the first complete scene is yielded before the rest is read
+    assert first == "EXT. STREET\nCars."
+    assert len(consumed) < len(pages)
+    streamed = [first, *(scene["raw_text"] for scene in scenes)]
+
+    assert streamed == reference_scenes(pages)
+    assert streamed[1].startswith("12\n\fINT. CAR")
+    assert streamed[1].endswith("still driving")
+
+
+@pytest.mark.parametrize("script_text", [
+    "FADE IN:\n1 INT. ROOM - DAY\nBob  talks -- fast.\n\n2 ext. street\n\tCars.",
+    "    INT. INDENTED - DAY\nText\n    EXT. ALSO INDENTED\nMore",
+    "no sluglines here\n\nsecond  block\n\n\nthird",
+])
+def test_iter_scene_texts_matches_split_and_clean(script_text):
+    expected = [
+        {"raw_text": raw_text, "embedding_text": screenplays.clean_text_for_embedding_model(raw_text)}
+        for raw_text in reference_scenes([script_text])
+    ]
+    assert list(screenplays.iter_scene_texts(iter([script_text]))) == expected
+    assert screenplays.clean_text_for_embedding_model("a\n\n b\t--c") == "a b -c"
+
+
+@pytest.mark.parametrize("pages_per_range", [1, 2, 3])
+@pytest.mark.parametrize("pages", [
+    [
+        "TITLE PAGE",
+        "INT. ROOM - DAY\nBob talks.\nEXT. STREET\nCars.\n12",
+        "INT. CAR - NIGHT\nDriving",
+        "still driving\nEXT. BOAT\nEnd",
+    ],
+    ["no sluglines here", "", "second  block\n\nthird"],
+    ["no sluglines\nhere", "still none\n12", "", "INT. LATE\nx"],
+    ["INT. LONG\nx\ny", "more\n\n3  ", "EXT. NEXT\nz"],
+    ["INT. A\nx\n12", "", "EXT. B\ny\nINT. C", "3\n", "\n  INT. D"],
+])
+def test_page_range_splits_stitch_to_the_streamed_scenes(pages, pages_per_range):
+    expected = reference_scenes(pages)
+    assert [scene["raw_text"] for scene in screenplays.iter_scene_texts(iter(pages))] == expected
+
+    for keep_scenes in (True, False):
+        stitcher = screenplays.SceneStitcher()
+        stitched = []
+        for start in range(0, len(pages), pages_per_range):
+            split = screenplays.split_pages(pages[start:start + pages_per_range], start > 0, keep_scenes=keep_scenes)
+            stitched += stitcher.feed(split)
+        stitched += stitcher.finish()
+
+        assert stitcher.scene_count == len(expected)
+        if keep_scenes:
+            assert [raw_text for raw_text, _ in stitched] == expected
+            for raw_text, embedding_text in stitched:
+                assert embedding_text in (None, screenplays.clean_text_for_embedding_model(raw_text))
+
+
+@pytest.mark.parametrize("pages_per_range", [1, 2, 3])
+@pytest.mark.parametrize("pages", [
+    [
+        "TITLE PAGE",
+        "INT. ROOM - DAY\nBob talks.\nEXT. STREET\nCars.\n12",
+        "INT. CAR - NIGHT\nDriving",
+        "still driving\nEXT. BOAT\nEnd",
+    ],
+    ["12", "", "INT. A\nx\n3", "", "", "ext. b\ny"],
+    ["INT. A\nx", "4", "", "  EXT. B", "5\n6", "INT. C\nz\n7"],
+    ["", "INT. ONLY"],
+])
+def test_header_counter_counts_the_streamed_scenes(pages, pages_per_range):
+    counter = screenplays.HeaderCounter()
+    for start in range(0, len(pages), pages_per_range):
+        counter.feed(screenplays.count_page_headers(pages[start:start + pages_per_range], start > 0))
+
+    document = screenplays.PAGE_DELIMITER.join(pages)
+    assert counter.count == len(screenplays.header_starts(document, screenplays.SLUGLINE_PATTERN))
+    if counter.count:
+        assert counter.count == len(list(screenplays.iter_scene_texts(iter(pages))))
@@ -56,7 +56,7 @@ async def test_lifespan_calls_initializers_and_closers():
     app = FastAPI()
 
     # Prepare mocks for all initializers and closers
-    mock_init_db = MagicMock()
+    mock_init_db = AsyncMock()
     mock_init_mongodb = MagicMock()
     mock_mongodb_client = AsyncMock()
     mock_init_mongodb.return_value = mock_mongodb_client
@@ -75,9 +75,15 @@ async def test_lifespan_calls_initializers_and_closers():
 
     mock_close_async_client = AsyncMock()
     mock_close_mongodb_client = AsyncMock()
-    mock_close_openai_client = MagicMock()
+    mock_close_openai_client = AsyncMock()
     mock_close_pinecone_client = AsyncMock()
 
+    mock_init_pinecone_index = MagicMock()
+    mock_close_pinecone_index = AsyncMock()
+
+    mock_index_manager = MagicMock()
+    mock_index_manager.return_value.close = AsyncMock()
+
     # patch names in main_mod where they are imported
     with patch("app.main.init_db", mock_init_db), \
         patch("app.main.init_mongodb_client", mock_init_mongodb), \
@@ -87,19 +93,26 @@ async def test_lifespan_calls_initializers_and_closers():
         patch("app.main.close_async_client", mock_close_async_client), \
         patch("app.main.close_mongodb_client", mock_close_mongodb_client), \
         patch("app.main.close_openai_client", mock_close_openai_client), \
-        patch("app.main.close_pinecone_client", mock_close_pinecone_client):
+        patch("app.main.close_pinecone_client", mock_close_pinecone_client), \
+        patch("app.main.init_pinecone_index", mock_init_pinecone_index), \
+        patch("app.main.close_pinecone_index", mock_close_pinecone_index), \
+        patch("app.main.MongoIndexManager", mock_index_manager):
 
         # Use the lifespan context manager
         async with main_mod.lifespan(app):
             # inside startup (after yield)
-            mock_init_db.assert_called_once()
+            mock_init_db.assert_awaited_once()
             mock_init_mongodb.assert_called_once()
             mock_init_async_client.assert_called_once()
             mock_init_openai.assert_called_once()
             mock_init_pinecone.assert_called_once()
+            mock_init_pinecone_index.assert_called_once_with(mock_pinecone_client)
+            mock_index_manager.return_value.start.assert_called_once()
 
         # after context exits, closers should be awaited/called
         mock_close_async_client.assert_awaited
         mock_close_mongodb_client.assert_awaited
         mock_close_pinecone_client.assert_awaited
-        mock_close_openai_client.assert_called
+        mock_close_pinecone_index.assert_awaited_once()
+        mock_close_openai_client.assert_awaited_once()
+        mock_index_manager.return_value.close.assert_awaited_once()
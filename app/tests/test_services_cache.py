@@ -0,0 +1,182 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+from pydantic import BaseModel
+
+import services.llms as llms
+from services.cache import ResultCache, SQLiteCache, make_cache_key
+
+
+def test_make_cache_key_is_stable_and_order_insensitive():
+    first = make_cache_key("model", [{"role": "user", "content": "hi"}])
+    second = make_cache_key("model", [{"content": "hi", "role": "user"}])
+    assert first == second
+    assert first != make_cache_key("model", [{"role": "user", "content": "hello"}])
+
+
+def test_sqlite_cache_persists_and_counts(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = SQLiteCache(path, table="responses")
+    assert cache.get("a") is None
+    cache.set("a", "value")
+    assert cache.get("a") == "value"
+    cache.close()
+
+    reopened = SQLiteCache(path, table="responses")
+    assert reopened.get("a") == "value"
+    assert reopened.stats()["size_bytes"] == len("value")
+    assert (reopened.hits, reopened.misses) == (1, 0)
+
+
+def test_sqlite_cache_evicts_least_recently_used(tmp_path):
+    cache = SQLiteCache(str(tmp_path / "cache.sqlite3"), max_bytes=30)
+    cache.set("a", "x" * 10)
+    cache.set("b", "x" * 10)
+    cache.get("a")
+    cache.set("c", "x" * 15)
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert cache.evictions == 1
+    assert cache.stats()["size_bytes"] <= 30
+
+
+@pytest.mark.asyncio
+async def test_sqlite_cache_buffers_access_times_and_runs_off_the_event_loop(tmp_path, monkeypatch):
+    import sqlite3
+    import threading
+    import services.cache as cache_module
+
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "time", lambda: now[0])
+    path = str(tmp_path / "cache.sqlite3")
+    cache = SQLiteCache(path, touch_batch_size=2)
+    await cache.aset("a", "value")
+    await cache.aset("b", "value")
+
+    def accessed_at():
+        with sqlite3.connect(path) as connection:
+            return connection.execute("SELECT accessed_at FROM cache WHERE key = 'a'").fetchone()[0]
+
+    written = accessed_at()
+    loop_thread = threading.get_ident()
+    threads = []
+    real_get = cache.get
+
+    def recording_get(*args):
+        threads.append(threading.get_ident())
+        return real_get(*args)
+
+    cache.get = recording_get
+    now[0] += 1
+    assert await cache.aget("a") == "value"
+    assert accessed_at() == written  # a hit does not write on its own
+    assert threads and loop_thread not in threads
+
+    assert await cache.aget("b") == "value"
+    assert accessed_at() == written + 1  # written once the batch is full
+    cache.close()
+
+
+class Analysis(BaseModel):
+    ai_summary: str
+
+
+@pytest.mark.asyncio
+async def test_parse_structured_serves_repeated_requests_from_cache(tmp_path):
+    raw_response = SimpleNamespace(
+        headers={},
+        parse=lambda: SimpleNamespace(output_parsed=Analysis(ai_summary="cached"))
+    )
+    parse = AsyncMock(return_value=raw_response)
+    ai_client = SimpleNamespace(responses=SimpleNamespace(with_raw_response=SimpleNamespace(parse=parse)))
+    cache = SQLiteCache(str(tmp_path / "cache.sqlite3"))
+    messages = [{"role": "system", "content": "sys"}, {"role": "user", "content": "scene"}]
+
+    first = await llms.parse_structured(ai_client, "cache-model", messages, Analysis, cache=cache)
+    second = await llms.parse_structured(ai_client, "cache-model", messages, Analysis, cache=cache)
+
+    assert first == second == Analysis(ai_summary="cached")
+    assert parse.await_count == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_result_cache_coalesces_concurrent_requests():
+    cache = ResultCache()
+    calls = 0
+    release = asyncio.Event()
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return ["scene"]
+
+    waiters = [asyncio.create_task(cache.get_or_compute("q", compute)) for _ in range(5)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*waiters)
+
+    assert results == [["scene"]] * 5
+    assert calls == 1
+    assert await cache.get_or_compute("q", compute) == ["scene"]
+    assert calls == 1
+    assert cache.stats()["coalesced"] == 4 and cache.stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_result_cache_invalidation_discards_stale_results():
+    cache = ResultCache()
+    release = asyncio.Event()
+
+    async def slow():
+        await release.wait()
+        return "stale"
+
+    pending = asyncio.create_task(cache.get_or_compute("q", slow))
+    await asyncio.sleep(0)
+    cache.invalidate()
+    release.set()
+    assert await pending == "stale"
+
+    assert await cache.get_or_compute("q", AsyncMock(return_value="fresh")) == "fresh"
+
+    failing = AsyncMock(side_effect=RuntimeError("upstream down"))
+    with pytest.raises(RuntimeError):
+        await cache.get_or_compute("other", failing)
+    assert cache.stats()["entries"] == 1
+
+
+@pytest.mark.asyncio
+async def test_result_cache_survives_cancelled_leader_and_detaches_on_invalidate():
+    cache = ResultCache()
+    release = asyncio.Event()
+    calls = []
+
+    async def slow():
+        calls.append(len(calls) + 1)
+        number = len(calls)
+        await release.wait()
+        return f"result {number}"
+
+    leader = asyncio.create_task(cache.get_or_compute("q", slow))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(cache.get_or_compute("q", slow))
+    await asyncio.sleep(0)
+    leader.cancel()
+    await asyncio.sleep(0)
+    # a caller joining after invalidate() starts its own computation
+    cache.invalidate()
+    fresh = asyncio.create_task(cache.get_or_compute("q", slow))
+    await asyncio.sleep(0)
+    release.set()
+
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+    assert await follower == "result 1"
+    assert await fresh == "result 2"
+    assert len(calls) == 2
+    assert cache.stats()["coalesced"] == 1
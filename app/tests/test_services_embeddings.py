@@ -0,0 +1,113 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+import services.embeddings as embeddings
+from services.cache import SQLiteCache
+from services.embeddings import BatchEmbedder, QueryEmbeddingCache
+
+
+class FakeEmbeddings:
+    def __init__(self):
+        self.calls = []
+        self.dimensions = []
+        self.with_raw_response = self
+
+    async def create(self, model, input, encoding_format=None, timeout=None, dimensions=None):
+        self.calls.append(list(input))
+        self.dimensions.append(dimensions)
+        # return out of order to check results are mapped by index
+        data = [SimpleNamespace(index=i, embedding=[float(len(text))]) for i, text in enumerate(input)]
+        response = SimpleNamespace(data=list(reversed(data)))
+        return SimpleNamespace(headers={}, parse=lambda: response)
+
+
+class FakeAI:
+    def __init__(self):
+        self.embeddings = FakeEmbeddings()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_one_call():
+    ai = FakeAI()
+    embedder = BatchEmbedder(ai, "model", max_batch_size=10, max_batch_tokens=10_000, max_wait=0.01)
+    texts = ["a", "bb", "ccc", "dddd"]
+
+    vectors = await embedder.embed_many(texts)
+
+    assert vectors == [[1.0], [2.0], [3.0], [4.0]]
+    assert ai.embeddings.calls == [texts]
+    assert embedder.requests_sent == 1
+
+
+@pytest.mark.asyncio
+async def test_batches_split_on_size_and_token_limits():
+    ai = FakeAI()
+    embedder = BatchEmbedder(ai, "model", max_batch_size=2, max_batch_tokens=10_000, max_wait=0.01)
+    await embedder.embed_many(["a", "b", "c"])
+    assert sorted(len(call) for call in ai.embeddings.calls) == [1, 2]
+
+    ai = FakeAI()
+    embedder = BatchEmbedder(ai, "model", max_batch_size=100, max_batch_tokens=5, max_wait=0.01)
+    await embedder.embed_many(["x" * 9, "y" * 9])
+    assert len(ai.embeddings.calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_errors_propagate_to_every_waiter():
+    class FailingEmbeddings:
+        def __init__(self):
+            self.with_raw_response = self
+
+        async def create(self, **kwargs):
+            raise RuntimeError("boom")
+
+    embedder = BatchEmbedder(SimpleNamespace(embeddings=FailingEmbeddings()), "model", max_wait=0.01)
+    results = await asyncio.gather(embedder.embed("a"), embedder.embed("b"), return_exceptions=True)
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+@pytest.mark.asyncio
+async def test_query_embedding_cache_normalizes_and_expires(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(embeddings.time, "monotonic", lambda: now[0])
+    cache = QueryEmbeddingCache(max_entries=2, ttl=10)
+
+    await cache.set("How do I write  a Climax?", "model", [1.0])
+    assert await cache.get("how do i write a climax?", "model") == [1.0]
+    assert await cache.get("how do i write a climax?", "other-model") is None
+
+    await cache.set("b", "model", [2.0])
+    await cache.set("c", "model", [3.0])
+    assert await cache.get("b", "model") == [2.0]
+    assert await cache.get("How do I write a climax?", "model") is None  # evicted as least recently used
+
+    now[0] += 11
+    assert await cache.get("c", "model") is None
+    assert cache.stats()["hits"] == 2
+
+
+@pytest.mark.asyncio
+async def test_query_embedding_cache_warms_from_persistent_tier(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    await QueryEmbeddingCache(persistent=SQLiteCache(path, table="query_embeddings")).set("query", "model", [0.5, 0.25])
+
+    restarted = QueryEmbeddingCache(persistent=SQLiteCache(path, table="query_embeddings"))
+    assert await restarted.get("query", "model") == [0.5, 0.25]
+    assert await restarted.get("query", "model") == [0.5, 0.25]
+    assert restarted.stats()["persistent_hits"] == 1
+    assert restarted.stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_reduced_dimensions_are_requested_and_keyed_separately():
+    ai = FakeAI()
+    embedder = BatchEmbedder(ai, "model", max_wait=0, dimensions=256)
+    await embedder.embed("scene")
+    assert ai.embeddings.dimensions == [256]
+
+    cache = QueryEmbeddingCache()
+    await cache.set("query", "model", [1.0], dimensions=256)
+    assert await cache.get("query", "model", dimensions=256) == [1.0]
+    assert await cache.get("query", "model") is None
@@ -0,0 +1,97 @@
+import httpx
+import openai
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import services.llms as llms
+
+
+def make_status_error(status_code, headers=None):
+    request = httpx.Request("POST", "https://api.openai.com/v1/responses")
+    response = httpx.Response(status_code, request=request, headers=headers or {})
+    return openai.APIStatusError("error", response=response, body=None)
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch):
+    sleep = AsyncMock()
+    monkeypatch.setattr(llms.asyncio, "sleep", sleep)
+    return sleep
+
+
+@pytest.mark.asyncio
+async def test_with_retries_retries_rate_limits_and_server_errors(no_sleep):
+    errors = [make_status_error(429, {"retry-after": "2"}), make_status_error(503)]
+
+    async def call():
+        if errors:
+            raise errors.pop(0)
+        return "ok"
+
+    assert await llms.with_retries(call, max_retries=3) == "ok"
+    assert no_sleep.await_count == 2
+    assert no_sleep.await_args_list[0].args[0] == 2.0
+
+
+@pytest.mark.asyncio
+async def test_with_retries_does_not_retry_client_errors(no_sleep):
+    call = AsyncMock(side_effect=make_status_error(400))
+    with pytest.raises(openai.APIStatusError):
+        await llms.with_retries(call, max_retries=3)
+    assert call.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_with_retries_gives_up_after_max_retries():
+    call = AsyncMock(side_effect=make_status_error(500))
+    with pytest.raises(openai.APIStatusError):
+        await llms.with_retries(call, max_retries=2)
+    assert call.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_parse_structured_returns_parsed_model():
+    parsed = SimpleNamespace(ai_summary="s", story_beat="climax")
+    raw_response = SimpleNamespace(
+        headers={"x-ratelimit-limit-requests": "5000", "x-ratelimit-remaining-requests": "4999"},
+        parse=lambda: SimpleNamespace(output_parsed=parsed)
+    )
+    parse = AsyncMock(return_value=raw_response)
+    ai_client = SimpleNamespace(responses=SimpleNamespace(with_raw_response=SimpleNamespace(parse=parse)))
+
+    result = await llms.parse_structured(ai_client, "test-model", [{"role": "user", "content": "hi"}], object, timeout=5)
+
+    assert result is parsed
+    assert parse.await_args.kwargs["timeout"] == 5
+    assert llms.get_rate_limiter("test-model").requests.capacity == 5000
+
+
+@pytest.mark.asyncio
+async def test_parse_structured_raises_with_refusal_when_nothing_is_parsed():
+    refusal = SimpleNamespace(type="refusal", refusal="I can't help with that.")
+    response = SimpleNamespace(output_parsed=None, output=[SimpleNamespace(content=[refusal])])
+    raw_response = SimpleNamespace(headers={}, parse=lambda: response)
+    ai_client = SimpleNamespace(
+        responses=SimpleNamespace(with_raw_response=SimpleNamespace(parse=AsyncMock(return_value=raw_response)))
+    )
+
+    with pytest.raises(llms.StructuredOutputError, match="refused: I can't help with that.") as error:
+        await llms.parse_structured(ai_client, "refusing-model", [{"role": "user", "content": "hi"}], object)
+    assert error.value.refusal == "I can't help with that."
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_calls_shrink_the_limiter_window():
+    limiter = llms.RateLimiter(max_concurrency=8)
+    responses = [make_status_error(429, {"x-ratelimit-remaining-requests": "0"})]
+
+    async def call():
+        if responses:
+            raise responses.pop(0)
+        return SimpleNamespace(headers={}, parse=lambda: "ok")
+
+    assert await llms.with_retries(call, max_retries=1, limiter=limiter) == "ok"
+    assert limiter.rate_limited == 1
+    assert 4 <= limiter.concurrency_limit < 5
+    assert limiter.in_flight == 0
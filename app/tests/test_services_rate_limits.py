@@ -0,0 +1,63 @@
+import asyncio
+
+import pytest
+
+from services.rate_limits import RateLimiter, TokenBucket, get_rate_limiter, parse_reset_duration
+
+
+def test_parse_reset_duration():
+    assert parse_reset_duration("1s") == 1.0
+    assert parse_reset_duration("6m0s") == 360.0
+    assert parse_reset_duration("20ms") == pytest.approx(0.02)
+    assert parse_reset_duration(None) is None
+    assert parse_reset_duration("soon") is None
+
+
+def test_token_bucket_wait_and_sync():
+    bucket = TokenBucket(60)
+    assert bucket.wait_time(10) == 0
+    bucket.consume(60)
+    assert bucket.wait_time(30) == pytest.approx(30, abs=0.1)
+    bucket.sync(limit=120, remaining=5)
+    assert bucket.capacity == 120
+    assert bucket.available <= 5
+
+
+@pytest.mark.asyncio
+async def test_limiter_caps_concurrency_and_adapts():
+    limiter = RateLimiter(requests_per_minute=10_000, tokens_per_minute=1_000_000, max_concurrency=2)
+    in_flight = 0
+    peak = 0
+
+    async def request():
+        nonlocal in_flight, peak
+        async with limiter.acquire(tokens=10):
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+
+    await asyncio.gather(*(request() for _ in range(6)))
+    assert peak == 2
+
+    limiter.on_rate_limited()
+    assert limiter.concurrency_limit == 1
+    limiter.on_success()
+    assert limiter.concurrency_limit == 2
+
+
+@pytest.mark.asyncio
+async def test_limiter_waits_for_request_budget():
+    limiter = RateLimiter(requests_per_minute=600, tokens_per_minute=1_000_000)
+    limiter.update_from_headers({"x-ratelimit-remaining-requests": "0"})
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    async with limiter.acquire():
+        pass
+    # 600 rpm refills one request every 0.1s
+    assert loop.time() - started >= 0.05
+
+
+def test_get_rate_limiter_is_shared_per_model():
+    assert get_rate_limiter("model-a") is get_rate_limiter("model-a")
+    assert get_rate_limiter("model-a") is not get_rate_limiter("model-b")
@@ -0,0 +1,96 @@
+import pytest
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from models.db.screenplays import Screenplay
+from services.text_search import (
+    build_match_query,
+    delete_scene_texts,
+    index_scene_texts,
+    reciprocal_rank_fusion,
+    search_scene_texts,
+)
+
+
+async def make_engine():
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as connection:
+        await connection.run_sync(SQLModel.metadata.create_all)
+    return engine
+
+
+def scene_row(screenplay_id, scene_number, embedding_text):
+    return {
+        "scene_id": screenplay_id * 100 + scene_number,
+        "screenplay_id": screenplay_id,
+        "scene_number": scene_number,
+        "vector_id": f"{screenplay_id}:{scene_number}",
+        "namespace": "scene_embeddings",
+        "embedding_text": embedding_text,
+    }
+
+
+def test_build_match_query_quotes_terms_and_phrases():
+    assert build_match_query('the "I coulda been a contender" scene') == (
+        '"I coulda been a contender" OR "the" OR "i" OR "coulda" OR "been" OR "a" OR "contender" OR "scene"'
+    )
+    assert build_match_query("AND OR NOT*") == '"and" OR "or" OR "not"'
+    assert build_match_query("?!") is None
+
+
+@pytest.mark.asyncio
+async def test_search_scene_texts_ranks_matches_and_follows_deletes():
+    engine = await make_engine()
+    async with AsyncSession(engine) as session:
+        await index_scene_texts([
+            scene_row(1, 1, "TERRY: I coulda had class. I coulda been a contender."),
+            scene_row(1, 2, "Charley drives the cab through the rain."),
+            scene_row(2, 1, "A contender steps into the ring."),
+        ], session)
+        # re-indexing a scene replaces its text instead of duplicating it
+        await index_scene_texts([scene_row(1, 2, "Charley and Terry sit in the cab.")], session)
+        await session.commit()
+
+    results = await search_scene_texts(engine, "I coulda been a contender", top_k=5)
+    assert [row["vector_id"] for row in results] == ["1:1", "2:1"]
+    assert [row["vector_id"] for row in await search_scene_texts(engine, "Terry cab", top_k=5)][0] == "1:2"
+    assert await search_scene_texts(engine, "contender", top_k=5, namespace="other") == []
+
+    async with AsyncSession(engine) as session:
+        await delete_scene_texts(1, session)
+        await session.commit()
+    assert [row["vector_id"] for row in await search_scene_texts(engine, "contender", top_k=5)] == ["2:1"]
+
+
+def test_reciprocal_rank_fusion_rewards_agreement():
+    fused = reciprocal_rank_fusion([["a", "b", "c"], ["c", "d"]])
+    assert fused[0] == "c"
+    assert set(fused) == {"a", "b", "c", "d"}
+    assert fused.index("a") < fused.index("d")
+
+
+@pytest.mark.asyncio
+async def test_search_scene_texts_applies_scene_filters():
+    from models.db.scenes import Scene
+
+    engine = await make_engine()
+    async with AsyncSession(engine) as session:
+        session.add(Screenplay(id=1, storage_path="/tmp/1.pdf"))
+        for scene_number, beat in [(1, "exposition"), (2, "climax")]:
+            session.add(Scene(
+                id=100 + scene_number,
+                screenplay_id=1,
+                scene_number=scene_number,
+                progress_raw=f"{scene_number}/2",
+                progress_num=scene_number / 2,
+                beat=beat
+            ))
+        await index_scene_texts([scene_row(1, 1, "The boxer trains."), scene_row(1, 2, "The boxer wins the fight.")], session)
+        await session.commit()
+
+    assert [row["scene_number"] for row in await search_scene_texts(engine, "boxer", 5, story_beats=["climax"])] == [2]
+    assert [row["scene_number"] for row in await search_scene_texts(engine, "boxer", 5, progress_max=0.5)] == [1]
+    assert await search_scene_texts(engine, "boxer", 5, screenplay_ids=[]) == []
+    assert len(await search_scene_texts(engine, "boxer", 5, screenplay_ids=[1])) == 2
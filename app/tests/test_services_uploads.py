@@ -0,0 +1,53 @@
+import hashlib
+import io
+
+import pytest
+from fastapi import UploadFile
+
+from services.uploads import content_path, save_upload, store_upload
+
+
+@pytest.mark.asyncio
+async def test_save_upload_streams_hashes_and_replaces(tmp_path):
+    content = b"%PDF-1.7\n" + bytes(range(256)) * 100
+    destination = tmp_path / "script.pdf"
+    destination.write_bytes(b"old version")
+
+    stored = await save_upload(UploadFile(io.BytesIO(content), filename="script.pdf"), destination, chunk_size=1000)
+
+    assert stored.path == destination
+    assert destination.read_bytes() == content
+    assert stored.sha256 == hashlib.sha256(content).hexdigest()
+    assert stored.size == len(content)
+    assert [path.name for path in tmp_path.iterdir()] == ["script.pdf"]
+
+
+@pytest.mark.asyncio
+async def test_save_upload_removes_partial_file_on_error(tmp_path):
+    class BrokenUpload:
+        def __init__(self):
+            self.reads = 0
+
+        async def read(self, size):
+            self.reads += 1
+            if self.reads > 2:
+                raise ConnectionError("client went away")
+            return b"x" * size
+
+    destination = tmp_path / "script.pdf"
+    with pytest.raises(ConnectionError):
+        await save_upload(BrokenUpload(), destination, chunk_size=10)
+
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_store_upload_names_files_by_content(tmp_path):
+    content = b"%PDF-1.7\nsame screenplay"
+
+    first = await store_upload(UploadFile(io.BytesIO(content), filename="a.pdf"), tmp_path)
+    second = await store_upload(UploadFile(io.BytesIO(content), filename="renamed.pdf"), tmp_path)
+
+    assert first == second
+    assert first.path == content_path(tmp_path, hashlib.sha256(content).hexdigest())
+    assert [path.name for path in tmp_path.iterdir()] == [first.path.name]
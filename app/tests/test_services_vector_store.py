@@ -0,0 +1,143 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from services.vector_store import LocalVectorStore, PineconeVectorStore
+
+
+class FakeIndex:
+    def __init__(self):
+        self.upserts = []
+        self.in_flight = 0
+        self.peak = 0
+
+    async def upsert(self, vectors, namespace=None):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.upserts.append((namespace, len(vectors)))
+        self.in_flight -= 1
+
+    async def query(self, **kwargs):
+        return {"matches": [{"id": "a", "kwargs": kwargs}]}
+
+
+@pytest.mark.asyncio
+async def test_upsert_chunks_with_concurrency_cap():
+    index = FakeIndex()
+    store = PineconeVectorStore(index, batch_size=100, max_concurrency=2)
+    vectors = [{"id": str(i), "values": [0.0]} for i in range(450)]
+
+    written = await store.upsert(vectors, namespace="ns")
+
+    assert written == 450
+    assert sorted(size for _, size in index.upserts) == [50, 100, 100, 100, 100]
+    assert {namespace for namespace, _ in index.upserts} == {"ns"}
+    assert index.peak == 2
+    assert store.upsert_requests == 5
+
+
+@pytest.mark.asyncio
+async def test_query_reuses_index():
+    index = FakeIndex()
+    store = PineconeVectorStore(index)
+    results = await store.query(vector=[0.1], top_k=3, namespace="ns")
+    assert results["matches"][0]["kwargs"]["top_k"] == 3
+    assert store.index is index
+
+
+@pytest.mark.asyncio
+async def test_local_vector_store_query_filter_delete_and_reopen(tmp_path):
+    store = LocalVectorStore(tmp_path)
+    await store.upsert([
+        {"id": "a", "values": [1.0, 0.0, 0.0], "metadata": {"screenplay_id": 1, "beat": "climax"}},
+        {"id": "b", "values": [0.8, 0.2, 0.0], "metadata": {"screenplay_id": 2, "beat": "exposition"}},
+        {"id": "c", "values": [0.0, 0.0, 1.0], "metadata": {"screenplay_id": 2, "beat": "climax"}},
+    ], namespace="ns")
+
+    result = await store.query([2.0, 0.0, 0.0], top_k=2, namespace="ns")
+    assert [match["id"] for match in result["matches"]] == ["a", "b"]
+    assert result["matches"][0]["score"] == pytest.approx(1.0)
+
+    filtered = await store.query([1.0, 0.0, 0.0], top_k=5, namespace="ns", filter={"screenplay_id": {"$in": [2]}, "beat": "climax"})
+    assert [match["id"] for match in filtered["matches"]] == ["c"]
+
+    await store.upsert([{"id": "a", "values": [0.0, 0.0, 1.0], "metadata": {"screenplay_id": 1}}], namespace="ns")
+    await store.delete(ids=["b"], namespace="ns")
+    store.close()
+
+    reopened = LocalVectorStore(tmp_path)
+    result = await reopened.query([0.0, 0.0, 1.0], top_k=5, namespace="ns", include_metadata=False)
+    assert sorted(match["id"] for match in result["matches"]) == ["a", "c"]
+    assert "metadata" not in result["matches"][0]
+
+    await reopened.compact(namespace="ns")
+    await reopened.delete(namespace="ns", filter={"screenplay_id": {"$eq": 1}})
+    result = await reopened.query([0.0, 0.0, 1.0], top_k=5, namespace="ns")
+    assert [match["id"] for match in result["matches"]] == ["c"]
+
+
+@pytest.mark.asyncio
+async def test_local_vector_store_ivf_search_finds_nearest(tmp_path):
+    rng = np.random.default_rng(1)
+    vectors = rng.normal(size=(400, 8)).astype(np.float32)
+    store = LocalVectorStore(tmp_path, ivf_lists=4, nprobe=4)
+    await store.upsert([{"id": str(i), "values": vector.tolist()} for i, vector in enumerate(vectors)])
+
+    result = await store.query(vectors[17].tolist(), top_k=3)
+
+    assert result["matches"][0]["id"] == "17"
+    assert store._namespace("scene_embeddings").centroids is not None
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("quantization", ["float16", "int8"])
+async def test_local_vector_store_quantized_scan_rescores_exactly(tmp_path, quantization):
+    rng = np.random.default_rng(2)
+    vectors = rng.normal(size=(300, 16)).astype(np.float32)
+    exact = LocalVectorStore(tmp_path / "exact")
+    quantized = LocalVectorStore(tmp_path / "quantized", quantization=quantization, rescore_multiplier=4)
+    records = [{"id": str(i), "values": vector.tolist()} for i, vector in enumerate(vectors)]
+    await exact.upsert(records)
+    await quantized.upsert(records)
+
+    query = rng.normal(size=16).tolist()
+    expected = (await exact.query(query, top_k=5))["matches"]
+    result = (await quantized.query(query, top_k=5))["matches"]
+
+    assert [match["id"] for match in result] == [match["id"] for match in expected]
+    assert [match["score"] for match in result] == pytest.approx([match["score"] for match in expected])
+
+    # reopening with another setting rebuilds the scanned copy from the float32 rows
+    quantized.close()
+    reopened = LocalVectorStore(tmp_path / "quantized")
+    assert [match["id"] for match in (await reopened.query(query, top_k=5))["matches"]] == [match["id"] for match in expected]
+    assert not list((tmp_path / "quantized" / "scene_embeddings").glob("codes.*"))
+
+
+@pytest.mark.asyncio
+async def test_local_vector_store_fetch_returns_stored_rows(tmp_path):
+    store = LocalVectorStore(tmp_path)
+    await store.upsert([
+        {"id": "a", "values": [3.0, 4.0]},
+        {"id": "b", "values": [0.0, 2.0]},
+    ], namespace="ns")
+    await store.delete(ids=["b"], namespace="ns")
+
+    fetched = await store.fetch(["a", "b", "missing"], namespace="ns")
+
+    assert list(fetched) == ["a"]
+    assert fetched["a"] == pytest.approx([0.6, 0.8])
+
+
+@pytest.mark.asyncio
+async def test_local_vector_store_query_returns_metadata_copies(tmp_path):
+    store = LocalVectorStore(tmp_path)
+    await store.upsert([{"id": "a", "values": [1.0, 0.0], "metadata": {"scene_id": 1}}], namespace="ns")
+
+    first = await store.query(vector=[1.0, 0.0], top_k=1, namespace="ns")
+    first["matches"][0]["metadata"]["embedding_text"] = "added by a caller"
+    second = await store.query(vector=[1.0, 0.0], top_k=1, namespace="ns")
+
+    assert second["matches"][0]["metadata"] == {"scene_id": 1}